@@ -2,8 +2,14 @@ import os
 import hashlib
 import json
 from datetime import datetime
-import random
+import secrets
 import custom_exceptions
+import hashers
+from ledger import Ledger
+import locks
+import metrics
+from sessions import PaymentSessions
+import storage
 
 
 class Client:
@@ -14,7 +20,7 @@ class Client:
     clients_info = {}
 
     def __init__(
-        self, national_id: str, first_name: str, last_name: str, accounts: dict = {}
+        self, national_id: str, first_name: str, last_name: str, accounts: dict = None
     ):
         if Client.national_id_valid(national_id):
             self.national_id = national_id
@@ -22,7 +28,7 @@ class Client:
             raise custom_exceptions.InvalidNationalID("Invalid ID.")
         self.first_name = first_name
         self.last_name = last_name
-        self.accounts = accounts
+        self.accounts = {} if accounts is None else accounts
         Client.clients_info.update({self.national_id: self.__dict__})
 
     @staticmethod
@@ -59,7 +65,8 @@ class BankAccount:
 
     FILENAME = "./database/bank_accounts.json"
     MIN_BALANCE = 10_000
-    accounts_dict = {}
+    ledger = Ledger()
+    sessions = PaymentSessions()
 
     def __init__(
         self,
@@ -95,12 +102,16 @@ class BankAccount:
         if cvv2 is not None:
             self.cvv2 = cvv2
         else:
-            self.cvv2 = random.randint(1111, 9999)
+            self.cvv2 = BankAccount.new_cvv2()
 
-        BankAccount.accounts_dict.update({self.account_name: self.__dict__})
-        Client.clients_info[self.national_id]["accounts"].update(
-            BankAccount.accounts_dict
-        )
+        Client.clients_info[self.national_id]["accounts"][self.account_name] = self.__dict__
+
+    @staticmethod
+    def new_cvv2() -> int:
+        """
+        Return a random four digit CVV2 from a secure source
+        """
+        return 1111 + secrets.randbelow(9999 - 1111 + 1)
 
     @staticmethod
     def create_account(
@@ -120,32 +131,29 @@ class BankAccount:
             balance (float): User inputed balance.
             password (str): User inputed password.
         """
-        if not os.path.exists(BankAccount.FILENAME):
+        if not storage.backend().exists(BankAccount.FILENAME):
             os.makedirs(os.path.dirname(BankAccount.FILENAME), exist_ok=True)
             BankAccount.json_save(BankAccount.FILENAME, {})
 
         Client.clients_info = BankAccount.json_import(BankAccount.FILENAME)
+        BankAccount.ledger.sync(Client.clients_info)
 
         if national_id not in Client.clients_info:
             Client(national_id, first_name, last_name)
             BankAccount(national_id, account_name, balance, password)
-            Client.clients_info[national_id]["accounts"].update(
-                BankAccount.accounts_dict
-            )
             BankAccount.json_save(BankAccount.FILENAME, Client.clients_info)
         elif account_name in Client.clients_info[national_id]["accounts"]:
             raise custom_exceptions.AlreadyExistAccount("Account name already exists.")
         else:
             BankAccount(national_id, account_name, balance, password)
-            Client.clients_info[national_id]["accounts"].update(
-                BankAccount.accounts_dict
-            )
             BankAccount.json_save(BankAccount.FILENAME, Client.clients_info)
+        BankAccount.ledger.open(national_id, account_name, balance)
 
     @staticmethod
     def hashing(password: str):
         """
-        This method is for hashing passwords
+        This method returns the old unsalted SHA-256 hash of a password,/
+        new passwords are hashed with hashers.hash_password
         """
         hashed_pass = hashlib.sha256(password.encode("utf-8")).hexdigest()
         return hashed_pass
@@ -155,8 +163,7 @@ class BankAccount:
         """
         This method is use for saving a dictionary into a json file
         """
-        with open(filename, mode="w+", encoding="utf-8") as file:
-            json.dump(dictionary, file, indent=4)
+        storage.backend().save(filename, dictionary)
 
     @staticmethod
     def json_import(filename) -> dict:
@@ -164,8 +171,41 @@ class BankAccount:
         This method is used for importing data from a json file/
         and assign it to our class dictionary
         """
-        with open(filename, mode="r", encoding="utf-8") as file:
-            return json.load(file)
+        return storage.backend().load(filename)
+
+    @staticmethod
+    def balance_record(national_id, account_name, amount, balance) -> dict:
+        """
+        This method returns the change record of one balance change
+        """
+        return {
+            "op": "balance",
+            "national_id": national_id,
+            "account": account_name,
+            "amount": amount,
+            "balance": balance,
+            "minimum": BankAccount.MIN_BALANCE,
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    @staticmethod
+    def balance_change(national_id, account_name, amount, balance, accounts_info=None):
+        """
+        This method appends a single balance change of one account/
+        to the ledger instead of rewriting the whole file, and applies/
+        it to the loaded accounts_info (and so to the balance table)
+        """
+        record = BankAccount.balance_record(national_id, account_name, amount, balance)
+        storage.backend().apply(BankAccount.FILENAME, [record])
+        if accounts_info is not None:
+            storage.apply_record(accounts_info, record)
+
+    @staticmethod
+    def current_balance(accounts_info: dict, national_id, account_name) -> float:
+        """
+        This method returns the balance of an account from the ledger balance table
+        """
+        return BankAccount.ledger.sync(accounts_info).balance(national_id, account_name)
 
     @property
     def balance(self) -> float:
@@ -214,10 +254,11 @@ class BankAccount:
         """
         if not BankAccount.password_check(password):
             raise custom_exceptions.ShortPasswordError("Too short Password!")
-        password = BankAccount.hashing(password)
+        password = hashers.hash_password(password)
         self.__password = password
 
     @staticmethod
+    @metrics.timed("deposit")
     def deposit(national_id, account_name, password, cvv2, amount: int):
         """Deposit method
 
@@ -227,8 +268,39 @@ class BankAccount:
         Raises:
             custom_exceptions.BalanceMinimum: If balance goes down the min limit.
         """
-        accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+        with locks.hold(BankAccount.FILENAME, national_id, account_name):
+            accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+
+            BankAccount.verify(accounts_info, national_id, account_name, password, cvv2)
 
+            balance = (
+                BankAccount.current_balance(accounts_info, national_id, account_name)
+                + amount
+            )
+            if balance < BankAccount.MIN_BALANCE:
+                raise custom_exceptions.BalanceMinimum("Invalid balance.")
+
+            BankAccount.balance_change(
+                national_id, account_name, amount, balance, accounts_info
+            )
+
+    @staticmethod
+    def verify(
+        accounts_info: dict, national_id, account_name, password, cvv2, session=None
+    ) -> dict:
+        """Check that an account exists and that its password and CVV2/
+        (or a payment session of it) are right.
+
+        Args:
+            accounts_info (dict): Loaded bank accounts database.
+            session (str): Token of open_session(), checked instead of password and CVV2.
+
+        Returns:
+            dict: The account.
+
+        Raises:
+            custom_exceptions.SessionError: If the session expired or is not of this account.
+        """
         if national_id not in accounts_info:
             raise custom_exceptions.UnsuccessfulIdDeposit(
                 "Unsuccessful deposit, national ID not found."
@@ -239,75 +311,110 @@ class BankAccount:
                 "Unsuccessful deposit, No such account."
             )
 
-        if (
-            BankAccount.hashing(password)
-            != accounts_info[national_id]["accounts"][account_name][
-                "_BankAccount__password"
-            ]
-        ):
-            raise custom_exceptions.UnsuccessfulAccountDeposit(
+        account = accounts_info[national_id]["accounts"][account_name]
+        if session is not None:
+            BankAccount.sessions.check(session, national_id, account_name)
+            return account
+
+        if not hashers.verify(password, account["_BankAccount__password"]):
+            raise custom_exceptions.UnsuccessfulPasswordDeposit(
                 "Unsuccessful deposit, Wrong password."
             )
 
-        if cvv2 != accounts_info[national_id]["accounts"][account_name]["cvv2"]:
+        if cvv2 != account["cvv2"]:
             raise custom_exceptions.UnsuccessfulCvv2Deposit(
                 "Unsuccessful deposit, Wrong CVV2."
             )
+        BankAccount.upgrade_password(accounts_info, national_id, account_name, password)
+        return account
 
-        if (
-            accounts_info[national_id]["accounts"][account_name]["_balance"] + amount
-            < BankAccount.MIN_BALANCE
-        ):
-            raise custom_exceptions.BalanceMinimum("Invalid balance.")
+    @staticmethod
+    def upgrade_password(accounts_info: dict, national_id, account_name, password):
+        """
+        Hash a verified password again if its stored record was made/
+        by an outdated hasher (e.g. old SHA-256 records), and save it
+        """
+        account = accounts_info[national_id]["accounts"][account_name]
+        if not hashers.outdated(account["_BankAccount__password"]):
+            return
+        with locks.hold(BankAccount.FILENAME, national_id, account_name):
+            account["_BankAccount__password"] = hashers.hash_password(password)
+            BankAccount.json_save(BankAccount.FILENAME, accounts_info)
 
-        accounts_info[national_id]["accounts"][account_name]["_balance"] += amount
-        BankAccount.json_save(BankAccount.FILENAME, accounts_info)
+    @staticmethod
+    def open_session(national_id, account_name, password, cvv2, ttl: float = None) -> str:
+        """Verify an account once and start a payment session of it.
+
+        Args:
+            ttl (float): Seconds the session lives, PaymentSessions.TTL by default.
+
+        Returns:
+            str: Token to pass as session to withdraw() instead of password and CVV2.
+        """
+        accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+        BankAccount.verify(accounts_info, national_id, account_name, password, cvv2)
+        return BankAccount.sessions.open(national_id, account_name, ttl)
 
     @staticmethod
-    def withdraw(national_id, account_name, password, cvv2, amount: int):
-        """Withdraw method
+    def close_session(session):
+        """Revoke a payment session before it expires."""
+        BankAccount.sessions.close(session)
+
+    @staticmethod
+    def check_withdraw(
+        accounts_info: dict,
+        national_id,
+        account_name,
+        password,
+        cvv2,
+        amount,
+        balance=None,
+        session=None,
+    ) -> float:
+        """Check a withdraw against loaded accounts without storing anything.
 
         Args:
+            accounts_info (dict): Loaded bank accounts database.
             amount (int): Amount to withdraw.
+            balance (float): Balance to check against, defaults to the ledger one.
+            session (str): Payment session, checked instead of password and CVV2.
+
+        Returns:
+            float: Balance of the account after the withdraw.
 
         Raises:
             custom_exceptions.BalanceMinimum: If balance goes down the min limit.
         """
-        accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+        BankAccount.verify(accounts_info, national_id, account_name, password, cvv2, session)
 
-        if national_id not in accounts_info:
-            raise custom_exceptions.UnsuccessfulIdDeposit(
-                "Unsuccessful deposit, national ID not found."
-            )
+        if balance is None:
+            balance = BankAccount.current_balance(accounts_info, national_id, account_name)
+        if balance - amount < BankAccount.MIN_BALANCE:
+            raise custom_exceptions.BalanceMinimum("Invalid balance.")
+        return balance - amount
 
-        if account_name not in accounts_info[national_id]["accounts"]:
-            raise custom_exceptions.UnsuccessfulAccountDeposit(
-                "Unsuccessful deposit, No such account."
-            )
+    @staticmethod
+    @metrics.timed("withdraw")
+    def withdraw(national_id, account_name, password, cvv2, amount: int, session=None):
+        """Withdraw method
 
-        if (
-            BankAccount.hashing(password)
-            != accounts_info[national_id]["accounts"][account_name][
-                "_BankAccount__password"
-            ]
-        ):
-            raise custom_exceptions.UnsuccessfulPasswordDeposit(
-                "Unsuccessful deposit, Wrong password."
-            )
+        Args:
+            amount (int): Amount to withdraw.
+            session (str): Payment session of the account, password and cvv2/
+                are not checked (and may be None) when it is given.
 
-        if cvv2 != accounts_info[national_id]["accounts"][account_name]["cvv2"]:
-            raise custom_exceptions.UnsuccessfulCvv2Deposit(
-                "Unsuccessful deposit, Wrong CVV2."
+        Raises:
+            custom_exceptions.BalanceMinimum: If balance goes down the min limit.
+        """
+        with locks.hold(BankAccount.FILENAME, national_id, account_name):
+            accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+            balance = BankAccount.check_withdraw(
+                accounts_info, national_id, account_name, password, cvv2, amount,
+                session=session,
+            )
+            BankAccount.balance_change(
+                national_id, account_name, -amount, balance, accounts_info
             )
-
-        if (
-            accounts_info[national_id]["accounts"][account_name]["_balance"] - amount
-            < BankAccount.MIN_BALANCE
-        ):
-            raise custom_exceptions.BalanceMinimum("Invalid balance.")
-
-        accounts_info[national_id]["accounts"][account_name]["_balance"] -= amount
-        BankAccount.json_save(BankAccount.FILENAME, accounts_info)
 
     def __str__(self) -> str:
         """Cutomize print output of object."""
@@ -320,6 +427,9 @@ class BankAccount:
         """
 
 
+storage.listen(BankAccount.ledger.on_record)
+
+
 def main():
     pass
 
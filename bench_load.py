@@ -0,0 +1,310 @@
+#! /usr/bin/python3
+"""
+Load-test benchmark of our ticketing core.
+
+Builds a throwaway database directory and drives the real code paths
+with concurrent buyers, one operation after the other:
+
+    signup          User.signup               (--users calls)
+    sign_in         User.sign_in_validation   (--users calls)
+    add_ticket      Ticket.add_ticket         (--films x --showtimes calls)
+    deposit         BankAccount.deposit       (--orders calls)
+    reserve_ticket  User.reserve_ticket       (--orders calls)
+    withdraw        BankAccount.withdraw      (--orders calls)
+
+Calls run on --workers threads, or with --processes on --workers
+processes sharing the database directory. signup always runs on
+threads: it saves the whole users file, which is not safe between
+processes. Orders are spread over --accounts bank accounts and every
+showtime with a --seed seeded random generator.
+
+The result is JSON: for every operation its calls, errors (by type),
+wall time, throughput (calls per second), latency (mean, p50, p95,
+p99 and max in milliseconds) and bytes written (per call too). Bytes
+are the write() bytes of the process(es) (wchar of /proc/<pid>/io),
+null where that is not available. They include the passwords sent to
+the hashing pool; CINEMA_HASH_WORKERS=0 leaves only database writes.
+
+Passwords are hashed with CINEMA_HASHER, or --hasher (sha256 makes
+the storage and locking costs stand out).
+
+Usage:
+    python bench_load.py --users 200 --orders 2000 --workers 8 --output load.json
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import bootstrap
+import hashers
+import storage
+from bank_accounts import BankAccount, Client
+from human import User
+from movie import Film, Ticket
+
+OPERATIONS = ("signup", "sign_in", "add_ticket", "deposit", "reserve_ticket", "withdraw")
+PASSWORD = "secret"
+BALANCE = 10 ** 12
+PRICE = 1_000
+
+
+def written_bytes():
+    """
+    Return the bytes this process passed to write() so far, or None
+    """
+    try:
+        with open("/proc/self/io", mode="r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def sign_in(user_name, password):
+    user = User.sign_in_validation(user_name, password)
+    user.delete_user()
+
+
+TARGETS = {
+    "signup": User.signup,
+    "sign_in": sign_in,
+    "add_ticket": Ticket.add_ticket,
+    "deposit": BankAccount.deposit,
+    "reserve_ticket": User.reserve_ticket,
+    "withdraw": BankAccount.withdraw,
+}
+
+
+def call(operation, arguments) -> tuple:
+    """
+    Run one call and return (seconds, error type name or None)
+    """
+    start = time.perf_counter()
+    try:
+        TARGETS[operation](*arguments)
+        error = None
+    except Exception as exception:
+        error = type(exception).__name__
+    return time.perf_counter() - start, error
+
+
+def refresh():
+    """
+    Load the databases again, other workers may have changed them
+    """
+    bootstrap.reset()
+    bootstrap.users()
+    bootstrap.films()
+
+
+def start_worker(directory):
+    os.chdir(directory)
+    refresh()
+
+
+def run_chunk(operation, calls) -> tuple:
+    """
+    Run calls one after the other in a worker process and return/
+    (results, bytes written)
+    """
+    refresh()
+    before = written_bytes()
+    with redirect_stdout(io.StringIO()):
+        results = [call(operation, arguments) for arguments in calls]
+    after = written_bytes()
+    return results, None if before is None else after - before
+
+
+def run_threads(operation, calls, workers) -> tuple:
+    """
+    Run calls on a thread pool and return (results, bytes written)
+    """
+    refresh()
+    before = written_bytes()
+    with redirect_stdout(io.StringIO()), ThreadPoolExecutor(workers) as executor:
+        results = list(executor.map(lambda arguments: call(operation, arguments), calls))
+    after = written_bytes()
+    return results, None if before is None else after - before
+
+
+def run_processes(operation, calls, executor, workers) -> tuple:
+    """
+    Split calls between the worker processes and return (results, bytes written)
+    """
+    chunks = [calls[index::workers] for index in range(workers)]
+    results, written = [], 0
+    for chunk_results, chunk_written in executor.map(run_chunk, [operation] * workers, chunks):
+        results.extend(chunk_results)
+        written = None if written is None or chunk_written is None else written + chunk_written
+    return results, written
+
+
+def summarize(results, seconds, written) -> dict:
+    """
+    Return the report of one operation
+    """
+    latencies = sorted(elapsed for elapsed, _ in results)
+    errors = {}
+    for _, error in results:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    calls = len(results)
+    return {
+        "calls": calls,
+        "errors": sum(errors.values()),
+        "error_types": errors,
+        "seconds": round(seconds, 6),
+        "throughput": round(calls / seconds, 3) if seconds else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(p50 * 1000, 3),
+            "p95": round(p95 * 1000, 3),
+            "p99": round(p99 * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "bytes_written": written,
+        "bytes_per_call": round(written / calls, 1) if written is not None and calls else None,
+    }
+
+
+def prepare(args) -> list:
+    """
+    Create the films and bank accounts the workload uses and return/
+    [(national id, account name, cvv2), ...]
+    """
+    bootstrap.films()
+    bootstrap.users()
+    for number in range(args.films):
+        Film.add_film(f"film{number}", "Action", "R")
+    accounts = []
+    for number in range(args.accounts):
+        national_id = str(1_000_000_000 + number)
+        BankAccount.create_account(national_id, "main", "First", "Last", BALANCE, PASSWORD)
+        accounts.append(national_id)
+    clients = BankAccount.json_import(Client.FILENAME)
+    return [
+        (national_id, "main", clients[national_id]["accounts"]["main"]["cvv2"])
+        for national_id in accounts
+    ]
+
+
+def workload(args, accounts) -> dict:
+    """
+    Return the arguments of every call, by operation
+    """
+    generator = random.Random(args.seed)
+    showtimes = [
+        (f"film{film}", f"2030-01-{day % 28 + 1:02d}", f"{10 + day // 28:02d}:00")
+        for film in range(args.films)
+        for day in range(args.showtimes)
+    ]
+    capacity = max(100, args.orders)
+
+    def payment():
+        national_id, account_name, cvv2 = generator.choice(accounts)
+        return national_id, account_name, PASSWORD, cvv2
+
+    users = [f"buyer{number}" for number in range(args.users)]
+    return {
+        "signup": [("First", "Last", name, PASSWORD, "1999-11-20", "09120000000") for name in users],
+        "sign_in": [(name, PASSWORD) for name in users],
+        "add_ticket": [showtime + (capacity, PRICE) for showtime in showtimes],
+        "deposit": [payment() + (PRICE,) for _ in range(args.orders)],
+        "reserve_ticket": [
+            generator.choice(showtimes) + (1,) + payment() for _ in range(args.orders)
+        ],
+        "withdraw": [payment() + (PRICE,) for _ in range(args.orders)],
+    }
+
+
+def run(args) -> dict:
+    """
+    Run the whole benchmark in a new database directory and return its report
+    """
+    directory = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    executor = None
+    try:
+        os.chdir(directory)
+        bootstrap.reset()
+        accounts = prepare(args)
+        calls = workload(args, accounts)
+        if args.processes:
+            executor = ProcessPoolExecutor(
+                args.workers, initializer=start_worker, initargs=(directory,)
+            )
+        report = {}
+        for operation in OPERATIONS:
+            start = time.perf_counter()
+            if executor is None or operation == "signup":
+                results, written = run_threads(operation, calls[operation], args.workers)
+            else:
+                results, written = run_processes(
+                    operation, calls[operation], executor, args.workers
+                )
+            report[operation] = summarize(results, time.perf_counter() - start, written)
+        return report
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        os.chdir(cwd)
+        bootstrap.reset()
+        shutil.rmtree(directory)
+
+
+def main(argv=None):
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Load-test the cinema ticketing core.")
+    parser.add_argument("--users", type=int, default=100, help="Users to sign up and sign in")
+    parser.add_argument("--films", type=int, default=5, help="Films to add")
+    parser.add_argument("--showtimes", type=int, default=10, help="Showtimes of every film")
+    parser.add_argument("--accounts", type=int, default=16, help="Bank accounts paying")
+    parser.add_argument("--orders", type=int, default=1000, help="Deposits, reservations and withdrawals")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent threads or processes")
+    parser.add_argument("--processes", action="store_true", help="Use processes instead of threads")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the order generator")
+    parser.add_argument("--hasher", choices=sorted(hashers.HASHERS), help="Password hasher")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.hasher is not None:
+        hashers.use(hashers.HASHERS[args.hasher]())
+    report = {
+        "config": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "python": platform.python_version(),
+        "storage": type(storage.backend()).__name__,
+        "hasher": hashers.hasher().prefix(),
+        "operations": run(args),
+    }
+    text = json.dumps(report, indent=4)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, mode="w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#! /usr/bin/python3
+"""
+Startup benchmark of our program.
+
+Builds a throwaway database directory with --users users and --films
+films (each with --showtimes showtimes), then times fresh interpreters:
+
+    import   python -c "import main"          (must not touch any database)
+    admin    python main.py -u <name> -p <pw>  (admin creating CLI)
+    server   python -c "import server; server.load_databases()"
+
+Each command runs --runs times and the best and median wall times are
+printed, followed by the slowest modules of
+`python -X importtime -c "import main"`.
+
+Usage:
+    python bench_startup.py --users 100000 --films 200 --runs 5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import generate_dataset
+import hashers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_database(directory, users: int, films: int, showtimes: int):
+    """
+    Generate users and films databases of the given sizes (no admins/
+    and no bank accounts) into directory, see generate_dataset.py
+    """
+    hashers.use(hashers.Sha256Hasher())
+    generate_dataset.generate(
+        os.path.join(directory, "database"), users, films, showtimes, clients=0, admin_count=0
+    )
+
+
+def timed(command, directory, env) -> float:
+    """
+    Run command and return its wall time. The exit status is not checked:/
+    the admin creating CLI always leaves through sys.exit(message).
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        command, cwd=directory, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def slowest_imports(directory, env, count: int) -> list:
+    """
+    Return (cumulative microseconds, module) of the slowest imports of main
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=directory, env=env, check=True, capture_output=True, text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), module.rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Time the startup of the cinema program.")
+    parser.add_argument("--users", type=int, default=100_000, help="Users in the database")
+    parser.add_argument("--films", type=int, default=200, help="Films in the database")
+    parser.add_argument("--showtimes", type=int, default=20, help="Showtimes of every film")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of every command")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ, PYTHONPATH=HERE, CINEMA_HASH_WORKERS="0")
+    env.pop("CINEMA_STORAGE", None)
+    try:
+        build_database(directory, args.users, args.films, args.showtimes)
+        main_py = os.path.join(HERE, "main.py")
+        commands = {
+            "import": lambda run: [sys.executable, "-c", "import main"],
+            "admin": lambda run: [sys.executable, main_py, "-u", f"admin{run}", "-p", "secret"],
+            "server": lambda run: [
+                sys.executable, "-c", "import server; server.load_databases()"
+            ],
+        }
+        print(f"{args.users} users, {args.films} films x {args.showtimes} showtimes")
+        for name, command in commands.items():
+            times = [timed(command(run), directory, env) for run in range(args.runs)]
+            print(
+                f"{name:>8}: best {min(times) * 1000:8.1f} ms"
+                f"   median {statistics.median(times) * 1000:8.1f} ms"
+            )
+        print("\nSlowest imports of main (cumulative):")
+        for cumulative, module in slowest_imports(directory, env, args.top):
+            print(f"{cumulative / 1000:8.1f} ms  {module}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+This module contains the lazy start up of our program.
+
+Importing our modules reads no database and creates no directory or
+log file. Each database is loaded by the first caller that needs it
+and created empty if it does not exist yet:
+
+    bootstrap.admins()  -> Admin.dictionary
+    bootstrap.films()   -> Film.films
+    bootstrap.users()   -> User.dictionary
+
+Calling them again is a dictionary lookup, so every entry point (the
+console, the admin creating CLI, the HTTP server, scripts) asks for the
+databases it uses and nothing else.
+"""
+
+import os
+import threading
+import metrics
+import storage
+from human import Human, User, Admin
+from movie import Film, JSON_FILE, setup_logging
+
+ADMINS_FILE = "./database/admins.json"
+USERS_FILE = "./database/users.json"
+
+_loaded = set()
+_lock = threading.RLock()
+_exporter = None
+
+
+def load(path, json_import, json_save) -> dict:
+    """
+    Return the document at path, saving an empty one first if it does not exist
+    """
+    if storage.backend().exists(path):
+        return json_import(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    dictionary = {}
+    json_save(path, dictionary)
+    return dictionary
+
+
+def admins() -> dict:
+    """
+    Load the admins database on first use and return it
+    """
+    with _lock:
+        if "admins" not in _loaded:
+            Admin.dictionary = load(ADMINS_FILE, Human.json_import, Human.json_save)
+            _loaded.add("admins")
+    return Admin.dictionary
+
+
+def films() -> dict:
+    """
+    Load the films database on first use and return it
+    """
+    with _lock:
+        if "films" not in _loaded:
+            Film.films = load(
+                JSON_FILE, Film.load_films_from_json, Film.save_films_to_json
+            )
+            _loaded.add("films")
+    return Film.films
+
+
+def users() -> dict:
+    """
+    Load the users database on first use and return it
+    """
+    with _lock:
+        if "users" not in _loaded:
+            User.dictionary = load(USERS_FILE, Human.json_import, Human.json_save)
+            _loaded.add("users")
+    return User.dictionary
+
+
+def start():
+    """
+    Start up what every interactive entry point needs: the log file,/
+    and the metrics exporter if CINEMA_METRICS_PORT is set
+    """
+    global _exporter
+    setup_logging()
+    port = os.environ.get("CINEMA_METRICS_PORT")
+    if port and _exporter is None:
+        metrics.enable()
+        _exporter = metrics.serve(int(port))
+
+
+def reset():
+    """
+    Forget what was loaded, the next call loads the databases again
+    """
+    with _lock:
+        _loaded.clear()
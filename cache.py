@@ -0,0 +1,98 @@
+"""
+This module contains the DocumentCache class, a cache of parsed/
+database files that is validated against the file on disk
+"""
+
+import os
+import threading
+
+
+class DocumentCache:
+    """
+    Cache of parsed documents keyed by path.
+
+    An entry is returned only while the file's inode, size and mtime are
+    the same as when it was cached, so a write from another process
+    makes the next get() parse the file again. The returned dictionary
+    is shared with every other caller, so changes made to it must be
+    saved like before.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def signature(path):
+        """
+        Return the (inode, size, mtime) of a file or None if it does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def get(self, path, loader):
+        """
+        Return the cached document of path, or call loader() to parse/
+        it again when the file has changed since it was cached
+        """
+        key = os.path.abspath(str(path))
+        signature = DocumentCache.signature(key)
+        with self.lock:
+            entry = self.entries.get(key)
+            if signature is not None and entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        dictionary = loader()
+        with self.lock:
+            self.entries[key] = (signature, dictionary)
+        return dictionary
+
+    def put(self, path, dictionary: dict):
+        """
+        Store a document that has just been written to path
+        """
+        key = os.path.abspath(str(path))
+        signature = DocumentCache.signature(key)
+        with self.lock:
+            self.entries[key] = (signature, dictionary)
+
+    def stale(self, path) -> bool:
+        """
+        Return True if path was cached and the file has changed since
+        """
+        key = os.path.abspath(str(path))
+        signature = DocumentCache.signature(key)
+        with self.lock:
+            entry = self.entries.get(key)
+        return entry is not None and entry[0] != signature
+
+    def peek(self, path):
+        """
+        Return the cached document of path without checking the file, or None
+        """
+        with self.lock:
+            entry = self.entries.get(os.path.abspath(str(path)))
+        return None if entry is None else entry[1]
+
+    def invalidate(self, path=None):
+        """
+        Drop the cached document of path, or every document if path is None
+        """
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.abspath(str(path)), None)
+
+    def stats(self) -> dict:
+        """
+        Return the hit and miss counters of the cache
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -112,6 +112,24 @@ class AlreadyExistAccount(Exception):
 class AddTicketFailed(Exception):
     """raised when add ticket for film failed."""
 
+class SeatError(Exception):
+    """
+    I use this Error when a chosen seat is not available.
+    """
+
+
+class HoldError(Exception):
+    """
+    I use this Error when a hold has expired or does not exist.
+    """
+
+
+class SessionError(Exception):
+    """
+    I use this Error when a payment session has expired, was closed or does not exist.
+    """
+
+
 class TicketError(Exception):
     """
     Ticket Error
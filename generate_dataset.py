@@ -0,0 +1,251 @@
+#! /usr/bin/python3
+"""
+Synthetic dataset generator of our databases.
+
+Writes admins.json, users.json, films.json and bank_accounts.json of
+any size into a directory, in the schemas our classes store (see
+records.py), e.g. "_User__password" and "_BankAccount__password":
+
+    python generate_dataset.py ./database --users 1000000 --films 2000 --showtimes 30
+
+The output only depends on --seed and the sizes: every record is made
+from its own generator seeded with (seed, kind, number), so the
+records of a client can be made again when its user is written.
+Documents are streamed to disk one record at a time, memory does not
+grow with the dataset. Stale journals of the written documents are
+removed, they belong to the snapshots being replaced.
+
+Every admin, user and bank account has the password --password. It is
+hashed once (with a salt from the seed) by the hasher in use, see
+hashers.py; --hasher sha256 makes legacy records.
+
+The first --clients users (half of them by default) own the bank
+accounts of one client each.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import uuid
+import hashers
+from records import AccountRecord, ClientRecord, FilmRecord, ShowtimeRecord, UserRecord
+from seatmap import SeatMap
+
+FIRST_NAMES = ("Ali", "Sara", "Reza", "Maryam", "Omid", "Neda", "Kian", "Leila", "Arash", "Yasmin")
+LAST_NAMES = ("Ahmadi", "Karimi", "Hosseini", "Rahimi", "Moradi", "Jafari", "Alavi", "Sadeghi")
+GENRES = ("Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Romance", "Animation", "Documentary")
+AGE_RATINGS = ("G", "PG", "PG-13", "R")
+PLANS = ("Bronze", "Bronze", "Bronze", "Silver", "Gold")
+ACCOUNT_NAMES = ("main", "savings", "business")
+SHOWTIMES = ("10:00", "13:00", "16:00", "19:00", "22:00")
+START_DATE = datetime.date(2025, 1, 1)
+
+
+def generator(seed, kind: str, number: int) -> random.Random:
+    """
+    Return the random generator of one record
+    """
+    return random.Random(f"{seed}:{kind}:{number}")
+
+
+def password_record(password: str, seed) -> str:
+    """
+    Return the hash record every generated password shares
+    """
+    current = hashers.hasher()
+    if isinstance(current, hashers.Sha256Hasher):
+        return current.encode(password)
+    return current.encode(password, salt=generator(seed, "salt", 0).randbytes(16))
+
+
+def user_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def national_id(number: int) -> str:
+    return str(1_000_000_000 + number)
+
+
+def client(seed, number: int, password: str) -> ClientRecord:
+    """
+    Return the number-th client with its bank accounts
+    """
+    rng = generator(seed, "client", number)
+    nid = national_id(number)
+    accounts = {}
+    for name in ACCOUNT_NAMES[: rng.randint(1, len(ACCOUNT_NAMES))]:
+        created = datetime.datetime.combine(START_DATE, datetime.time()) - datetime.timedelta(
+            seconds=rng.randrange(10 * 365 * 86400)
+        )
+        accounts[name] = AccountRecord(
+            national_id=nid,
+            account_name=name,
+            balance=rng.randrange(10_000, 100_000_000, 1_000),
+            password=password,
+            creation_date=created.isoformat(timespec="seconds"),
+            cvv2=rng.randint(1111, 9999),
+        )
+    return ClientRecord(
+        national_id=nid,
+        first_name=rng.choice(FIRST_NAMES),
+        last_name=rng.choice(LAST_NAMES),
+        accounts=accounts,
+    )
+
+
+def user(seed, number: int, password: str, clients: int) -> UserRecord:
+    """
+    Return the number-th user, owning the accounts of client number if there is one
+    """
+    rng = generator(seed, "user", number)
+    birth = datetime.date(1950, 1, 1) + datetime.timedelta(days=rng.randrange(365 * 60))
+    joined = datetime.datetime.combine(START_DATE, datetime.time()) - datetime.timedelta(
+        seconds=rng.randrange(3 * 365 * 86400), microseconds=rng.randrange(1_000_000)
+    )
+    bank_accounts = {}
+    if number < clients:
+        bank_accounts = {
+            name: account.to_dict() for name, account in client(seed, number, password).accounts.items()
+        }
+    return UserRecord(
+        fname=rng.choice(FIRST_NAMES),
+        lname=rng.choice(LAST_NAMES),
+        username=f"user{number}",
+        password=password,
+        user_id=user_id(rng),
+        phone_number=f"09{rng.randrange(10 ** 9):09d}",
+        birth_date=birth.isoformat(),
+        join_date=str(joined),
+        current_plan=rng.choice(PLANS),
+        wallet=rng.choice((0, 0, rng.randrange(1_000, 1_000_000, 1_000))),
+        bank_accounts=bank_accounts,
+    )
+
+
+def film(seed, number: int, showtimes: int, seat_maps: float) -> FilmRecord:
+    """
+    Return the number-th film with its showtimes, a seat_maps share of them/
+    with an empty seat map and the others partly sold
+    """
+    rng = generator(seed, "film", number)
+    name = f"film{number}"
+    tickets = {}
+    for index in range(showtimes):
+        day, slot = divmod(index, len(SHOWTIMES))
+        scene_date = (START_DATE + datetime.timedelta(days=day)).isoformat()
+        showtime = ShowtimeRecord(
+            name=name,
+            scene_date=scene_date,
+            showtime=SHOWTIMES[slot],
+            available_seats=rng.choice((50, 100, 150)),
+            price=rng.randrange(50_000, 300_000, 10_000),
+        )
+        if rng.random() < seat_maps:
+            rows = rng.choice((5, 10))
+            showtime.available_seats = rows * 10
+            showtime.seat_map = SeatMap(rows, 10).to_record()
+        showtime.capacity = showtime.available_seats
+        if showtime.seat_map is None:
+            showtime.available_seats -= rng.randrange(showtime.capacity + 1)
+        tickets[showtime.key] = showtime
+    return FilmRecord(
+        name=name,
+        genre=rng.choice(GENRES),
+        age_rating=rng.choice(AGE_RATINGS),
+        tickets=tickets,
+    )
+
+
+def admins(seed, count: int, password: str):
+    for number in range(count):
+        username = f"admin{number}"
+        yield username, {
+            "_username": username,
+            "_Admin__password": password,
+            "user_id": user_id(generator(seed, "admin", number)),
+        }
+
+
+def write_document(path, entries) -> tuple:
+    """
+    Stream (key, record) entries into the JSON document at path and/
+    return (records, bytes). The file is replaced only when complete.
+    """
+    temporary = f"{path}.tmp"
+    count = 0
+    with open(temporary, mode="w", encoding="utf-8") as file:
+        file.write("{")
+        separator = "\n"
+        for key, record in entries:
+            file.write(f"{separator}{json.dumps(key)}: {json.dumps(record)}")
+            separator = ",\n"
+            count += 1
+        file.write("\n}\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    journal = os.path.splitext(path)[0] + ".journal"
+    if os.path.exists(journal):
+        os.remove(journal)
+    return count, os.path.getsize(path)
+
+
+def generate(directory, users: int, films: int, showtimes: int, clients: int = None,
+             admin_count: int = 1, seed=0, password: str = "secret", seat_maps: float = 0.25) -> dict:
+    """
+    Write the four documents into directory and return {file name: (records, bytes)}
+    """
+    clients = users // 2 if clients is None else min(clients, users)
+    os.makedirs(directory, exist_ok=True)
+    hashed = password_record(password, seed)
+    documents = {
+        "admins.json": admins(seed, admin_count, hashed),
+        "users.json": (
+            (f"user{number}", user(seed, number, hashed, clients).to_dict())
+            for number in range(users)
+        ),
+        "films.json": (
+            (f"film{number}", film(seed, number, showtimes, seat_maps).to_dict())
+            for number in range(films)
+        ),
+        "bank_accounts.json": (
+            (national_id(number), client(seed, number, hashed).to_dict())
+            for number in range(clients)
+        ),
+    }
+    return {
+        name: write_document(os.path.join(directory, name), entries)
+        for name, entries in documents.items()
+    }
+
+
+def main(argv=None):
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic cinema database.")
+    parser.add_argument("directory", help="Database directory to write, e.g. ./database")
+    parser.add_argument("--users", type=int, default=100_000, help="Users to generate")
+    parser.add_argument("--clients", type=int, default=None, help="Bank clients (users // 2 by default)")
+    parser.add_argument("--admins", type=int, default=1, help="Admins to generate")
+    parser.add_argument("--films", type=int, default=1_000, help="Films to generate")
+    parser.add_argument("--showtimes", type=int, default=20, help="Showtimes of every film")
+    parser.add_argument("--seat-maps", type=float, default=0.25, help="Share of showtimes with a seat map")
+    parser.add_argument("--seed", default="0", help="Seed of the dataset")
+    parser.add_argument("--password", default="secret", help="Password of every admin, user and account")
+    parser.add_argument("--hasher", choices=sorted(hashers.HASHERS), help="Password hasher")
+    args = parser.parse_args(argv)
+    if args.hasher is not None:
+        hashers.use(hashers.HASHERS[args.hasher]())
+    written = generate(
+        args.directory, args.users, args.films, args.showtimes, args.clients,
+        args.admins, args.seed, args.password, args.seat_maps,
+    )
+    for name, (count, size) in written.items():
+        print(f"{name:<20} {count:>10} records {size / 1e6:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+This module contains the password hashers of our users, admins and/
+bank accounts.
+
+A stored password is a versioned hash record that names the hasher and
+its parameters, e.g.
+
+    scrypt$16384$8$1$<salt hex>$<key hex>
+    pbkdf2_sha256$600000$<salt hex>$<key hex>
+
+Old records are bare SHA-256 hex digests without a "$". verify() works
+with every kind of record, and outdated() tells whether a record should
+be hashed again with the hasher in use (done on the next sign in).
+
+Key derivation is slow on purpose, so hash_password() and verify() run
+it on a process pool: concurrent sign ins use every core instead of
+waiting for each other on the GIL.
+"""
+
+from abc import ABC, abstractmethod
+import hashlib
+import hmac
+import os
+import threading
+
+
+class Hasher(ABC):
+    """
+    This is an Abstract class for our password hashers
+    """
+
+    NAME = None
+
+    @abstractmethod
+    def encode(self, password: str, salt: bytes = None) -> str:
+        """
+        Return the hash record of password
+        """
+
+    @abstractmethod
+    def verify(self, password: str, record: str) -> bool:
+        """
+        Return True if password matches a hash record of this hasher
+        """
+
+    def outdated(self, record: str) -> bool:
+        """
+        Return True if record was made by another hasher or with other parameters
+        """
+        return record.rsplit("$", 2)[0] != self.prefix()
+
+    def prefix(self) -> str:
+        return self.NAME
+
+
+class Sha256Hasher(Hasher):
+    """
+    Unsalted SHA-256, the hasher of old records. Only kept to check them.
+    """
+
+    NAME = "sha256"
+
+    def encode(self, password: str, salt: bytes = None) -> str:
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+    def verify(self, password: str, record: str) -> bool:
+        return hmac.compare_digest(self.encode(password), record)
+
+    def outdated(self, record: str) -> bool:
+        return "$" in record
+
+
+class Pbkdf2Hasher(Hasher):
+    """
+    PBKDF2 with HMAC-SHA256
+    """
+
+    NAME = "pbkdf2_sha256"
+    ITERATIONS = 600_000
+
+    def __init__(self, iterations: int = None):
+        self.iterations = Pbkdf2Hasher.ITERATIONS if iterations is None else iterations
+
+    def prefix(self) -> str:
+        return f"{self.NAME}${self.iterations}"
+
+    @staticmethod
+    def derive(password: str, salt: bytes, iterations: int) -> str:
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations).hex()
+
+    def encode(self, password: str, salt: bytes = None) -> str:
+        salt = os.urandom(16) if salt is None else salt
+        key = Pbkdf2Hasher.derive(password, salt, self.iterations)
+        return f"{self.prefix()}${salt.hex()}${key}"
+
+    def verify(self, password: str, record: str) -> bool:
+        _, iterations, salt, key = record.split("$")
+        derived = Pbkdf2Hasher.derive(password, bytes.fromhex(salt), int(iterations))
+        return hmac.compare_digest(derived, key)
+
+
+class ScryptHasher(Hasher):
+    """
+    scrypt, memory hard (128 * n * r bytes per hash)
+    """
+
+    NAME = "scrypt"
+    N, R, P = 1 << 14, 8, 1
+
+    def __init__(self, n: int = None, r: int = None, p: int = None):
+        self.n = ScryptHasher.N if n is None else n
+        self.r = ScryptHasher.R if r is None else r
+        self.p = ScryptHasher.P if p is None else p
+
+    def prefix(self) -> str:
+        return f"{self.NAME}${self.n}${self.r}${self.p}"
+
+    @staticmethod
+    def derive(password: str, salt: bytes, n: int, r: int, p: int) -> str:
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r
+        ).hex()
+
+    def encode(self, password: str, salt: bytes = None) -> str:
+        salt = os.urandom(16) if salt is None else salt
+        key = ScryptHasher.derive(password, salt, self.n, self.r, self.p)
+        return f"{self.prefix()}${salt.hex()}${key}"
+
+    def verify(self, password: str, record: str) -> bool:
+        _, n, r, p, salt, key = record.split("$")
+        derived = ScryptHasher.derive(password, bytes.fromhex(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(derived, key)
+
+
+HASHERS = {
+    Sha256Hasher.NAME: Sha256Hasher,
+    Pbkdf2Hasher.NAME: Pbkdf2Hasher,
+    ScryptHasher.NAME: ScryptHasher,
+}
+
+_hasher = None
+_pool = None
+_pool_guard = threading.Lock()
+
+
+def hasher() -> Hasher:
+    """
+    Return the hasher new passwords are hashed with. It is chosen by the
+    CINEMA_HASHER environment variable ("scrypt", "pbkdf2_sha256" or
+    "sha256") and defaults to scrypt.
+    """
+    global _hasher
+    if _hasher is None:
+        _hasher = HASHERS[os.environ.get("CINEMA_HASHER", ScryptHasher.NAME)]()
+    return _hasher
+
+
+def use(new_hasher: Hasher):
+    """
+    Replace the hasher in use
+    """
+    global _hasher
+    _hasher = new_hasher
+
+
+def identify(record: str) -> Hasher:
+    """
+    Return a hasher able to verify record
+    """
+    if "$" not in record:
+        return Sha256Hasher()
+    name = record.split("$", 1)[0]
+    if name not in HASHERS:
+        raise ValueError(f"Unknown password hasher: '{name}'")
+    return HASHERS[name]()
+
+
+def pool():
+    """
+    Return the process pool key derivation runs on, or None if the
+    CINEMA_HASH_WORKERS environment variable is 0 (hash in the caller).
+    multiprocessing is only imported here, it is slow to import.
+    """
+    global _pool
+    with _pool_guard:
+        if _pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = int(os.environ.get("CINEMA_HASH_WORKERS", os.cpu_count() or 1))
+            _pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else False
+        return _pool or None
+
+
+def run(function, *args):
+    """
+    Call function(*args) on the process pool and wait for the result.
+    If the pool can't be used (e.g. a worker died) it runs in the caller.
+    """
+    global _pool
+    executor = pool()
+    if executor is None:
+        return function(*args)
+    from concurrent.futures.process import BrokenProcessPool
+
+    try:
+        return executor.submit(function, *args).result()
+    except (BrokenProcessPool, RuntimeError):
+        with _pool_guard:
+            _pool = None
+        return function(*args)
+
+
+def hash_password(password: str) -> str:
+    """
+    Return the hash record of password made by the hasher in use
+    """
+    current = hasher()
+    if isinstance(current, Sha256Hasher):
+        return current.encode(password)
+    return run(current.encode, password)
+
+
+def hash_passwords(passwords: list) -> list:
+    """
+    Return the hash records of several passwords, hashed in parallel/
+    on the process pool (for bulk imports)
+    """
+    global _pool
+    current = hasher()
+    executor = None if isinstance(current, Sha256Hasher) else pool()
+    if executor is None:
+        return [current.encode(password) for password in passwords]
+    from concurrent.futures.process import BrokenProcessPool
+
+    chunksize = max(1, len(passwords) // (4 * (os.cpu_count() or 1)))
+    try:
+        return list(executor.map(current.encode, passwords, chunksize=chunksize))
+    except (BrokenProcessPool, RuntimeError):
+        with _pool_guard:
+            _pool = None
+        return [current.encode(password) for password in passwords]
+
+
+def verify(password: str, record: str) -> bool:
+    """
+    Return True if password matches a hash record of any hasher
+    """
+    checker = identify(record)
+    if isinstance(checker, Sha256Hasher):
+        return checker.verify(password, record)
+    return run(checker.verify, password, record)
+
+
+def outdated(record: str) -> bool:
+    """
+    Return True if record should be hashed again with the hasher in use
+    """
+    return hasher().outdated(record)
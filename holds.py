@@ -0,0 +1,82 @@
+"""
+This module contains the HoldSweeper class, which gives back the seats/
+of expired holds
+"""
+
+import heapq
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HoldSweeper:
+    """
+    Releases expired seat holds in bulk.
+
+    Every hold is pushed on a heap ordered by its expiry time, so finding
+    the expired ones only pops the top of the heap instead of scanning
+    every showtime. A daemon thread sleeps until the earliest expiry and
+    then calls release(film_name, ticket_key, hold_ids) once per showtime
+    with all of its expired holds. Holds confirmed or released before
+    they expire stay on the heap; release() must ignore ids it no longer
+    knows.
+    """
+
+    def __init__(self, release):
+        self.release = release
+        self.heap = []
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def add(self, expires: float, film_name, ticket_key, hold_id):
+        """
+        Schedule a hold to be released at expires (a time.time() value)
+        """
+        with self.condition:
+            heapq.heappush(self.heap, (expires, film_name, ticket_key, hold_id))
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="hold-sweeper", daemon=True
+                )
+                self.thread.start()
+            self.condition.notify()
+
+    def due(self, now: float = None) -> dict:
+        """
+        Pop every hold expired at now, grouped as {(film_name, ticket_key): [hold_id, ...]}
+        """
+        now = time.time() if now is None else now
+        expired = {}
+        with self.condition:
+            while self.heap and self.heap[0][0] <= now:
+                _, film_name, ticket_key, hold_id = heapq.heappop(self.heap)
+                expired.setdefault((film_name, ticket_key), []).append(hold_id)
+        return expired
+
+    def sweep(self, now: float = None) -> int:
+        """
+        Release every hold expired at now. Returns the number of holds released.
+        """
+        expired = self.due(now)
+        for (film_name, ticket_key), hold_ids in expired.items():
+            self.release(film_name, ticket_key, hold_ids)
+        return sum(len(hold_ids) for hold_ids in expired.values())
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.heap:
+                    self.condition.wait()
+                delay = self.heap[0][0] - time.time()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Releasing expired holds failed")
+
+    def __len__(self):
+        return len(self.heap)
@@ -8,7 +8,11 @@ import uuid
 import hashlib
 import json
 import pathlib
-from movie import Film, Ticket
+import hashers
+import locks
+import metrics
+import storage
+from movie import Film, Ticket, JSON_FILE
 from bank_accounts import Client, BankAccount
 from custom_exceptions import (
     UserError,
@@ -18,7 +22,28 @@ from custom_exceptions import (
     TwoPasswordError,
     PhoneNumberError,
     FilmError,
-    TicketError
+    TicketError,
+    NoCapacityError,
+    SeatError,
+    BalanceMinimum,
+    UnsuccessfulIdDeposit,
+    UnsuccessfulAccountDeposit,
+    UnsuccessfulPasswordDeposit,
+    UnsuccessfulCvv2Deposit,
+    SessionError,
+)
+
+RESERVE_ERRORS = (
+    FilmError,
+    TicketError,
+    NoCapacityError,
+    SeatError,
+    BalanceMinimum,
+    UnsuccessfulIdDeposit,
+    UnsuccessfulAccountDeposit,
+    UnsuccessfulPasswordDeposit,
+    UnsuccessfulCvv2Deposit,
+    SessionError,
 )
 
 
@@ -28,7 +53,7 @@ class Human(ABC):
     Admin
     """
 
-    all_usernames = []
+    all_usernames = set()
 
     def __init__(
             self,
@@ -52,11 +77,23 @@ class Human(ABC):
     @staticmethod
     def hashing(password: str):
         """
-        This method is for hashing passwords
+        This method returns the old unsalted SHA-256 hash of a password,/
+        new passwords are hashed with hashers.hash_password
         """
         hashed_pass = hashlib.sha256(password.encode("utf-8")).hexdigest()
         return hashed_pass
 
+    @classmethod
+    def upgrade_password(cls, user_name: str, password: str, field: str):
+        """
+        Hash a verified password again if its stored record was made/
+        by an outdated hasher (e.g. old SHA-256 records), and save it
+        """
+        record = cls.dictionary[user_name]
+        if hashers.outdated(record[field]):
+            record[field] = hashers.hash_password(password)
+            Human.json_save(cls.jsonpath, cls.dictionary)
+
     @staticmethod
     def json_save(filename, dictionary):
         """
@@ -64,8 +101,7 @@ class Human(ABC):
         database.json JSON fileeverytime use this method,/
         the JSON file emptied and rewrite the class dictionary into it
         """
-        with open(filename, mode="w+", encoding="utf-8") as f_1:
-            json.dump(dictionary, f_1, indent=4)
+        storage.backend().save(filename, dictionary)
 
     @staticmethod
     def json_import(filename) -> dict:
@@ -73,8 +109,7 @@ class Human(ABC):
         This class method import whole content of database.json file into/
         our class dictionary with json.load() method
         """
-        with open(filename, mode="r", encoding="utf-8") as f_1:
-            return json.load(f_1)
+        return storage.backend().load(filename)
 
     @classmethod
     @abstractmethod
@@ -89,6 +124,32 @@ class Human(ABC):
         """
         pass
 
+    @classmethod
+    def cached_obj(cls, username: str):
+        """
+        Return the live object of username from our identity map,/
+        or None if there is none or it no longer wraps the stored record/
+        (e.g. the dictionary was imported again)
+        """
+        obj = cls.objects.get(username)
+        if obj is None or obj.__dict__ is not cls.dictionary.get(username):
+            return None
+        cls.all_usernames.add(username)
+        return obj
+
+    @classmethod
+    def from_record(cls, record: dict):
+        """
+        Build a signed in object straight from its stored record,/
+        without validating, hashing or saving anything again./
+        The object's attributes are the record itself.
+        """
+        obj = cls.__new__(cls)
+        obj.__dict__ = record
+        cls.objects[obj.username] = obj
+        cls.all_usernames.add(obj.username)
+        return obj
+
     def __str__(self):
         """
         This is a __str__ magic method for/
@@ -229,7 +290,8 @@ class User(Human):
 
     jsonpath = pathlib.Path("./database/users.json")
     dictionary = {}
-    all_usernames = []
+    all_usernames = set()
+    objects = {}
 
     def __init__(
             self,
@@ -271,27 +333,192 @@ class User(Human):
             self.bank_accounts = {}
         else:
             self.bank_accounts = bank_accounts
-        User.all_usernames.append(self.username)
+        User.all_usernames.add(self.username)
         if self.username not in User.dictionary:
             User.dictionary.update({self.username: self.__dict__})
+            User.objects[self.username] = self
             Human.json_save(User.jsonpath, User.dictionary)
 
     def apply_discount(self, price: float, discount_percent: float) -> float:
         return price * (1 - discount_percent)
 
     @staticmethod
-    def reserve_ticket(film_name, scene_date, showtime, quantity, national_id, account_name, password, cvv2):
+    @metrics.timed("reserve_ticket")
+    def reserve_ticket(film_name, scene_date, showtime, quantity, national_id, account_name, password, cvv2, seats=None, session=None):
         """
-        Implement ticket reserve here
+        Implement ticket reserve here.
+        The showtime stays locked from the capacity check until/
+        the seats are sold, so two buyers can't both take the last seats.
+        For showtimes with a seat map, seats can be a list of (row, column);/
+        otherwise the best adjacent seats are chosen. With a payment/
+        session (BankAccount.open_session) password and cvv2 may be None./
+        Returns the sold seats, or None if the showtime has no seat map.
         """
+        ticket_key = scene_date + " _ " + showtime
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            if film_name not in Film.films:
+                raise FilmError("Film Not found! ")
+            if ticket_key not in Film.films[film_name]["tickets"]:
+                raise TicketError("ticket Not Found! ")
+            Ticket.release_expired(film_name, ticket_key)
+            ticket = Film.films[film_name]["tickets"][ticket_key]
+            seat_map = Ticket.seat_map(film_name, ticket_key)
+            if seat_map is not None:
+                if seats is None:
+                    seats = seat_map.best_seats(quantity)
+                    if seats is None:
+                        raise NoCapacityError("Insufficient ticket! ")
+                seat_map.copy().commit(seats)
+                quantity = len(seats)
+            elif seats is not None:
+                raise SeatError("This showtime has no seat map.")
+            if quantity > ticket["available_seats"]:
+                raise NoCapacityError("Insufficient ticket! ")
+            total_price = ticket["price"] * quantity
+            BankAccount.withdraw(
+                national_id, account_name, password, cvv2, total_price, session
+            )
+            if seat_map is not None:
+                return Ticket.sell_seats(film_name, ticket_key, seats)
+            Ticket.sell_ticket(film_name, ticket_key, quantity)
+
+    @staticmethod
+    def hold_ticket(film_name, scene_date, showtime, quantity, seats=None, ttl=None) -> dict:
+        """
+        Hold seats while the buyer fills the checkout form.
+        The held seats are taken from the showtime at once and given/
+        back if checkout() is not called within ttl seconds/
+        (Ticket.HOLD_TTL by default). Returns the hold dictionary.
+        """
+        ticket_key = scene_date + " _ " + showtime
+        Film.refresh()
         if film_name not in Film.films:
             raise FilmError("Film Not found! ")
-        ticket_key = scene_date + " _ " + showtime
         if ticket_key not in Film.films[film_name]["tickets"]:
             raise TicketError("ticket Not Found! ")
-        total_price = Film.films[film_name]["tickets"][scene_date + " _ " + showtime]["price"] * quantity
-        BankAccount.withdraw(national_id, account_name, password, cvv2, total_price)
-        Ticket.sell_ticket(film_name, ticket_key, quantity)
+        return Ticket.hold(film_name, ticket_key, quantity, seats, ttl)
+
+    @staticmethod
+    def checkout(hold: dict, national_id, account_name, password, cvv2, session=None):
+        """
+        Pay for a hold and turn it into a sale.
+        The showtime stays locked from the hold check until the sale,/
+        so a hold can't expire after the payment went through./
+        Returns the sold seats, or None if the showtime has no seat map.
+        """
+        film_name, ticket_key = hold["film"], hold["ticket"]
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            stored = Ticket.live_hold(film_name, ticket_key, hold["id"])
+            price = Film.films[film_name]["tickets"][ticket_key]["price"]
+            BankAccount.withdraw(
+                national_id,
+                account_name,
+                password,
+                cvv2,
+                price * stored["quantity"],
+                session,
+            )
+            return Ticket.confirm(film_name, ticket_key, hold["id"])
+
+    @staticmethod
+    def cancel_hold(hold: dict):
+        """
+        Give back the seats of a hold before it expires
+        """
+        Ticket.release_holds(hold["film"], hold["ticket"], [hold["id"]])
+
+    @staticmethod
+    def reserve_many(orders: list) -> list:
+        """
+        Reserve a batch of orders in one go.
+        Every order is a dictionary with the arguments of reserve_ticket/
+        (film_name, scene_date, showtime, quantity, national_id,/
+        account_name, password, cvv2, optional session). All orders are checked against/
+        the loaded databases, then every debit and every seat sale is/
+        stored together, so each database file is written once.
+        Returns a list with None for every reserved order and the/
+        exception (FilmError, NoCapacityError, BalanceMinimum, ...)/
+        of every failed one, in the order of orders.
+        """
+        showtimes = [
+            (order["film_name"], order["scene_date"] + " _ " + order["showtime"])
+            for order in orders
+        ]
+        accounts = [(order["national_id"], order["account_name"]) for order in orders]
+
+        with locks.table(JSON_FILE).hold(showtimes):
+            with locks.table(BankAccount.FILENAME).hold(accounts):
+                Film.refresh()
+                for film_name, ticket_key in set(showtimes):
+                    if ticket_key in Film.films.get(film_name, {}).get("tickets", {}):
+                        Ticket.release_expired(film_name, ticket_key)
+                accounts_info = BankAccount.json_import(BankAccount.FILENAME)
+                seats, balances, seat_maps = {}, {}, {}
+                results, sales, debits = [], [], []
+                for order, showtime, account in zip(orders, showtimes, accounts):
+                    film_name, ticket_key = showtime
+                    try:
+                        if film_name not in Film.films:
+                            raise FilmError("Film Not found! ")
+                        tickets = Film.films[film_name]["tickets"]
+                        if ticket_key not in tickets:
+                            raise TicketError("ticket Not Found! ")
+                        ticket = tickets[ticket_key]
+                        available = seats.get(showtime, ticket["available_seats"])
+                        if order["quantity"] > available:
+                            raise NoCapacityError("Insufficient ticket! ")
+                        seat_map = seat_maps.get(showtime)
+                        if seat_map is None and "seat_map" in ticket:
+                            seat_map = Ticket.seat_map(film_name, ticket_key).copy()
+                        if seat_map is not None:
+                            chosen = seat_map.best_seats(order["quantity"])
+                            if chosen is None:
+                                raise NoCapacityError("Insufficient ticket! ")
+                        total_price = ticket["price"] * order["quantity"]
+                        balance = BankAccount.check_withdraw(
+                            accounts_info,
+                            order["national_id"],
+                            order["account_name"],
+                            order["password"],
+                            order["cvv2"],
+                            total_price,
+                            balances.get(account),
+                            order.get("session"),
+                        )
+                    except RESERVE_ERRORS as error:
+                        results.append(error)
+                        continue
+                    seats[showtime] = available - order["quantity"]
+                    balances[account] = balance
+                    if seat_map is not None:
+                        seat_map.commit(chosen)
+                        seat_maps[showtime] = seat_map
+                    sales.append(
+                        Ticket.sale_record(
+                            film_name,
+                            ticket_key,
+                            order["quantity"],
+                            seats[showtime],
+                            seat_map,
+                        )
+                    )
+                    debits.append(
+                        BankAccount.balance_record(
+                            order["national_id"], order["account_name"], -total_price, balance
+                        )
+                    )
+                    results.append(None)
+
+                if debits:
+                    storage.backend().apply(BankAccount.FILENAME, debits)
+                    for record in debits:
+                        storage.apply_record(accounts_info, record)
+                    Film.log_changes(sales)
+                    for record in sales:
+                        storage.apply_record(Film.films, record)
+        return results
 
     @staticmethod
     def show_plans():
@@ -335,8 +562,8 @@ class User(Human):
         User.dictionary[self.username]["bank_accounts"][account_name]["_balance"] += amount
         User.json_save(User.jsonpath, User.dictionary)
 
-    def charge_wallet(self, national_id, account_name, password, cvv2, amount):
-        BankAccount.withdraw(national_id, account_name, password, cvv2, amount)
+    def charge_wallet(self, national_id, account_name, password, cvv2, amount, session=None):
+        BankAccount.withdraw(national_id, account_name, password, cvv2, amount, session)
         self.wallet += amount
         print(self.wallet)
         User.dictionary = User.json_import(User.jsonpath)
@@ -359,22 +586,12 @@ class User(Human):
         password of the user and it will return an object/
         for us
         """
-        for i, j in cls.dictionary.items():
-            if i == username:
-                our_obj = cls(
-                    j["fname"],
-                    j["lname"],
-                    j["_username"],
-                    password,
-                    j["birth_date"],
-                    j["_phone_number"],
-                    j["user_id"],
-                    j["join_date"],
-                    j["current_plan"],
-                    j["wallet"],
-                    j["bank_accounts"],
-                )
-                return our_obj
+        our_obj = cls.cached_obj(username)
+        if our_obj is not None:
+            return our_obj
+        if username not in cls.dictionary:
+            return None
+        return cls.from_record(cls.dictionary[username])
 
     def __str__(self):
         """
@@ -384,6 +601,7 @@ class User(Human):
         return f"\nUser Information:\n\tUsername: {self.username}\n\tPhone Number: {self.phone_number}\n\tUser ID: {self.user_id}\n\tJoin Date: {self.join_date}\n\tCurrent Plan: {self.current_plan}\n\tWallet: {self.wallet}"
 
     @classmethod
+    @metrics.timed("sign_in")
     def sign_in_validation(cls, user_name: str, password: str):
         """
         This method is for sign in validation/
@@ -398,9 +616,9 @@ class User(Human):
         """
         if user_name not in cls.dictionary:
             raise UserError("Username not found! ")
-        new_key = Human.hashing(password)
-        if cls.dictionary[user_name]["_User__password"] != new_key:
+        if not hashers.verify(password, cls.dictionary[user_name]["_User__password"]):
             raise PasswordError("Wrong Password!")
+        cls.upgrade_password(user_name, password, "_User__password")
         usr_obj = cls.get_obj(user_name, password)
         return usr_obj
 
@@ -451,8 +669,11 @@ class User(Human):
         if usr_name != "":
             del User.dictionary[self.username]
             User.all_usernames.remove(self.username)
+            if User.objects.get(self.username) is self:
+                del User.objects[self.username]
+                User.objects[usr_name] = self
             self.username = usr_name
-            User.all_usernames.append(self.username)
+            User.all_usernames.add(self.username)
             User.dictionary.update({self.username: self.__dict__})
         Human.json_save(User.jsonpath, User.dictionary)
 
@@ -463,8 +684,7 @@ class User(Human):
         or new password and Repeat it not match together/
         raise an error.
         """
-        old_key = Human.hashing(old_pass)
-        if old_key != self.password:
+        if not hashers.verify(old_pass, self.password):
             raise PasswordError("Wrong original Password! ")
         if new_pass != rep_new_pass:
             raise TwoPasswordError("Unmatched new passwords")
@@ -496,7 +716,7 @@ class User(Human):
     def password(self, passwd_value):
         if not Human.password_check(passwd_value):
             raise ShortPasswordError("Too short Password! ")
-        key_value = Human.hashing(passwd_value)
+        key_value = hashers.hash_password(passwd_value)
         self.__password = key_value
 
     @property
@@ -517,7 +737,9 @@ class User(Human):
         This function is for deleting an object/
         from class when he/she logs out.
         """
-        User.all_usernames.remove(self.username)
+        User.all_usernames.discard(self.username)
+        if User.objects.get(self.username) is self:
+            del User.objects[self.username]
         del self
 
 
@@ -527,8 +749,9 @@ class Admin(Human):
     inherites from Human Abstract user.
     """
 
-    all_usernames = []
+    all_usernames = set()
     dictionary = {}
+    objects = {}
     jsonpath = pathlib.Path("./database/admins.json")
 
     def __init__(self, username, password, user_id: str = None):
@@ -537,9 +760,10 @@ class Admin(Human):
             self.user_id = Human.uuid_gen()
         else:
             self.user_id = user_id
-        Admin.all_usernames.append(self.username)
+        Admin.all_usernames.add(self.username)
         if self.username not in Admin.dictionary:
             Admin.dictionary.update({self.username: self.__dict__})
+            Admin.objects[self.username] = self
             Human.json_save(Admin.jsonpath, Admin.dictionary)
 
     @classmethod
@@ -552,16 +776,19 @@ class Admin(Human):
         password of the user and it will return an object/
         for us
         """
-        for i, j in cls.dictionary.items():
-            if i == username:
-                return cls(j["_username"], password, j["user_id"])
+        our_obj = cls.cached_obj(username)
+        if our_obj is not None:
+            return our_obj
+        if username not in cls.dictionary:
+            return None
+        return cls.from_record(cls.dictionary[username])
 
     @staticmethod
-    def add_show(name, scene_date, showtime, capacity, price):
+    def add_show(name, scene_date, showtime, capacity, price, rows=None, cols=None):
         """
         Implementing add a show here
         """
-        Ticket.add_ticket(name, scene_date, showtime, capacity, price)
+        Ticket.add_ticket(name, scene_date, showtime, capacity, price, rows, cols)
 
     @staticmethod
     def remove_film(name):
@@ -586,6 +813,7 @@ class Admin(Human):
                 {self.username}\n\tUser ID: {self.user_id}"
 
     @classmethod
+    @metrics.timed("sign_in")
     def sign_in_validation(cls, user_name: str, password: str):
         """
         This method is for sign in validation/
@@ -600,9 +828,9 @@ class Admin(Human):
         """
         if user_name not in cls.dictionary:
             raise UserError("Username not found! ")
-        new_key = Human.hashing(password)
-        if cls.dictionary[user_name]["_Admin__password"] != new_key:
+        if not hashers.verify(password, cls.dictionary[user_name]["_Admin__password"]):
             raise PasswordError("Wrong Password!")
+        cls.upgrade_password(user_name, password, "_Admin__password")
         adm_obj = cls.get_obj(user_name, password)
         return adm_obj
 
@@ -631,8 +859,11 @@ class Admin(Human):
         if usr_name != "":
             Admin.all_usernames.remove(self.username)
             del Admin.dictionary[self.username]
+            if Admin.objects.get(self.username) is self:
+                del Admin.objects[self.username]
+                Admin.objects[usr_name] = self
             self.username = usr_name
-            Admin.all_usernames.append(self.username)
+            Admin.all_usernames.add(self.username)
             Admin.dictionary.update({self.username: self.__dict__})
         if ph_numb != "":
             Admin.dictionary[self.username]["_phone_number"] = ph_numb
@@ -645,8 +876,7 @@ class Admin(Human):
         or new password and Repeat it not match together/
         raise an error.
         """
-        old_key = Human.hashing(old_pass)
-        if old_key != self.password:
+        if not hashers.verify(old_pass, self.password):
             raise PasswordError("Wrong original Password! ")
         if new_pass != rep_new_pass:
             raise TwoPasswordError("Unmatched new passwords")
@@ -678,7 +908,7 @@ class Admin(Human):
     def password(self, passwd_value):
         if not Human.password_check(passwd_value):
             raise ShortPasswordError("Too short Password! ")
-        key_value = Human.hashing(passwd_value)
+        key_value = hashers.hash_password(passwd_value)
         self.__password = key_value
 
     @property
@@ -707,7 +937,9 @@ class Admin(Human):
         This function is for deleting an object/
         from class when he/she logs out.
         """
-        Admin.all_usernames.remove(self.username)
+        Admin.all_usernames.discard(self.username)
+        if Admin.objects.get(self.username) is self:
+            del Admin.objects[self.username]
         del self
 
 
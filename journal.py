@@ -0,0 +1,164 @@
+"""
+This module contains the Journal class, an append-only log of/
+compact change records that sits next to a JSON snapshot file
+"""
+
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only journal of change records.
+
+    Every record is one compact JSON object on its own line. The
+    journal never rewrites old records, so the cost of an append only
+    depends on the size of the record and not on the size of the
+    snapshot it belongs to. Records are expected to be idempotent
+    (they carry the resulting value, not only the delta), so replaying
+    a record that is already part of the snapshot is harmless.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.count = None
+        self.counted = 0
+        self.offset = 0
+
+    def append(self, record: dict):
+        """
+        Append one record to the end of the journal file
+        """
+        self.extend([record])
+
+    def extend(self, records, durable: bool = False):
+        """
+        Append several records with a single write call./
+        With durable=True the write is fsynced before returning.
+        """
+        lines = "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        if not lines:
+            return
+        count = lines.count("\n")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, mode="a+b") as file:
+            start = file.seek(0, os.SEEK_END)
+            if start:
+                file.seek(start - 1)
+                if file.read(1) != b"\n":
+                    # end the torn line of a crashed append, so it doesn't
+                    # swallow our first record
+                    lines = "\n" + lines
+            file.write(lines.encode("utf-8"))
+            if durable:
+                file.flush()
+                os.fsync(file.fileno())
+            end = file.tell()
+        if self.count is not None and start == self.counted:
+            self.count += count
+            self.counted = end
+
+    def records(self, offset: int = 0):
+        """
+        Yield (record, end offset) for every complete record in the journal/
+        starting at the given byte offset. A torn last line/
+        (e.g. crash in the middle of an append) is skipped, and so is/
+        a line that can't be parsed; reading goes on at the next newline.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, mode="rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield record, offset
+
+    def replay(self, dictionary: dict, apply, offset: int = 0) -> dict:
+        """
+        Apply every record in the journal after offset to dictionary/
+        with the given apply(dictionary, record) function and return it
+        """
+        if offset == 0:
+            self.count, self.counted = 0, 0
+        self.offset = offset
+        for record, self.offset in self.records(offset):
+            apply(dictionary, record)
+            if self.count is not None and self.offset > self.counted:
+                self.count += 1
+                self.counted = self.offset
+        return dictionary
+
+    def archive(self, path):
+        """
+        Move every record of the journal to the end of the file at path/
+        (fsynced), used instead of truncate() when the records are an/
+        audit trail that has to be kept. The journal is first renamed/
+        to <journal>.<size of path>.archive, so a crash at any point/
+        leaves either the journal or that file, and the next archive()/
+        finishes the move without writing any record twice.
+        """
+        self.finish_archives(path)
+        if os.path.exists(self.path):
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            pending = f"{self.path}.{size}.archive"
+            os.replace(self.path, pending)
+            self.finish_archive(pending, path, size)
+        self.count, self.counted, self.offset = 0, 0, 0
+
+    def finish_archives(self, path):
+        """
+        Finish the moves of archive() calls interrupted by a crash
+        """
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        for name in sorted(os.listdir(directory)):
+            if name.startswith(prefix) and name.endswith(".archive"):
+                size = name[len(prefix):-len(".archive")]
+                if size.isdigit():
+                    self.finish_archive(os.path.join(directory, name), path, int(size))
+
+    @staticmethod
+    def finish_archive(pending, path, size: int):
+        """
+        Put the records of a renamed journal at offset size of path,/
+        dropping whatever part of them an earlier attempt wrote, then/
+        remove the renamed journal
+        """
+        with open(pending, mode="rb") as journal:
+            lines = journal.read()
+        with open(path, mode="ab") as file:
+            if os.path.getsize(path) > size:
+                file.truncate(size)
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        os.remove(pending)
+
+    def truncate(self):
+        """
+        Empty the journal, used after its records are written into a snapshot
+        """
+        if os.path.exists(self.path):
+            with open(self.path, mode="w", encoding="utf-8"):
+                pass
+        self.count, self.counted, self.offset = 0, 0, 0
+
+    def __len__(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if self.count is None or size < self.counted:
+            # unknown, or another process emptied the journal since
+            self.count, self.counted = 0, 0
+        if size > self.counted:
+            for _, self.counted in self.records(self.counted):
+                self.count += 1
+        return self.count
@@ -0,0 +1,72 @@
+"""
+This module contains the Ledger class, the in memory balance table of/
+every bank account
+"""
+
+import threading
+
+
+class Ledger:
+    """
+    Balances of a bank accounts dictionary keyed by (national_id, account).
+
+    Every debit or credit is a balance record appended to the ledger of
+    the bank accounts document (its journal, which is folded into a
+    snapshot every CHECKPOINT_EVERY records and then kept as an audit
+    trail). The table follows the dictionary it was built from through
+    on_record(), which storage.apply_record calls for every change
+    record, so checking a payment against MIN_BALANCE is a dict lookup.
+    It is rebuilt only if another accounts dictionary is passed to sync().
+    Both storage engines return the same loaded dictionary until another
+    process writes the bank accounts, so a payment never rebuilds it.
+    """
+
+    def __init__(self):
+        self.source = None
+        self.balances = {}
+        self.lock = threading.RLock()
+
+    def sync(self, accounts: dict):
+        """
+        Rebuild the table if it was built from another accounts dictionary
+        """
+        with self.lock:
+            if self.source is not accounts:
+                self.build(accounts)
+        return self
+
+    def build(self, accounts: dict):
+        with self.lock:
+            self.source = accounts
+            self.balances = {
+                (national_id, account_name): account["_balance"]
+                for national_id, client in accounts.items()
+                for account_name, account in client.get("accounts", {}).items()
+            }
+
+    def open(self, national_id, account_name, balance: float):
+        """
+        Add an account created in the dictionary we index
+        """
+        with self.lock:
+            self.balances.setdefault((national_id, account_name), balance)
+
+    def balance(self, national_id, account_name) -> float:
+        """
+        Return the current balance of an account, or None if there is no such account
+        """
+        return self.balances.get((national_id, account_name))
+
+    def on_record(self, dictionary: dict, record: dict):
+        """
+        Follow a change record applied to the accounts dictionary we index
+        """
+        if dictionary is not self.source or record["op"] != "balance":
+            return
+        with self.lock:
+            key = (record["national_id"], record["account"])
+            if key in self.balances:
+                self.balances[key] = record["balance"]
+
+    def __len__(self):
+        return len(self.balances)
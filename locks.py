@@ -0,0 +1,133 @@
+"""
+This module contains fine grained locks for our database.
+
+A lock is asked for by a document path and a key, e.g.
+hold("./database/films.json", film_name, ticket_key). Keys are hashed
+into one of SLOTS slots and every slot is both a thread lock and a one
+byte fcntl record lock on a lock file next to the document, so unrelated
+showtimes or accounts never wait for each other, neither between
+threads nor between processes sharing the same ./database directory.
+"""
+
+from contextlib import contextmanager
+import os
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOCK_FILENAME = ".cinema.lock"
+SLOTS = 1 << 20
+
+
+class LockTable:
+    """
+    Table of slot locks backed by one lock file
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.locks = {}
+        self.counts = {}
+        self.guard = threading.Lock()
+        self.fd = None
+
+    @staticmethod
+    def slot(key) -> int:
+        """
+        Return the slot number of a key
+        """
+        return zlib.crc32(repr(key).encode("utf-8")) % SLOTS
+
+    def thread_lock(self, slot: int):
+        with self.guard:
+            if slot not in self.locks:
+                self.locks[slot] = threading.RLock()
+            return self.locks[slot]
+
+    def file_lock(self, slot: int, operation):
+        if fcntl is None:
+            return
+        with self.guard:
+            if self.fd is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.lockf(self.fd, operation, 1, slot)
+
+    def acquire(self, slot: int):
+        self.thread_lock(slot).acquire()
+        count = self.counts.get(slot, 0)
+        if count == 0:
+            try:
+                self.file_lock(slot, fcntl.LOCK_EX if fcntl else None)
+            except BaseException:
+                self.thread_lock(slot).release()
+                raise
+        self.counts[slot] = count + 1
+
+    def release(self, slot: int):
+        count = self.counts[slot] - 1
+        if count == 0:
+            del self.counts[slot]
+            self.file_lock(slot, fcntl.LOCK_UN if fcntl else None)
+        else:
+            self.counts[slot] = count
+        self.thread_lock(slot).release()
+
+    def hold(self, keys):
+        """
+        Hold the locks of every key in keys. Slots are always taken in
+        the same order so two callers holding several keys can't deadlock.
+        """
+        return self.hold_slots({LockTable.slot(key) for key in keys})
+
+    @contextmanager
+    def hold_slots(self, slots):
+        slots = sorted(slots)
+        taken = []
+        try:
+            for slot in slots:
+                self.acquire(slot)
+                taken.append(slot)
+            yield
+        finally:
+            for slot in reversed(taken):
+                self.release(slot)
+
+
+_tables = {}
+_tables_guard = threading.Lock()
+
+
+def table(path) -> LockTable:
+    """
+    Return the LockTable of the directory a document lives in
+    """
+    directory = os.path.dirname(os.path.abspath(str(path)))
+    with _tables_guard:
+        if directory not in _tables:
+            _tables[directory] = LockTable(os.path.join(directory, LOCK_FILENAME))
+        return _tables[directory]
+
+
+def hold(path, *key):
+    """
+    Hold the lock of one key of the document at path, e.g./
+    hold(JSON_FILE, film_name, ticket_key)
+    """
+    return table(path).hold([key])
+
+
+def document(path):
+    """
+    Hold the lock of a whole document. Document locks have their own/
+    slots above SLOTS, so they never share a slot with a key and one/
+    thread may take it for others that are holding key locks.
+    """
+    name = os.path.basename(str(path))
+    return table(path).hold_slots([SLOTS + LockTable.slot(name)])
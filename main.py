@@ -2,9 +2,11 @@
 
 import sys
 import datetime
+import time
 import argparse
 from getpass import getpass
 import os, platform
+import bootstrap
 from movie import Film
 from custom_exceptions import (
     UserError,
@@ -23,7 +25,10 @@ from custom_exceptions import (
     UnsuccessfulAccountDeposit,
     UnsuccessfulPasswordDeposit,
     UnsuccessfulCvv2Deposit,
-    BalanceMinimum
+    BalanceMinimum,
+    NoCapacityError,
+    SeatError,
+    HoldError,
 )
 from human import Human, User, Admin
 
@@ -34,31 +39,43 @@ else:
     CLEAR_CMD = "cls"
 
 
-if not os.path.isdir("./database"):
-    os.mkdir("./database")
-if os.path.exists("./database/admins.json"):
-    Admin.dictionary = Human.json_import("./database/admins.json")
-else:
-    Human.json_save("./database/admins.json", {})
-
-if not os.path.isdir("./database"):
-    os.mkdir("./database")
-if os.path.exists("./database/films.json"):
-    Film.films = Film.load_films_from_json("./database/films.json")
-else:
-    Film.save_films_to_json("./database/films.json", {})
-
-
-# Admin signup through a scripting command - Checked: OK
-parser = argparse.ArgumentParser(
-    description="Take Username and Password from CLI and Create an Admin with those Information."
-)
-parser.add_argument("-u", "--username", type=str, help="Username of New Admin")
-parser.add_argument("-p", "--password", type=str, help="Password of New Admin")
-args = parser.parse_args()
-if (args.username is not None) and (args.password is not None):
+def parse_args(argv=None):
+    """
+    Parse the command line of our program
+    """
+    parser = argparse.ArgumentParser(
+        description="Take Username and Password from CLI and Create an Admin with those Information."
+    )
+    parser.add_argument("-u", "--username", type=str, help="Username of New Admin")
+    parser.add_argument("-p", "--password", type=str, help="Password of New Admin")
+    commands = parser.add_subparsers(dest="command")
+    schedule = commands.add_parser(
+        "import-schedule", help="Add the films and showtimes of a CSV file (see schedule_import.py)"
+    )
+    schedule.add_argument("csv", help="CSV file to import, - for standard input")
+    schedule.add_argument("--dry-run", action="store_true", help="Only check the rows")
+    members = commands.add_parser(
+        "provision", help="Add the users and bank accounts of a JSON lines or CSV file (see provision.py)"
+    )
+    members.add_argument("file", help="File to import, - for standard input")
+    members.add_argument("--format", choices=["jsonl", "csv"], help="By default csv for *.csv files")
+    members.add_argument("--dry-run", action="store_true", help="Only check the rows")
+    report = commands.add_parser("report", help="Export a sales and occupancy report (see reports.py)")
+    report.add_argument("report", choices=("day", "film", "showtime"), help="One row per showtime, day or film")
+    report.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Output format")
+    report.add_argument("--from", dest="start", help="First date (YYYY-MM-DD)")
+    report.add_argument("--to", dest="end", help="Date after the last one (YYYY-MM-DD)")
+    report.add_argument("--output", help="File to write, standard output by default")
+    return parser.parse_args(argv)
+
+
+def create_admin(username: str, password: str):
+    """
+    Admin signup through a scripting command, loads the admins database only
+    """
+    bootstrap.admins()
     try:
-        Admin.signup(args.username, args.password)
+        Admin.signup(username, password)
     except RepUserError:
         os.system(CLEAR_CMD)
         print("Username Already Taken! \n")
@@ -69,497 +86,643 @@ if (args.username is not None) and (args.password is not None):
         sys.exit("\n\nExiting the Admin Creating Interface...")
 
 
-while 1:
-    os.system(CLEAR_CMD)
-    print("\n***** - Welcome to cinema Ticket - *****\n")
-    stat = input(
-        "Stat:\n1 - User mode\n2 - Admin mode\n0 - Exit\nEnter command number: "
+def report_row(line, message):
+    """
+    Print the error of a skipped row of an import
+    """
+    print(f"line {line}: {message}", file=sys.stderr)
+
+
+def import_schedule(path: str, dry_run: bool = False):
+    """
+    Import films and showtimes from a CSV file through a scripting/
+    command, loads the films database only
+    """
+    import schedule_import
+
+    bootstrap.films()
+    try:
+        if path == "-":
+            counts = schedule_import.import_schedule(sys.stdin, report_row, dry_run)
+        else:
+            with open(path, mode="r", encoding="utf-8-sig", newline="") as file:
+                counts = schedule_import.import_schedule(file, report_row, dry_run)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Import failed: {error}")
+    print(
+        f"{counts['rows']} row(s): {counts['films']} film(s) and {counts['showtimes']} showtime(s)"
+        f" {'checked' if dry_run else 'added'}, {counts['errors']} error(s)."
     )
-    os.system(CLEAR_CMD)
+    if counts["errors"]:
+        sys.exit(1)
+
+
+def provision_users(path: str, format: str = None, dry_run: bool = False):
+    """
+    Add the users and bank accounts of a JSON lines or CSV file through/
+    a scripting command, loads the users database only
+    """
+    import provision
 
-    if stat == "1":
-        if os.path.exists("./database/users.json"):
-            User.dictionary = Human.json_import("./database/users.json")
+    if format is None:
+        format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    bootstrap.users()
+    try:
+        if path == "-":
+            counts = provision.provision(sys.stdin, format, report_row, dry_run)
         else:
-            Human.json_save("./database/users.json", {})
+            with open(path, mode="r", encoding="utf-8-sig", newline="") as file:
+                counts = provision.provision(file, format, report_row, dry_run)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Provisioning failed: {error}")
+    print(
+        f"{counts['rows']} row(s): {counts['users']} user(s) and {counts['accounts']} bank account(s)"
+        f" {'checked' if dry_run else 'added'}, {counts['errors']} error(s)."
+    )
+    if counts["errors"]:
+        sys.exit(1)
 
-        while 1:
-            print("\n******** - Welcome to user management panel - ********\n")
-            print("Stat:\n1 - Sign Up\n2 - Sign In\n0 - Exit\n")
-            stat = input("Enter Command: ")
-            os.system(CLEAR_CMD)
 
-            # User sign up - Checked: OK.
-            if stat == "1":
-                print("\n********** ^ Sign up form ^ **********\n")
-                fname = input("Enter First Name: ")
-                lname = input("Enter Last Name: ")
-                username = input("Enter Username: ")
-                password = getpass("Enter Password: ")
-                birth_date = input("Enter Birth date (YYYY-MM-DD): ")
-                phone_number = input("Enter Phone number (e.g. 09876543210) : ")
-                os.system(CLEAR_CMD)
-                try:
-                    User.signup(
-                        fname, lname, username, password, birth_date, phone_number
-                    )
-                except RepUserError:
-                    os.system(CLEAR_CMD)
-                    print("\nUsername Already Taken! ")
-                except ShortPasswordError:
-                    os.system(CLEAR_CMD)
-                    print("\nToo Short Password! ")
-                except PhoneNumberError:
-                    os.system(CLEAR_CMD)
-                    print("Invalid phone number (e.g. 09876543210).")
-                else:
-                    os.system(CLEAR_CMD)
-                    print("\nSigning Up Completed! ")
+def export_report(report: str, format: str = "csv", start=None, end=None, output=None):
+    """
+    Export a sales and occupancy report through a scripting command,/
+    loads the films database only
+    """
+    import reports
 
-            elif stat == "2":
-                print("\n************** - Login form - **************\n")
-                username = input("Enter Username: ")
-                password = getpass("Enter Password: ")
+    bootstrap.films()
+    try:
+        if output is None:
+            reports.export(report, sys.stdout, format, start, end)
+        else:
+            with open(output, mode="w", encoding="utf-8", newline="") as file:
+                count = reports.export(report, file, format, start, end)
+            print(f"{count} row(s) written to {output}.")
+    except (OSError, ValueError) as error:
+        sys.exit(f"Report failed: {error}")
+
+
+def menu():
+    """
+    The interactive console of our program. Every database is loaded/
+    the first time a panel needs it.
+    """
+    while 1:
+        os.system(CLEAR_CMD)
+        print("\n***** - Welcome to cinema Ticket - *****\n")
+        stat = input(
+            "Stat:\n1 - User mode\n2 - Admin mode\n0 - Exit\nEnter command number: "
+        )
+        os.system(CLEAR_CMD)
+
+        if stat == "1":
+            bootstrap.films()
+            bootstrap.users()
+
+            while 1:
+                print("\n******** - Welcome to user management panel - ********\n")
+                print("Stat:\n1 - Sign Up\n2 - Sign In\n0 - Exit\n")
+                stat = input("Enter Command: ")
                 os.system(CLEAR_CMD)
-                try:
-                    user_object = User.sign_in_validation(username, password)
-                except UserError:
-                    os.system(CLEAR_CMD)
-                    print("\nUsername not Found! ")
-                    continue
-                except PasswordError:
-                    os.system(CLEAR_CMD)
-                    print("\nWrong Password! ")
-                    continue
-                else:
+
+                # User sign up - Checked: OK.
+                if stat == "1":
+                    print("\n********** ^ Sign up form ^ **********\n")
+                    fname = input("Enter First Name: ")
+                    lname = input("Enter Last Name: ")
+                    username = input("Enter Username: ")
+                    password = getpass("Enter Password: ")
+                    birth_date = input("Enter Birth date (YYYY-MM-DD): ")
+                    phone_number = input("Enter Phone number (e.g. 09876543210) : ")
                     os.system(CLEAR_CMD)
-                    print("\nSigning In Completed! ")
-
-                while 1:
-                    print("\n************ - User Dashboard - ************\n")
-                    print(
-                        "State:\n1 - Show User Information\n2 - Edit user info\n3 - Show available Tickets\n4 - Reserve Ticket\n5 - Charge Wallet\n0 - Back to Main Menu: "
-                    )
-                    stat = input("Enter Command: ")
+                    try:
+                        User.signup(
+                            fname, lname, username, password, birth_date, phone_number
+                        )
+                    except RepUserError:
+                        os.system(CLEAR_CMD)
+                        print("\nUsername Already Taken! ")
+                    except ShortPasswordError:
+                        os.system(CLEAR_CMD)
+                        print("\nToo Short Password! ")
+                    except PhoneNumberError:
+                        os.system(CLEAR_CMD)
+                        print("Invalid phone number (e.g. 09876543210).")
+                    else:
+                        os.system(CLEAR_CMD)
+                        print("\nSigning Up Completed! ")
+
+                elif stat == "2":
+                    print("\n************** - Login form - **************\n")
+                    username = input("Enter Username: ")
+                    password = getpass("Enter Password: ")
                     os.system(CLEAR_CMD)
-                    if stat == "1":
-                        print(user_object)
-                        print("List of Bank Accounts: ")
-                        for i, j in User.dictionary[user_object.username][
-                            "bank_accounts"
-                        ].items():
-                            print(i)
-                            for m, k in j.items():
-                                print(f"\n\t{m}: {k}")
-
-                    elif stat == "2":
-                        while 1:
-                            print("\n***** ^ Edit User mode ^ *****\n")
-                            print(
-                                "State:\n1 - Edit profile\n2 - Password Change\n3 - Show Current Plan\n4 - Change Plan\n5 - Bank Accounts\n6 - Back to Dashboard"
-                            )
-                            stat = input("Enter Command: ")
-                            os.system(CLEAR_CMD)
-                            if stat == "1":
-                                print("\n***** ^ Edit Profile mode ^ *****\n")
+                    try:
+                        user_object = User.sign_in_validation(username, password)
+                    except UserError:
+                        os.system(CLEAR_CMD)
+                        print("\nUsername not Found! ")
+                        continue
+                    except PasswordError:
+                        os.system(CLEAR_CMD)
+                        print("\nWrong Password! ")
+                        continue
+                    else:
+                        os.system(CLEAR_CMD)
+                        print("\nSigning In Completed! ")
+
+                    while 1:
+                        print("\n************ - User Dashboard - ************\n")
+                        print(
+                            "State:\n1 - Show User Information\n2 - Edit user info\n3 - Show available Tickets\n4 - Reserve Ticket\n5 - Charge Wallet\n0 - Back to Main Menu: "
+                        )
+                        stat = input("Enter Command: ")
+                        os.system(CLEAR_CMD)
+                        if stat == "1":
+                            print(user_object)
+                            print("List of Bank Accounts: ")
+                            for i, j in User.dictionary[user_object.username][
+                                "bank_accounts"
+                            ].items():
+                                print(i)
+                                for m, k in j.items():
+                                    print(f"\n\t{m}: {k}")
+
+                        elif stat == "2":
+                            while 1:
+                                print("\n***** ^ Edit User mode ^ *****\n")
                                 print(
-                                    "For Abort to editing any item, just leave it and press Enter."
-                                )
-                                new_fname = input("Enter New First Name: ")
-                                new_lname = input("Enter New Last Name: ")
-                                new_b_date = input(
-                                    "Enter New Birth Date (YYYY-MM-DD): "
+                                    "State:\n1 - Edit profile\n2 - Password Change\n3 - Show Current Plan\n4 - Change Plan\n5 - Bank Accounts\n6 - Back to Dashboard"
                                 )
-                                new_usr = input("Enter New Username: ")
-                                new_ph_numb = input("New Phone Number: ")
+                                stat = input("Enter Command: ")
                                 os.system(CLEAR_CMD)
-                                try:
-                                    user_object.edit_user(
-                                        new_fname,
-                                        new_lname,
-                                        new_usr,
-                                        new_ph_numb,
-                                        new_b_date,
+                                if stat == "1":
+                                    print("\n***** ^ Edit Profile mode ^ *****\n")
+                                    print(
+                                        "For Abort to editing any item, just leave it and press Enter."
                                     )
-                                except RepUserError:
-                                    print("\nUsername already Taken! ")
-                                else:
-                                    print("\nUser Information has been Updated! ")
-
-                            elif stat == "2":
-                                print("\n******** ^ Password Change ^ ********\n")
-                                old_p = getpass("Old Password: ")
-                                new_p = getpass("New Password: ")
-                                re_new_p = getpass("New Password again: ")
-                                os.system(CLEAR_CMD)
-                                try:
-                                    user_object.password_change(old_p, new_p, re_new_p)
-                                except PasswordError:
-                                    print("\nWrong Original Password! ")
-                                except TwoPasswordError:
-                                    print("\nTwo new passwords are not matched! ")
-                                except ShortPasswordError:
-                                    print("Two Short New Password! ")
-                                else:
-                                    print("\nYour Password has been changed! ")
-
-                            elif stat == "3":
-                                print("***** ^ Show Current Plan ^ *****")
-                                os.system(CLEAR_CMD)
+                                    new_fname = input("Enter New First Name: ")
+                                    new_lname = input("Enter New Last Name: ")
+                                    new_b_date = input(
+                                        "Enter New Birth Date (YYYY-MM-DD): "
+                                    )
+                                    new_usr = input("Enter New Username: ")
+                                    new_ph_numb = input("New Phone Number: ")
+                                    os.system(CLEAR_CMD)
+                                    try:
+                                        user_object.edit_user(
+                                            new_fname,
+                                            new_lname,
+                                            new_usr,
+                                            new_ph_numb,
+                                            new_b_date,
+                                        )
+                                    except RepUserError:
+                                        print("\nUsername already Taken! ")
+                                    else:
+                                        print("\nUser Information has been Updated! ")
+
+                                elif stat == "2":
+                                    print("\n******** ^ Password Change ^ ********\n")
+                                    old_p = getpass("Old Password: ")
+                                    new_p = getpass("New Password: ")
+                                    re_new_p = getpass("New Password again: ")
+                                    os.system(CLEAR_CMD)
+                                    try:
+                                        user_object.password_change(old_p, new_p, re_new_p)
+                                    except PasswordError:
+                                        print("\nWrong Original Password! ")
+                                    except TwoPasswordError:
+                                        print("\nTwo new passwords are not matched! ")
+                                    except ShortPasswordError:
+                                        print("Two Short New Password! ")
+                                    else:
+                                        print("\nYour Password has been changed! ")
+
+                                elif stat == "3":
+                                    print("***** ^ Show Current Plan ^ *****")
+                                    os.system(CLEAR_CMD)
 
-                            elif stat == "4":
-                                print("***** ^ Change Plan ^ *****")
-                                os.system(CLEAR_CMD)
+                                elif stat == "4":
+                                    print("***** ^ Change Plan ^ *****")
+                                    os.system(CLEAR_CMD)
 
-                            elif stat == "6":
-                                print("Exiting User Edit Panel...")
-                                break
+                                elif stat == "6":
+                                    print("Exiting User Edit Panel...")
+                                    break
 
-                            elif stat == "5":
-                                while 1:
-                                    print("***** ^ Bank Accounts ^ *****")
-                                    print(
-                                        "State:\n1 - Add a Bank Account\n2 - Edit Bank Accounts\n3 - Exit Bank Accounts panel\n"
-                                    )
-                                    stat = input("Enter Command: ")
-                                    os.system(CLEAR_CMD)
-                                    if stat == "1":
-                                        print("***** ^ Add Bank Account ^ *****")
-                                        national_id = input("Enter National ID: ")
-                                        account_name = input("Enter Account Name: ")
-                                        balance = int(input("Enter Account Balance: "))
-                                        account_password = getpass(
-                                            "Enter Bank Account Password: "
+                                elif stat == "5":
+                                    while 1:
+                                        print("***** ^ Bank Accounts ^ *****")
+                                        print(
+                                            "State:\n1 - Add a Bank Account\n2 - Edit Bank Accounts\n3 - Exit Bank Accounts panel\n"
                                         )
+                                        stat = input("Enter Command: ")
                                         os.system(CLEAR_CMD)
-                                        try:
-                                            user_object.add_bank_account(
-                                                national_id,
-                                                account_name,
-                                                user_object.fname,
-                                                user_object.lname,
-                                                balance,
-                                                account_password,
-                                            )
-                                        except AlreadyExistAccount:
-                                            print("Account Name Already Exists! ")
-                                        else:
-                                            User.json_save(
-                                                User.jsonpath, User.dictionary
-                                            )
-                                            print("Bank Account Add Successfully! \n")
-                                            for i, j in User.dictionary[
-                                                user_object.username
-                                            ]["bank_accounts"][account_name].items():
-                                                print(f"{i}: {j}")
-
-                                    elif stat == "2":
-                                        while 1:
-                                            print("***** ^ Edit Bank Accounts ^ *****")
-                                            print(
-                                                "State:\n1 - Deposit\n2 - Exit Edit Bank Account Panel"
+                                        if stat == "1":
+                                            print("***** ^ Add Bank Account ^ *****")
+                                            national_id = input("Enter National ID: ")
+                                            account_name = input("Enter Account Name: ")
+                                            balance = int(input("Enter Account Balance: "))
+                                            account_password = getpass(
+                                                "Enter Bank Account Password: "
                                             )
-                                            stat = input("Enter Command: ")
                                             os.system(CLEAR_CMD)
-
-                                            if stat == "1":
-                                                print(
-                                                    "\n***** ^ Deposit Form ^ *****\n"
-                                                )
-                                                national_id = input(
-                                                    "Enter National Id: "
-                                                )
-                                                account_name = input(
-                                                    "Enter Account Name: "
-                                                )
-                                                depos = int(
-                                                    input(
-                                                        "Enter Amount of deposition: "
-                                                    )
-                                                )
-                                                account_password = getpass(
-                                                    "Enter Account Password: "
-                                                )
-                                                cvv2 = int(
-                                                    getpass("Enter Account CVV2:  ")
-                                                )
-                                                user_object.charge_bank_account(
-                                                    user_object.username,
+                                            try:
+                                                user_object.add_bank_account(
                                                     national_id,
                                                     account_name,
+                                                    user_object.fname,
+                                                    user_object.lname,
+                                                    balance,
                                                     account_password,
-                                                    cvv2,
-                                                    depos,
                                                 )
-
-                                            elif stat == "2":
+                                            except AlreadyExistAccount:
+                                                print("Account Name Already Exists! ")
+                                            else:
+                                                User.json_save(
+                                                    User.jsonpath, User.dictionary
+                                                )
+                                                print("Bank Account Add Successfully! \n")
+                                                for i, j in User.dictionary[
+                                                    user_object.username
+                                                ]["bank_accounts"][account_name].items():
+                                                    print(f"{i}: {j}")
+
+                                        elif stat == "2":
+                                            while 1:
+                                                print("***** ^ Edit Bank Accounts ^ *****")
                                                 print(
-                                                    "Exiting Edit Bank Accounts panel..."
+                                                    "State:\n1 - Deposit\n2 - Exit Edit Bank Account Panel"
                                                 )
-                                                break
+                                                stat = input("Enter Command: ")
+                                                os.system(CLEAR_CMD)
 
-                                    elif stat == "3":
-                                        print("Exit Bank Accounts Panel...")
-                                        break
+                                                if stat == "1":
+                                                    print(
+                                                        "\n***** ^ Deposit Form ^ *****\n"
+                                                    )
+                                                    national_id = input(
+                                                        "Enter National Id: "
+                                                    )
+                                                    account_name = input(
+                                                        "Enter Account Name: "
+                                                    )
+                                                    depos = int(
+                                                        input(
+                                                            "Enter Amount of deposition: "
+                                                        )
+                                                    )
+                                                    account_password = getpass(
+                                                        "Enter Account Password: "
+                                                    )
+                                                    cvv2 = int(
+                                                        getpass("Enter Account CVV2:  ")
+                                                    )
+                                                    user_object.charge_bank_account(
+                                                        user_object.username,
+                                                        national_id,
+                                                        account_name,
+                                                        account_password,
+                                                        cvv2,
+                                                        depos,
+                                                    )
 
-                    elif stat == "3":
-                        print("***** ^ Ticket Menu ^ *****")
-                        film_list = Film.films.keys()
-                        for film in film_list:
-                            scene_list = list(Film.films[film]["tickets"].keys())
-                            print(f"Available scenes for {film}: {scene_list}")
+                                                elif stat == "2":
+                                                    print(
+                                                        "Exiting Edit Bank Accounts panel..."
+                                                    )
+                                                    break
+
+                                        elif stat == "3":
+                                            print("Exit Bank Accounts Panel...")
+                                            break
+
+                        elif stat == "3":
+                            print("***** ^ Ticket Menu ^ *****")
+                            film_name = input("Enter Film Name (leave empty for all films): ")
+                            shows = Film.schedule().upcoming(film_name=film_name or None)
+                            if not shows:
+                                print("No upcoming shows with available seats. ")
+                            for show in shows:
+                                print(
+                                    f"{show.film}: {show.scene_date} {show.showtime}"
+                                    f" - {show.available_seats} seat(s) left"
+                                )
 
-                    elif stat == "4":
-                        os.system(CLEAR_CMD)
-                        print("***** ^ Reserve Ticket ^ *****")
-                        film_name = input("Enter Film Name: ")
-                        year, month, day = input("Enter scene date (YYYY-MM-DD): ").split("-")
-                        scene_date = datetime.date(int(year), int(month), int(day)).isoformat()
-                        hour, minute = input("Enter Scene time (HH:MM): ").split(":")
-                        scene_time = datetime.time(hour=int(hour), minute=int(minute)).isoformat(timespec="minutes")
-                        quantity = int(input("Enter Quantity: "))
-                        print("\n***** ^ Checkout Form ^ *****\n")
-                        national_id = input("Enter National ID: ")
-                        account_name = input("enter Account Name: ")
-                        password = getpass("Enter password: ")
-                        cvv2 = int(input("Enter CVV2: "))
-                        try:
-                            User.reserve_ticket(film_name, scene_date, scene_time, quantity, national_id, account_name, password, cvv2)
-                        except FilmError:
-                            os.system(CLEAR_CMD)
-                            print("Film Not Found! ")
-                        except TicketError:
-                            os.system(CLEAR_CMD)
-                            print("ticket Not Found! ")
-                        except UnsuccessfulIdDeposit:
+                        elif stat == "4":
                             os.system(CLEAR_CMD)
-                            print("National Id Not Found! ")
-                        except UnsuccessfulAccountDeposit:
-                            os.system(CLEAR_CMD)
-                            print("Account Not Found! ")
-                        except UnsuccessfulPasswordDeposit:
-                            os.system(CLEAR_CMD)
-                            print("Wrong Password! ")
-                        except UnsuccessfulCvv2Deposit:
-                            os.system(CLEAR_CMD)
-                            print("Wrong CVV2")
-                        except BalanceMinimum:
-                            os.system(CLEAR_CMD)
-                            print("Minimum Balance Reached! ")
-                        else:
-                            os.system(CLEAR_CMD)
-                            print("Ticket(s) Reserved Successfully! ")
+                            print("***** ^ Reserve Ticket ^ *****")
+                            film_name = input("Enter Film Name: ")
+                            year, month, day = input("Enter scene date (YYYY-MM-DD): ").split("-")
+                            scene_date = datetime.date(int(year), int(month), int(day)).isoformat()
+                            hour, minute = input("Enter Scene time (HH:MM): ").split(":")
+                            scene_time = datetime.time(hour=int(hour), minute=int(minute)).isoformat(timespec="minutes")
+                            quantity = int(input("Enter Quantity: "))
+                            try:
+                                hold = User.hold_ticket(film_name, scene_date, scene_time, quantity)
+                            except FilmError:
+                                os.system(CLEAR_CMD)
+                                print("Film Not Found! ")
+                                continue
+                            except TicketError:
+                                os.system(CLEAR_CMD)
+                                print("ticket Not Found! ")
+                                continue
+                            except NoCapacityError:
+                                os.system(CLEAR_CMD)
+                                print("Insufficient Tickets! ")
+                                continue
+                            except SeatError:
+                                os.system(CLEAR_CMD)
+                                print("Chosen seats are not available! ")
+                                continue
+                            minutes = round((hold["expires"] - time.time()) / 60)
+                            print(f"\n{hold['quantity']} ticket(s) held for {minutes} minutes.")
+                            print("\n***** ^ Checkout Form ^ *****\n")
+                            national_id = input("Enter National ID: ")
+                            account_name = input("enter Account Name: ")
+                            password = getpass("Enter password: ")
+                            cvv2 = int(input("Enter CVV2: "))
+                            try:
+                                seats = User.checkout(hold, national_id, account_name, password, cvv2)
+                            except HoldError:
+                                os.system(CLEAR_CMD)
+                                print("Your hold has expired, please try again! ")
+                            except UnsuccessfulIdDeposit:
+                                os.system(CLEAR_CMD)
+                                User.cancel_hold(hold)
+                                print("National Id Not Found! ")
+                            except UnsuccessfulAccountDeposit:
+                                os.system(CLEAR_CMD)
+                                User.cancel_hold(hold)
+                                print("Account Not Found! ")
+                            except UnsuccessfulPasswordDeposit:
+                                os.system(CLEAR_CMD)
+                                User.cancel_hold(hold)
+                                print("Wrong Password! ")
+                            except UnsuccessfulCvv2Deposit:
+                                os.system(CLEAR_CMD)
+                                User.cancel_hold(hold)
+                                print("Wrong CVV2")
+                            except BalanceMinimum:
+                                os.system(CLEAR_CMD)
+                                User.cancel_hold(hold)
+                                print("Minimum Balance Reached! ")
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("Ticket(s) Reserved Successfully! ")
+                                if seats is not None:
+                                    for row, col in seats:
+                                        print(f"\tRow {row + 1}, Seat {col + 1}")
 
-                    elif stat == "5":
-                        os.system(CLEAR_CMD)
-                        print("***** ^ Wallet Charge Menu ^ *****")
-                        national_id = input("Enter National ID: ")
-                        account_name = input("Enter Account Name: ")
-                        password = getpass("Enter Account Password: ")
-                        cvv2 = int(input("Enter CVV2: "))
-                        amount = int(input("Enter Amount: "))
-                        try:
-                            user_object.charge_wallet(national_id, account_name, password, cvv2, amount)
-                        except UnsuccessfulIdDeposit:
-                            os.system(CLEAR_CMD)
-                            print("National Id Not Found! ")
-                        except UnsuccessfulAccountDeposit:
+                        elif stat == "5":
                             os.system(CLEAR_CMD)
-                            print("Account Not Found! ")
-                        except UnsuccessfulPasswordDeposit:
-                            os.system(CLEAR_CMD)
-                            print("Wrong Password! ")
-                        except UnsuccessfulCvv2Deposit:
-                            os.system(CLEAR_CMD)
-                            print("Wrong CVV2")
-                        except BalanceMinimum:
-                            os.system(CLEAR_CMD)
-                            print("Minimum Balance Reached! ")
-                        else:
-                            os.system(CLEAR_CMD)
-                            print("Your Wallet Charged successfully! ")
-
-                    elif stat == "0":
-                        print("\nExiting User Panel...")
-                        user_object.delete_user()
-                        break
-
-                    else:
-                        print("\nInvalid State! ")
-                        continue
+                            print("***** ^ Wallet Charge Menu ^ *****")
+                            national_id = input("Enter National ID: ")
+                            account_name = input("Enter Account Name: ")
+                            password = getpass("Enter Account Password: ")
+                            cvv2 = int(input("Enter CVV2: "))
+                            amount = int(input("Enter Amount: "))
+                            try:
+                                user_object.charge_wallet(national_id, account_name, password, cvv2, amount)
+                            except UnsuccessfulIdDeposit:
+                                os.system(CLEAR_CMD)
+                                print("National Id Not Found! ")
+                            except UnsuccessfulAccountDeposit:
+                                os.system(CLEAR_CMD)
+                                print("Account Not Found! ")
+                            except UnsuccessfulPasswordDeposit:
+                                os.system(CLEAR_CMD)
+                                print("Wrong Password! ")
+                            except UnsuccessfulCvv2Deposit:
+                                os.system(CLEAR_CMD)
+                                print("Wrong CVV2")
+                            except BalanceMinimum:
+                                os.system(CLEAR_CMD)
+                                print("Minimum Balance Reached! ")
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("Your Wallet Charged successfully! ")
 
-            # Exit command - Checked: OK.
-            elif stat == "0":
-                os.system(CLEAR_CMD)
-                print("\nExiting the User Management Panel... ")
-                break
-            # Invalid State command - Checked: OK.
-            else:
-                os.system(CLEAR_CMD)
-                print("\nInvalid State! ")
-                continue
+                        elif stat == "0":
+                            print("\nExiting User Panel...")
+                            user_object.delete_user()
+                            break
 
-    elif stat == "2":
-        while 1:
-            print("\n******** - admin management panel - ********\n")
-            stat = input("Stat:\n1 - Sign In\n0 - Exit\nEnter command number:  ")
-            os.system(CLEAR_CMD)
+                        else:
+                            print("\nInvalid State! ")
+                            continue
 
-            # Admin log in - Checked: OK.
-            if stat == "1":
-                print("\n************** - Login form - **************\n")
-                try:
-                    username = input("Enter Username: ")
-                    password = getpass("Enter Password: ")
-                    admin_object = Admin.sign_in_validation(username, password)
-                except UserError:
+                # Exit command - Checked: OK.
+                elif stat == "0":
                     os.system(CLEAR_CMD)
-                    print("\nUsername not Found! ")
-                    continue
-                except PasswordError:
-                    os.system(CLEAR_CMD)
-                    print("\nWrong Password! ")
-                    continue
+                    print("\nExiting the User Management Panel... ")
+                    break
+                # Invalid State command - Checked: OK.
                 else:
                     os.system(CLEAR_CMD)
-                    print("\nSigning In Completed! ")
+                    print("\nInvalid State! ")
+                    continue
 
-                while 1:
-                    print("\n************ - Admin Dashboard - ************\n")
-                    stat = input(
-                        "Stat:\n1 - Add film\n2 - Remove film\n3 - Add Ticket\n4 - Show Your Information\n5 - Edit Username\n6 - Password Change\n0 - Back to Main Menu\nEnter command number: "
-                    )
-                    os.system(CLEAR_CMD)
-                    # Add new film - Checked: OK.
-                    if stat == "1":
-                        print("\n************** ^ Add film ^ **************\n")
-                        film_name = input("Film name: ")
-                        film_genre = input(
-                            "Film genre (e.g. Comedy/Action/Romance e.t.): "
-                        )
-                        age_rate = input("Film age rating: ")
-                        Admin.add_film(film_name, film_genre, age_rate)
+        elif stat == "2":
+            bootstrap.films()
+            bootstrap.admins()
+            while 1:
+                print("\n******** - admin management panel - ********\n")
+                stat = input("Stat:\n1 - Sign In\n0 - Exit\nEnter command number:  ")
+                os.system(CLEAR_CMD)
+
+                # Admin log in - Checked: OK.
+                if stat == "1":
+                    print("\n************** - Login form - **************\n")
+                    try:
+                        username = input("Enter Username: ")
+                        password = getpass("Enter Password: ")
+                        admin_object = Admin.sign_in_validation(username, password)
+                    except UserError:
                         os.system(CLEAR_CMD)
-                        print("\nFilm added successfully! \n")
-
-                    # Remove film - Checked: OK.
-                    elif stat == "2":
-                        print("********** ^ Remove Film ^ **********")
-                        film_name = input("Enter Film Name to Remove: ")
-                        try:
-                            Admin.remove_film(film_name)
-                        except FilmError:
-                            os.system(CLEAR_CMD)
-                            print("Film with this Name not found for Remove! ")
-                            continue
-                        else:
-                            os.system(CLEAR_CMD)
-                            print("Film Removed Successfully! ")
-
-                    # Add ticket - Checked: OK.
-                    elif stat == "3":
-                        print("***** ^ Add Ticket ^ *****")
-                        film_name = input("Enter Film Name: ")
-                        year, month, day = input(
-                            "Enter scene date (YYYY-MM-DD): "
-                        ).split("-")
-                        film_date = datetime.date(
-                            int(year), int(month), int(day)
-                        ).isoformat()
-                        hour, minute = input("Enter Scene time (HH:MM): ").split(":")
-                        scene_time = datetime.time(
-                            hour=int(hour), minute=int(minute)
-                        ).isoformat(timespec="minutes")
-                        ticket_capacity = int(input("Enter the Scene Capacity: "))
-                        ticket_price = int(input("Enter the Ticket Price: "))
-                        try:
-                            Admin.add_show(
-                                film_name,
-                                film_date,
-                                scene_time,
-                                ticket_capacity,
-                                ticket_price,
-                            )
-                        except AddTicketFailed:
-                            os.system(CLEAR_CMD)
-                            print("Incorrect data, please check information.")
-                        else:
-                            os.system(CLEAR_CMD)
-                            print("\nTicket Added Successfully! \n")
+                        print("\nUsername not Found! ")
+                        continue
+                    except PasswordError:
+                        os.system(CLEAR_CMD)
+                        print("\nWrong Password! ")
+                        continue
+                    else:
+                        os.system(CLEAR_CMD)
+                        print("\nSigning In Completed! ")
 
-                    # Admin info - Checked: OK.
-                    elif stat == "4":
+                    while 1:
+                        print("\n************ - Admin Dashboard - ************\n")
+                        stat = input(
+                            "Stat:\n1 - Add film\n2 - Remove film\n3 - Add Ticket\n4 - Show Your Information\n5 - Edit Username\n6 - Password Change\n0 - Back to Main Menu\nEnter command number: "
+                        )
                         os.system(CLEAR_CMD)
-                        print(admin_object)
-
-                    # Edit admin info - Checked: OK
-                    elif stat == "5":
-                        print("********** ^ admin Edit Username ^ **********")
-                        print("To abort changes, leave it blank.\n")
-                        new_username = input("Enter New Username: ")
-                        new_ph_numb = input("Enter New Phone Number: ")
-                        try:
-                            admin_object.edit_user(new_username, new_ph_numb)
-                        except RepUserError:
-                            os.system(CLEAR_CMD)
-                            print("\nUsername already Taken! ")
-                        except PhoneNumberError:
-                            os.system(CLEAR_CMD)
-                            print("Invalid Phone Number format! ")
-                        else:
-                            os.system(CLEAR_CMD)
-                            print("\nUser Information has been Updated! ")
-
-                    # Change admin password - Checked: OK
-                    elif stat == "6":
-                        print("\n********** ^ Password Change ^ **********\n")
-                        old_pass = getpass("Enter Old Password: ")
-                        new_pass = getpass("Enter New Password: ")
-                        rep_new_pass = getpass("Enter New Password again: ")
-                        try:
-                            admin_object.password_change(
-                                old_pass, new_pass, rep_new_pass
+                        # Add new film - Checked: OK.
+                        if stat == "1":
+                            print("\n************** ^ Add film ^ **************\n")
+                            film_name = input("Film name: ")
+                            film_genre = input(
+                                "Film genre (e.g. Comedy/Action/Romance e.t.): "
                             )
-                        except PasswordError:
+                            age_rate = input("Film age rating: ")
+                            Admin.add_film(film_name, film_genre, age_rate)
                             os.system(CLEAR_CMD)
-                            print("\nWrong Old Password! ")
-                        except TwoPasswordError:
+                            print("\nFilm added successfully! \n")
+
+                        # Remove film - Checked: OK.
+                        elif stat == "2":
+                            print("********** ^ Remove Film ^ **********")
+                            film_name = input("Enter Film Name to Remove: ")
+                            try:
+                                Admin.remove_film(film_name)
+                            except FilmError:
+                                os.system(CLEAR_CMD)
+                                print("Film with this Name not found for Remove! ")
+                                continue
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("Film Removed Successfully! ")
+
+                        # Add ticket - Checked: OK.
+                        elif stat == "3":
+                            print("***** ^ Add Ticket ^ *****")
+                            film_name = input("Enter Film Name: ")
+                            year, month, day = input(
+                                "Enter scene date (YYYY-MM-DD): "
+                            ).split("-")
+                            film_date = datetime.date(
+                                int(year), int(month), int(day)
+                            ).isoformat()
+                            hour, minute = input("Enter Scene time (HH:MM): ").split(":")
+                            scene_time = datetime.time(
+                                hour=int(hour), minute=int(minute)
+                            ).isoformat(timespec="minutes")
+                            ticket_capacity = int(input("Enter the Scene Capacity: "))
+                            ticket_price = int(input("Enter the Ticket Price: "))
+                            seat_rows = input(
+                                "Enter number of seat rows (leave blank for no seat map): "
+                            )
+                            seat_cols = None
+                            if seat_rows != "":
+                                seat_rows = int(seat_rows)
+                                seat_cols = int(input("Enter number of seats in a row: "))
+                            else:
+                                seat_rows = None
+                            try:
+                                Admin.add_show(
+                                    film_name,
+                                    film_date,
+                                    scene_time,
+                                    ticket_capacity,
+                                    ticket_price,
+                                    seat_rows,
+                                    seat_cols,
+                                )
+                            except AddTicketFailed:
+                                os.system(CLEAR_CMD)
+                                print("Incorrect data, please check information.")
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("\nTicket Added Successfully! \n")
+
+                        # Admin info - Checked: OK.
+                        elif stat == "4":
                             os.system(CLEAR_CMD)
-                            print("\nTwo new passwords doesnt match! ")
-                        except ShortPasswordError:
+                            print(admin_object)
+
+                        # Edit admin info - Checked: OK
+                        elif stat == "5":
+                            print("********** ^ admin Edit Username ^ **********")
+                            print("To abort changes, leave it blank.\n")
+                            new_username = input("Enter New Username: ")
+                            new_ph_numb = input("Enter New Phone Number: ")
+                            try:
+                                admin_object.edit_user(new_username, new_ph_numb)
+                            except RepUserError:
+                                os.system(CLEAR_CMD)
+                                print("\nUsername already Taken! ")
+                            except PhoneNumberError:
+                                os.system(CLEAR_CMD)
+                                print("Invalid Phone Number format! ")
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("\nUser Information has been Updated! ")
+
+                        # Change admin password - Checked: OK
+                        elif stat == "6":
+                            print("\n********** ^ Password Change ^ **********\n")
+                            old_pass = getpass("Enter Old Password: ")
+                            new_pass = getpass("Enter New Password: ")
+                            rep_new_pass = getpass("Enter New Password again: ")
+                            try:
+                                admin_object.password_change(
+                                    old_pass, new_pass, rep_new_pass
+                                )
+                            except PasswordError:
+                                os.system(CLEAR_CMD)
+                                print("\nWrong Old Password! ")
+                            except TwoPasswordError:
+                                os.system(CLEAR_CMD)
+                                print("\nTwo new passwords doesnt match! ")
+                            except ShortPasswordError:
+                                os.system(CLEAR_CMD)
+                                print("New Password is too short! ")
+                            else:
+                                os.system(CLEAR_CMD)
+                                print("\nYour Password has been changed! ")
+
+                        # Exit command - Checked: OK
+                        elif stat == "0":
                             os.system(CLEAR_CMD)
-                            print("New Password is too short! ")
+                            print("\nExiting Admin Panel...")
+                            admin_object.delete_admin()
+                            break
+                        # Invalid state command - Checked: OK
                         else:
                             os.system(CLEAR_CMD)
-                            print("\nYour Password has been changed! ")
-
-                    # Exit command - Checked: OK
-                    elif stat == "0":
-                        os.system(CLEAR_CMD)
-                        print("\nExiting Admin Panel...")
-                        admin_object.delete_admin()
-                        break
-                    # Invalid state command - Checked: OK
-                    else:
-                        os.system(CLEAR_CMD)
-                        print("\nInvalid State! ")
-                        continue
+                            print("\nInvalid State! ")
+                            continue
 
-            elif stat == "0":
-                print("\nExiting the Admin Management Panel... ")
-                break
+                elif stat == "0":
+                    print("\nExiting the Admin Management Panel... ")
+                    break
 
-            else:
-                os.system(CLEAR_CMD)
-                print("\nInvalid State! ")
-                continue
+                else:
+                    os.system(CLEAR_CMD)
+                    print("\nInvalid State! ")
+                    continue
 
-    elif stat == "0":
-        os.system(CLEAR_CMD)
-        print("Exiting the program...")
-        break
+        elif stat == "0":
+            os.system(CLEAR_CMD)
+            print("Exiting the program...")
+            break
 
-    else:
-        os.system(CLEAR_CMD)
-        print("Invalid stat.")
-        continue
+        else:
+            os.system(CLEAR_CMD)
+            print("Invalid stat.")
+            continue
+
+
+def main(argv=None):
+    """
+    This is main function of our module
+    """
+    args = parse_args(argv)
+    if args.command == "import-schedule":
+        import_schedule(args.csv, args.dry_run)
+        return
+    if args.command == "provision":
+        provision_users(args.file, args.format, args.dry_run)
+        return
+    if args.command == "report":
+        export_report(args.report, args.format, args.start, args.end, args.output)
+        return
+    if (args.username is not None) and (args.password is not None):
+        create_admin(args.username, args.password)
+    bootstrap.start()
+    menu()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#! /usr/bin/python3
+"""
+This module contains counters and latency histograms of our hot paths.
+
+Metrics are off unless the CINEMA_METRICS environment variable is set
+(or enable() is called); a timed function then costs one flag check.
+When on, every timed call is counted into a fixed-bucket histogram
+
+    cinema_operation_seconds{operation="reserve_ticket"}
+    cinema_operation_seconds{operation="storage_load",document="films"}
+
+and every call that raised into cinema_operation_errors_total. Setting
+CINEMA_METRICS_PORT serves them in the Prometheus text format on
+http://127.0.0.1:<port>/metrics (see bootstrap.start()).
+
+Usage (count, p50 and p99 of every operation of a running process):
+    python metrics.py dump --port 9464
+"""
+
+import argparse
+from bisect import bisect_left
+import functools
+import os
+import sys
+import threading
+import time
+
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+HISTOGRAM = "cinema_operation_seconds"
+ERRORS = "cinema_operation_errors_total"
+PORT = 9464
+
+_enabled = os.environ.get("CINEMA_METRICS", "") not in ("", "0")
+
+
+class Counter:
+    """
+    A number that only goes up
+    """
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self.lock:
+            self.value += amount
+
+
+class Histogram:
+    """
+    Counts of observed values per fixed bucket, plus their sum.
+    counts[i] counts values <= buckets[i] (and > buckets[i - 1]), the
+    last count is for values above every bucket.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q quantile (0.5 for p50) by interpolating inside its bucket
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[index - 1] if index else 0.0
+                return low + (self.buckets[index] - low) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Registry:
+    """
+    Every counter and histogram of a process, by name and labels
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str, labels: dict) -> tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def counter(self, name: str, **labels) -> Counter:
+        key = Registry.key(name, labels)
+        counter = self.counters.get(key)
+        if counter is None:
+            with self.lock:
+                counter = self.counters.setdefault(key, Counter())
+        return counter
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = Registry.key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def prometheus(self) -> str:
+        """
+        Return every metric in the Prometheus text exposition format
+        """
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (other, labels), counter in counters:
+                if other == name:
+                    lines.append(f"{name}{format_labels(labels)} {counter.value}")
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (other, labels), histogram in histograms:
+                if other != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    le = labels + (("le", str(bound)),)
+                    lines.append(f"{name}_bucket{format_labels(le)} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> list:
+        """
+        Return (labels, count, p50, p99, errors) of every timed operation
+        """
+        rows = []
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            if name != HISTOGRAM:
+                continue
+            errors = self.counters.get((ERRORS, labels))
+            rows.append(
+                (
+                    labels,
+                    histogram.count,
+                    histogram.quantile(0.5),
+                    histogram.quantile(0.99),
+                    0 if errors is None else errors.value,
+                )
+            )
+        return rows
+
+
+def format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+registry = Registry()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """
+    Start collecting metrics
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Stop collecting metrics, what was collected is kept
+    """
+    global _enabled
+    _enabled = False
+
+
+class Timer:
+    """
+    Context manager that times its block into the histogram of an/
+    operation, and counts the block as an error if it raised
+    """
+
+    def __init__(self, operation: str, **labels):
+        self.labels = dict(labels, operation=operation)
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        registry.histogram(HISTOGRAM, **self.labels).observe(
+            time.perf_counter() - self.start
+        )
+        if kind is not None:
+            registry.counter(ERRORS, **self.labels).inc()
+
+
+def timed(operation: str):
+    """
+    Decorator timing every call of a function as operation,/
+    only a flag check when metrics are off
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with Timer(operation):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def dump(file=None, rows=None):
+    """
+    Print count, p50 and p99 (in milliseconds) of every operation
+    """
+    file = sys.stdout if file is None else file
+    rows = registry.report() if rows is None else rows
+    print(f"{'operation':<36} {'count':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}", file=file)
+    for labels, count, p50, p99, errors in rows:
+        name = ",".join(str(value) for key, value in labels if key != "operation")
+        operation = dict(labels)["operation"] + (f"[{name}]" if name else "")
+        print(
+            f"{operation:<36} {count:>9} {p50 * 1000:>9.3f} {p99 * 1000:>9.3f} {errors:>7}",
+            file=file,
+        )
+
+
+def serve(port: int = PORT, host: str = "127.0.0.1"):
+    """
+    Serve /metrics on a local port from a daemon thread and return the/
+    server. http.server is only imported here, it is slow to import.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def parse(text: str) -> Registry:
+    """
+    Rebuild the histograms and counters of a Prometheus text dump
+    """
+    parsed = Registry()
+    buckets = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        name, _, labels = series.partition("{")
+        labels = dict(
+            item.split("=", 1) for item in labels.rstrip("}").split(",") if item
+        )
+        labels = {key: value.strip('"') for key, value in labels.items()}
+        if name == f"{HISTOGRAM}_bucket":
+            le = labels.pop("le")
+            buckets.setdefault(Registry.key(HISTOGRAM, labels), []).append(
+                (float(le), int(float(value)))
+            )
+        elif name == f"{HISTOGRAM}_sum":
+            parsed.histogram(HISTOGRAM, **labels).sum = float(value)
+        elif name == ERRORS:
+            parsed.counter(ERRORS, **labels).value = int(float(value))
+    for (name, labels), cumulative in buckets.items():
+        histogram = parsed.histogram(name, **dict(labels))
+        previous = 0
+        for index, (_, count) in enumerate(sorted(cumulative)):
+            histogram.counts[index] = count - previous
+            previous = count
+        histogram.count = previous
+    return parsed
+
+
+def main():
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Show the metrics of a running process.")
+    parser.add_argument("command", choices=["dump"], help="dump: print p50/p99 per operation")
+    parser.add_argument("--port", type=int, default=PORT, help="Port of the metrics exporter")
+    args = parser.parse_args()
+    import urllib.request
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/metrics") as response:
+        text = response.read().decode("utf-8")
+    dump(rows=parse(text).report())
+
+
+if __name__ == "__main__":
+    main()
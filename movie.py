@@ -1,29 +1,44 @@
 #! /usr/bin/python3
 
 import json, os
-from custom_exceptions import FilmError, NoCapacityError
+import time
+import uuid
+from custom_exceptions import (
+    FilmError,
+    NoCapacityError,
+    SeatError,
+    HoldError,
+    AddTicketFailed,
+)
+import locks
+import metrics
+import storage
+from holds import HoldSweeper
+from schedule import ShowtimeIndex
+from seatmap import SeatMap
 import logging
-import os
 
 LOG_FILE = "./log/movie.log"
 JSON_FILE = "./database/films.json"
 
-if not os.path.exists(LOG_FILE):
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-
-LOG_FILE = "./log/movie.log"
-JSON_FILE = "./database/films.json"
+logger = logging.getLogger(__name__)
 
-if not os.path.exists(LOG_FILE):
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
 
-logger = logging.getLogger(__name__)
-file_h = logging.FileHandler(LOG_FILE)
+def setup_logging():
+    """
+    Create the log directory and attach the file handler of LOG_FILE to/
+    our logger. Called once at start up (see bootstrap.py), never at import.
+    """
+    path = os.path.abspath(LOG_FILE)
+    if any(getattr(handler, "baseFilename", None) == path for handler in logger.handlers):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_h = logging.FileHandler(path)
 
-file_f = logging.Formatter("%(asctime)s-%(name)s-%(levelname)s-%(massage)s")
-file_h.setFormatter(file_f)
-file_h.setLevel(logging.INFO)
-logger.addHandler(file_h)
+    file_f = logging.Formatter("%(asctime)s-%(name)s-%(levelname)s-%(message)s")
+    file_h.setFormatter(file_f)
+    file_h.setLevel(logging.INFO)
+    logger.addHandler(file_h)
 
 
 class Film:
@@ -32,15 +47,27 @@ class Film:
     """
 
     films = {}
+    objects = {}
+    index = ShowtimeIndex()
 
-    def __init__(self, name: str, genre: str, age_rating: str, tickets: dict = {}):
+    def __init__(self, name: str, genre: str, age_rating: str, tickets: dict = None):
         self.name = name
         self.genre = genre
         self.age_rating = age_rating
-        self.tickets = tickets
+        self.tickets = {} if tickets is None else tickets
+
+        Film.commit_record({"op": "add_film", "film": self.name, "record": self.__dict__})
 
-        Film.films.update({self.name: self.__dict__})
-        Film.save_films_to_json("./database/films.json", Film.films)
+    @classmethod
+    def from_record(cls, record: dict):
+        """
+        This class method builds an object from a stored record\
+                without any disk I/O. The object's attributes are\
+                the record itself, so nothing is copied.
+        """
+        obj = cls.__new__(cls)
+        obj.__dict__ = record
+        return obj
 
     @classmethod
     def load_films_from_json(cls, JSON_FILE):
@@ -49,8 +76,7 @@ class Film:
                 tickets data in the dictionary\
                 from a json file called database/films.json
         """
-        with open(JSON_FILE, mode="r", encoding="utf-8") as file:
-            return json.load(file)
+        return storage.backend().load(JSON_FILE)
 
     @classmethod
     def save_films_to_json(cls, JSON_FILE, dictionary):
@@ -59,15 +85,75 @@ class Film:
                 tickets data in the dictionary\
                 into a json file called database/films.json
         """
-        with open(JSON_FILE, mode="w+", encoding="utf-8") as file:
-            json.dump(dictionary, file, indent=4)
+        storage.backend().save(JSON_FILE, dictionary)
+
+    @classmethod
+    def load_films(cls):
+        """
+        This class method rebuilds our films dictionary from\
+                the storage engine, including every change\
+                logged after the last snapshot
+        """
+        if not storage.backend().exists(JSON_FILE):
+            return {}
+        return cls.load_films_from_json(JSON_FILE)
+
+    @classmethod
+    def refresh(cls):
+        """
+        This class method picks up changes other processes\
+                made to the films database since our last load
+        """
+        if storage.backend().exists(JSON_FILE):
+            Film.films = cls.load_films_from_json(JSON_FILE)
+
+    @classmethod
+    def checkpoint(cls):
+        """
+        This class method writes the whole films dictionary\
+                as a new snapshot
+        """
+        Film.save_films_to_json(JSON_FILE, Film.films)
+
+    @classmethod
+    def log_change(cls, record: dict):
+        """
+        This class method hands one change record to the\
+                storage engine instead of rewriting films.json
+        """
+        Film.log_changes([record])
+
+    @classmethod
+    def log_changes(cls, records: list):
+        """
+        This class method hands several change records to the\
+                storage engine at once
+        """
+        storage.backend().apply(JSON_FILE, records)
+
+    @classmethod
+    def commit_record(cls, record: dict):
+        """
+        This class method stores one change record and applies it\
+                to our films dictionary the same way a replay would
+        """
+        Film.log_change(record)
+        storage.apply_record(Film.films, record)
+
+    @classmethod
+    def schedule(cls) -> ShowtimeIndex:
+        """
+        This class method returns the index of every showtime of\
+                our films, sorted by date and time
+        """
+        return Film.index.sync(Film.films)
 
     @staticmethod
     def add_film(name: str, genre: str, age_rating: str):
         """
         This class method is for adding a film and its ticket.
         """
-        Film.films = Film.load_films_from_json("./database/films.json")
+        Film.films = Film.load_films()
         Film(name, genre, age_rating)
 
     @classmethod
@@ -75,11 +161,18 @@ class Film:
         """
         This class method is for getting the film name\
                 and creating a object from that information\
-                for us.
+                for us. The same object is returned again while\
+                its film record is unchanged.
         """
-        for i, j in Film.films.items():
-            if i == name:
-                return cls(j["name"], j["genre"], j["age_rating"])
+        j = Film.films.get(name)
+        if j is None:
+            return None
+        obj = Film.objects.get(name)
+        if obj is not None and obj.__dict__ is j:
+            return obj
+        obj = Film.from_record(j)
+        Film.objects[name] = obj
+        return obj
 
     def delete_film_obj(self):
         del self
@@ -92,8 +185,7 @@ class Film:
         """
         if name not in Film.films:
             raise FilmError("Film Not Found! ")
-        del Film.films[name]
-        cls.save_films_to_json("./database/films.json", Film.films)
+        Film.commit_record({"op": "remove_film", "film": name})
 
 
 class Ticket(Film):
@@ -102,34 +194,256 @@ class Ticket(Film):
     """
 
     ticket_dict = {}
+    seat_maps = {}
+    HOLD_TTL = 600
 
-    def __init__(self, name, scene_date, showtime, capacity, price: int):
+    def __init__(
+        self, name, scene_date, showtime, capacity, price: int, rows=None, cols=None
+    ):
         self.name = name
         self.scene_date = scene_date
         self.showtime = showtime
         self.available_seats = capacity
         self.price = price
+        self.capacity = capacity
+        if rows is not None and cols is not None:
+            if rows * cols != capacity:
+                raise AddTicketFailed("Capacity must be rows * columns of the seat map.")
+            self.seat_map = SeatMap(rows, cols).to_record()
 
-        Ticket.ticket_dict.update(
-            {f"{self.scene_date} _ {self.showtime}": self.__dict__}
-        )
-        Film.films = Film.load_films_from_json("./database/films.json")
+        ticket_key = f"{self.scene_date} _ {self.showtime}"
+        with Ticket.lock(name, ticket_key):
+            Film.refresh()
+            if ticket_key in Film.films[name]["tickets"]:
+                return
+            Film.commit_record(
+                {
+                    "op": "add_ticket",
+                    "film": name,
+                    "ticket": ticket_key,
+                    "record": self.__dict__,
+                }
+            )
 
-        Ticket.ticket_dict.update(Film.films[name]["tickets"])
-        Film.films[name]["tickets"] = Ticket.ticket_dict
-
-        Film.save_films_to_json("./database/films.json", Film.films)
-        Ticket.ticket_dict.clear()
+    @staticmethod
+    def get_ticket(film_name, ticket_key):
+        """
+        This method returns a Ticket object of a stored showtime\
+                without any disk I/O, or None if there is no such\
+                showtime
+        """
+        record = Film.films.get(film_name, {}).get("tickets", {}).get(ticket_key)
+        if record is None:
+            return None
+        return Ticket.from_record(record)
 
     @staticmethod
-    def add_ticket(name, scene_date, showtime, capacity, price):
+    def add_ticket(name, scene_date, showtime, capacity, price, rows=None, cols=None):
         """
-        This method is for adding a ticket from a defined film
+        This method is for adding a ticket from a defined film.
+        If rows and cols are given the showtime gets a seat map\
+                and buyers get specific seats.
         """
-        t_obj = Ticket(name, scene_date, showtime, capacity, price)
+        t_obj = Ticket(name, scene_date, showtime, capacity, price, rows, cols)
         t_obj.delete_film_obj()
 
+    @staticmethod
+    def lock(film_name, ticket_key):
+        """
+        This method returns the lock of one showtime, held by every\
+                thread and process selling seats of that showtime
+        """
+        return locks.hold(JSON_FILE, film_name, ticket_key)
+
+    @staticmethod
+    def seat_map(film_name, ticket_key):
+        """
+        This method returns the SeatMap of a showtime, or None if\
+                the showtime has no seat map. The same object is\
+                returned every time and synced to the stored sold\
+                and held seats.
+        """
+        record = Film.films[film_name]["tickets"][ticket_key].get("seat_map")
+        if record is None:
+            return None
+        key = (film_name, ticket_key)
+        if key not in Ticket.seat_maps:
+            Ticket.seat_maps[key] = SeatMap.from_record(record)
+        else:
+            Ticket.seat_maps[key].sync(record)
+        return Ticket.seat_maps[key]
+
+    @staticmethod
+    def sale_record(film_name, ticket_key, quantity, available_seats, seat_map=None):
+        """
+        This method returns the change record of one sale
+        """
+        record = {
+            "op": "sell",
+            "film": film_name,
+            "ticket": ticket_key,
+            "quantity": quantity,
+            "available_seats": available_seats,
+        }
+        if seat_map is not None:
+            record["sold"] = seat_map.encoded()
+            record["held"] = seat_map.encoded(seat_map.held)
+        return record
+
+    @staticmethod
+    def release_record(film_name, ticket_key, hold_ids):
+        """
+        This method returns the change record giving back the seats\
+                of the holds of hold_ids still stored, or None
+        """
+        ticket = Film.films[film_name]["tickets"][ticket_key]
+        holds = ticket.get("holds", {})
+        hold_ids = [hold_id for hold_id in hold_ids if hold_id in holds]
+        if not hold_ids:
+            return None
+        quantity = sum(holds[hold_id]["quantity"] for hold_id in hold_ids)
+        record = {
+            "op": "release",
+            "film": film_name,
+            "ticket": ticket_key,
+            "holds": hold_ids,
+            "quantity": quantity,
+            "available_seats": ticket["available_seats"] + quantity,
+        }
+        seat_map = Ticket.seat_map(film_name, ticket_key)
+        if seat_map is not None:
+            updated = seat_map.copy()
+            for hold_id in hold_ids:
+                updated.release(holds[hold_id].get("seats", []))
+            record["held"] = updated.encoded(updated.held)
+        return record
+
     @classmethod
+    def release_holds(cls, film_name, ticket_key, hold_ids):
+        """
+        This method gives back the seats of holds that were not\
+                confirmed. Unknown or confirmed holds are skipped.
+                Returns the number of released holds.
+        """
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            if ticket_key not in Film.films.get(film_name, {}).get("tickets", {}):
+                return 0
+            record = Ticket.release_record(film_name, ticket_key, hold_ids)
+            if record is None:
+                return 0
+            Film.commit_record(record)
+            return len(record["holds"])
+
+    @staticmethod
+    def release_expired(film_name, ticket_key, now=None):
+        """
+        This method gives back the seats of the expired holds of a\
+                showtime. Every path taking seats calls it with the\
+                showtime lock held, so holds left behind by a crash\
+                or a restart (the sweeper only knows holds made since\
+                start up) can't keep seats forever.
+        """
+        ticket = Film.films[film_name]["tickets"][ticket_key]
+        now = time.time() if now is None else now
+        expired = [
+            hold_id
+            for hold_id, hold in ticket.get("holds", {}).items()
+            if hold["expires"] <= now
+        ]
+        if expired:
+            Film.commit_record(Ticket.release_record(film_name, ticket_key, expired))
+
+    @classmethod
+    def hold(cls, film_name, ticket_key, quantity, seats=None, ttl=None):
+        """
+        This method holds seats of a showtime for ttl seconds\
+                (HOLD_TTL by default). Held seats can't be sold to\
+                anyone else until the hold is confirmed, released or\
+                expired. Returns the hold as a dictionary with its id.
+        """
+        ttl = Ticket.HOLD_TTL if ttl is None else ttl
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            now = time.time()
+            Ticket.release_expired(film_name, ticket_key, now)
+            ticket = Film.films[film_name]["tickets"][ticket_key]
+            record = {
+                "op": "hold",
+                "film": film_name,
+                "ticket": ticket_key,
+                "hold": uuid.uuid4().hex,
+                "expires": now + ttl,
+            }
+            seat_map = Ticket.seat_map(film_name, ticket_key)
+            if seat_map is not None:
+                if seats is None:
+                    seats = seat_map.best_seats(quantity)
+                    if seats is None:
+                        raise NoCapacityError("Insufficient ticket! ")
+                seats = [tuple(seat) for seat in seats]
+                updated = seat_map.copy()
+                updated.hold(seats)
+                quantity = len(seats)
+                record["seats"] = [list(seat) for seat in seats]
+                record["held"] = updated.encoded(updated.held)
+            elif seats is not None:
+                raise SeatError("This showtime has no seat map.")
+            if quantity > ticket["available_seats"]:
+                raise NoCapacityError("Insufficient ticket! ")
+            record["quantity"] = quantity
+            record["available_seats"] = ticket["available_seats"] - quantity
+            Film.commit_record(record)
+        Ticket.sweeper.add(record["expires"], film_name, ticket_key, record["hold"])
+        return {
+            "id": record["hold"],
+            "film": film_name,
+            "ticket": ticket_key,
+            "quantity": quantity,
+            "expires": record["expires"],
+            "seats": seats,
+        }
+
+    @staticmethod
+    def live_hold(film_name, ticket_key, hold_id) -> dict:
+        """
+        This method returns the stored hold of hold_id, raising\
+                HoldError if it is gone or has expired
+        """
+        ticket = Film.films.get(film_name, {}).get("tickets", {}).get(ticket_key, {})
+        hold = ticket.get("holds", {}).get(hold_id)
+        if hold is None or hold["expires"] <= time.time():
+            raise HoldError("Hold expired or not found! ")
+        return hold
+
+    @classmethod
+    def confirm(cls, film_name, ticket_key, hold_id):
+        """
+        This method turns a hold into a sale. The seats were taken\
+                when the hold was made, so only the hold is checked.
+                Returns the sold seats, or None if the showtime has\
+                no seat map.
+        """
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            hold = Ticket.live_hold(film_name, ticket_key, hold_id)
+            ticket = Film.films[film_name]["tickets"][ticket_key]
+            seat_map = Ticket.seat_map(film_name, ticket_key)
+            seats = None
+            if seat_map is not None:
+                seats = [tuple(seat) for seat in hold.get("seats", [])]
+                seat_map = seat_map.copy()
+                seat_map.commit(seats, held=True)
+            record = Ticket.sale_record(
+                film_name, ticket_key, hold["quantity"], ticket["available_seats"], seat_map
+            )
+            record["hold"] = hold_id
+            Film.commit_record(record)
+            print(f"{hold['quantity']} ticket(s) sold successfully.")
+            return seats
+
+    @classmethod
+    @metrics.timed("sell_ticket")
     def sell_ticket(cls, film_name, ticket_key, quantity):
         """
         This method is for seeling ticket\
@@ -137,12 +451,60 @@ class Ticket(Film):
                 count from our total quantity of that\
                 ticket
         """
-        if quantity <= Film.films[film_name]["tickets"][ticket_key]["available_seats"]:
-            Film.films[film_name]["tickets"][ticket_key]["available_seats"] -= quantity
-            Film.save_films_to_json("./database/films.json", Film.films)
-            print(f"{quantity} ticket(s) sold successfully.")
-        else:
-            raise NoCapacityError("Insufficient ticket! ")
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            Ticket.release_expired(film_name, ticket_key)
+            ticket = Film.films[film_name]["tickets"][ticket_key]
+            seat_map = Ticket.seat_map(film_name, ticket_key)
+            if seat_map is not None:
+                seats = seat_map.best_seats(quantity)
+                if seats is None:
+                    raise NoCapacityError("Insufficient ticket! ")
+                return Ticket.sell_seats(film_name, ticket_key, seats)
+            if quantity <= ticket["available_seats"]:
+                Film.commit_record(
+                    Ticket.sale_record(
+                        film_name, ticket_key, quantity, ticket["available_seats"] - quantity
+                    )
+                )
+                print(f"{quantity} ticket(s) sold successfully.")
+            else:
+                raise NoCapacityError("Insufficient ticket! ")
+
+    @classmethod
+    def sell_seats(cls, film_name, ticket_key, seats):
+        """
+        This method is for selling specific free seats of a showtime\
+                with a seat map. Seats are (row, column) pairs; held\
+                seats are sold with confirm() instead.
+                Returns the sold seats.
+        """
+        with Ticket.lock(film_name, ticket_key):
+            Film.refresh()
+            Ticket.release_expired(film_name, ticket_key)
+            ticket = Film.films[film_name]["tickets"][ticket_key]
+            seat_map = Ticket.seat_map(film_name, ticket_key)
+            if seat_map is None:
+                raise SeatError("This showtime has no seat map.")
+            seats = [tuple(seat) for seat in seats]
+            updated = seat_map.copy()
+            updated.commit(seats)
+            Film.commit_record(
+                Ticket.sale_record(
+                    film_name,
+                    ticket_key,
+                    len(seats),
+                    ticket["available_seats"] - len(seats),
+                    updated,
+                )
+            )
+            Ticket.seat_map(film_name, ticket_key)
+            print(f"{len(seats)} ticket(s) sold successfully.")
+            return seats
 
     def delete_ticket_obj(self):
         del self
+
+
+Ticket.sweeper = HoldSweeper(Ticket.release_holds)
+storage.listen(Film.index.on_record)
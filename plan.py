@@ -3,6 +3,7 @@ This module contains Plan, Silver and Glod classes/
 for modeling various types of user plan
 """
 from abc import ABC
+import bootstrap
 from human import User
 import custom_exceptions
 from bank_accounts import BankAccount
@@ -18,29 +19,29 @@ class Silver(ABC):
     def __init__(self):
         pass
 
-    def active(self, username, national_id, account_name, password, cvv2):
-        BankAccount.withdraw(national_id, account_name, password, cvv2, Silver.PRICE)
+    def active(self, username, national_id, account_name, password, cvv2, session=None):
+        BankAccount.withdraw(national_id, account_name, password, cvv2, Silver.PRICE, session)
         credit = 3
-        users_data = BankAccount.json_import(USERS_JSON)
+        users_data = bootstrap.users()
         users_data[username].update({"credit": credit})
         User.change_plan(self, username, "Silver")
 
     def deactive(self, username):
         User.change_plan(self, username, "Bronze")
 
-    def use_plan(self, username, cost, national_id, account_name, password, cvv2):
+    def use_plan(self, username, cost, national_id, account_name, password, cvv2, session=None):
 
-        users_data = BankAccount.json_import(USERS_JSON)
+        users_data = bootstrap.users()
 
         if users_data[username]["credit"] == 0:
             Silver.deactive(self, username)
             return False
         else:
             discount_cost = (cost * (1 - Silver.DISCOUNT))
-            BankAccount.withdraw(national_id, account_name, password, cvv2, discount_cost)
+            BankAccount.withdraw(national_id, account_name, password, cvv2, discount_cost, session)
             users_data[username]["credit"] -= 1
             users_data[username]["wallet"] += (Silver.DISCOUNT * cost)
-            BankAccount.json_save(USERS_JSON, users_data)
+            User.json_save(User.jsonpath, users_data)
 
 
 class Gold(ABC):
@@ -50,26 +51,27 @@ class Gold(ABC):
     def __init__(self):
         pass
 
-    def active(self, username, national_id, account_name, password, cvv2):
-        BankAccount.withdraw(national_id, account_name, password, cvv2, Gold.PRICE)
+    def active(self, username, national_id, account_name, password, cvv2, session=None):
+        BankAccount.withdraw(national_id, account_name, password, cvv2, Gold.PRICE, session)
         buy_date_time = datetime.now()
-        users_data = BankAccount.json_import(USERS_JSON)
-        users_data[username].update({"start_date": buy_date_time})
+        users_data = bootstrap.users()
+        users_data[username].update({"start_date": buy_date_time.isoformat()})
         User.change_plan(self, username, "Gold")
 
     def deactive(self, username):
         User.change_plan(self, username, "Bronze")
 
-    def use_plan(self, username, cost, national_id, account_name, password, cvv2):
+    def use_plan(self, username, cost, national_id, account_name, password, cvv2, session=None):
 
-        users_data = BankAccount.json_import(USERS_JSON)
+        users_data = bootstrap.users()
+        start_date = datetime.fromisoformat(users_data[username]["start_date"])
 
-        if datetime.now() - users_data[username]["start_date"] > timedelta(days=30):
+        if datetime.now() - start_date > timedelta(days=30):
             Gold.deactive(self, username)
             return False
         else:
             discount_cost = (cost * (1 - Gold.DISCOUNT))
-            BankAccount.withdraw(national_id, account_name, password, cvv2, discount_cost)
+            BankAccount.withdraw(national_id, account_name, password, cvv2, discount_cost, session)
             users_data[username]["credit"] -= 1
             users_data[username]["wallet"] += (Silver.DISCOUNT * cost)
-            BankAccount.json_save(USERS_JSON, users_data)
\ No newline at end of file
+            User.json_save(User.jsonpath, users_data)
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+This module contains the bulk provisioning of users and bank accounts.
+
+Input is JSON lines or CSV, one user per line/row:
+
+    {"fname": "Sara", "lname": "Karimi", "username": "sara", "password": "...",
+     "birth_date": "1990-04-01", "phone_number": "09121234567",
+     "accounts": [{"national_id": "0012345678", "account_name": "main",
+                   "balance": 50000, "password": "..."}]}
+
+    fname,lname,username,password,birth_date,phone_number,national_id,account_name,balance,account_password
+
+A CSV row has at most one account (national_id empty for none), an
+account without a password gets the password of its user. Rows are
+checked the way User and BankAccount check them (username taken,
+password length, phone number, national ID, account name taken) and a
+row with an error is reported and skipped.
+
+Valid rows are hashed BATCH at a time on the hashing process pool (see
+hashers.hash_passwords) and added to the users and bank accounts
+dictionaries in memory. users.json and bank_accounts.json are written
+once each, at the end. Run it while nobody else is signing users up.
+"""
+
+import csv
+import datetime
+import json
+import os
+import uuid
+import hashers
+import storage
+from bank_accounts import BankAccount, Client
+from custom_exceptions import (
+    AlreadyExistAccount,
+    BalanceMinimum,
+    InvalidNationalID,
+    PhoneNumberError,
+    RepUserError,
+    ShortPasswordError,
+)
+from human import Human, User
+from records import AccountRecord, UserRecord
+
+BATCH = 1000
+ACCOUNT_FIELDS = ("national_id", "account_name", "balance", "account_password")
+ROW_ERRORS = (
+    AlreadyExistAccount,
+    BalanceMinimum,
+    InvalidNationalID,
+    PhoneNumberError,
+    RepUserError,
+    ShortPasswordError,
+    ValueError,
+    KeyError,
+    TypeError,
+    AttributeError,
+)
+
+
+def read_rows(file, format: str):
+    """
+    Yield (line number, row) of a JSON lines or CSV file, every row/
+    with its list of accounts. A line that isn't a JSON object is/
+    yielded as its ValueError.
+    """
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            account = {key: row.pop(key, None) for key in ACCOUNT_FIELDS}
+            row["accounts"] = []
+            if account["national_id"]:
+                account["password"] = account.pop("account_password")
+                row["accounts"].append(account)
+            yield reader.line_num, row
+        return
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as error:
+            yield line, error
+            continue
+        if not isinstance(row, dict):
+            yield line, ValueError("A line must be a JSON object.")
+            continue
+        row.setdefault("accounts", [])
+        yield line, row
+
+
+def check_user(row: dict, usernames: set):
+    """
+    Raise the error User would raise for a row, or a ValueError
+    """
+    for field in ("fname", "lname", "username", "password", "birth_date"):
+        if not row.get(field):
+            raise ValueError(f"{field} is required.")
+    if row["username"] in usernames:
+        raise RepUserError("Username is already taken! ")
+    if not Human.password_check(row["password"]):
+        raise ShortPasswordError("Too short Password! ")
+    if not User.phone_number_check(row.get("phone_number") or ""):
+        raise PhoneNumberError("Invalid Phone Number Format! ")
+    datetime.date.fromisoformat(row["birth_date"])
+
+
+def check_account(account: dict, password: str) -> dict:
+    """
+    Return an account of a row with its balance and password,/
+    raising the error BankAccount would raise
+    """
+    national_id = str(account.get("national_id") or "")
+    if not Client.national_id_valid(national_id):
+        raise InvalidNationalID("Invalid ID.")
+    name = account.get("account_name")
+    if not name:
+        raise ValueError("account_name is required.")
+    if name in Client.clients_info.get(national_id, {}).get("accounts", {}):
+        raise AlreadyExistAccount("Account name already exists.")
+    balance = float(account.get("balance") or 0)
+    if balance < 0:
+        raise BalanceMinimum("Invalid balance.")
+    balance = int(balance) if balance.is_integer() else balance
+    password = account.get("password") or password
+    if not BankAccount.password_check(password):
+        raise ShortPasswordError("Too short Password!")
+    return dict(account, national_id=national_id, balance=balance, password=password)
+
+
+def add(row: dict, password: str, accounts: list):
+    """
+    Add a checked row, its password and its accounts' passwords hashed,/
+    to the users and bank accounts dictionaries
+    """
+    now = datetime.datetime.now()
+    bank_accounts = {}
+    for account, hashed in accounts:
+        national_id = account["national_id"]
+        client = Client.clients_info.setdefault(
+            national_id,
+            {
+                "national_id": national_id,
+                "first_name": account.get("first_name") or row["fname"],
+                "last_name": account.get("last_name") or row["lname"],
+                "accounts": {},
+            },
+        )
+        record = AccountRecord(
+            national_id=national_id,
+            account_name=account["account_name"],
+            balance=account["balance"],
+            password=hashed,
+            creation_date=now.isoformat(timespec="seconds"),
+            cvv2=BankAccount.new_cvv2(),
+        ).to_dict()
+        client["accounts"][account["account_name"]] = record
+        bank_accounts = client["accounts"]
+    User.dictionary[row["username"]] = UserRecord(
+        fname=row["fname"],
+        lname=row["lname"],
+        username=row["username"],
+        password=password,
+        user_id=str(uuid.uuid4()),
+        phone_number=row["phone_number"],
+        birth_date=row["birth_date"],
+        join_date=str(now),
+        bank_accounts=bank_accounts,
+    ).to_dict()
+
+
+def flush(batch: list):
+    """
+    Hash the passwords of a batch of checked rows in parallel and add them
+    """
+    passwords = []
+    for row, accounts in batch:
+        passwords.append(row["password"])
+        passwords.extend(account["password"] for account in accounts)
+    hashed = iter(hashers.hash_passwords(passwords))
+    for row, accounts in batch:
+        password = next(hashed)
+        add(row, password, [(account, next(hashed)) for account in accounts])
+    batch.clear()
+
+
+def provision(file, format: str = "jsonl", on_error=None, dry_run: bool = False,
+              batch_size: int = BATCH) -> dict:
+    """
+    Add the users and bank accounts of an open JSON lines or CSV file/
+    and save each database once. on_error(line number, message) is/
+    called for every skipped row. With dry_run nothing is changed./
+    Returns the counts of rows, added users and accounts and errors.
+    """
+    if storage.backend().exists(BankAccount.FILENAME):
+        Client.clients_info = BankAccount.json_import(BankAccount.FILENAME)
+    else:
+        Client.clients_info = {}
+    usernames = set(User.dictionary)
+    opened = set()
+    counts = {"rows": 0, "users": 0, "accounts": 0, "errors": 0}
+    batch = []
+    for line, row in read_rows(file, format):
+        counts["rows"] += 1
+        try:
+            if isinstance(row, ValueError):
+                raise row
+            check_user(row, usernames)
+            accounts, names = [], set()
+            for account in row["accounts"]:
+                account = check_account(account, row["password"])
+                key = (account["national_id"], account["account_name"])
+                if key in opened or key in names:
+                    raise AlreadyExistAccount("Account name already exists.")
+                names.add(key)
+                accounts.append(account)
+        except ROW_ERRORS as error:
+            counts["errors"] += 1
+            if on_error is not None:
+                on_error(line, str(error) or type(error).__name__)
+            continue
+        usernames.add(row["username"])
+        opened |= names
+        counts["users"] += 1
+        counts["accounts"] += len(accounts)
+        if dry_run:
+            continue
+        batch.append((row, accounts))
+        if len(batch) >= batch_size:
+            flush(batch)
+    if dry_run or not counts["users"]:
+        return counts
+    flush(batch)
+    if counts["accounts"]:
+        os.makedirs(os.path.dirname(BankAccount.FILENAME), exist_ok=True)
+        BankAccount.json_save(BankAccount.FILENAME, Client.clients_info)
+        BankAccount.ledger.build(Client.clients_info)
+    Human.json_save(User.jsonpath, User.dictionary)
+    return counts
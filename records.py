@@ -0,0 +1,209 @@
+"""
+This module contains compact record types of our databases/
+and the functions converting them from and to the stored dictionaries
+
+Stored documents are nested dictionaries, one per film, showtime,
+user, client and bank account, whose keys are the attribute names of
+our classes (e.g. "_BankAccount__password"). A slotted record keeps
+the same fields without a dictionary per record, so bulk writers
+(dataset generation, provisioning) can hold millions of them.
+from_dict()/to_dict() are the explicit mapping to the stored schema;
+keys we don't know are kept in extra so nothing is lost.
+
+Only those bulk writers use the records. Film.films, User.dictionary
+and the bank accounts of a running cinema stay the loaded dictionaries;
+what they share with the records is the interning below.
+
+Values that repeat across records (genres, age ratings, dates,
+showtimes, plans) are interned, like storage.intern_values does for
+every loaded document, so a million users share one "Bronze".
+"""
+
+from dataclasses import dataclass, fields
+import sys
+
+STORED_KEYS = {}
+KNOWN = {}
+POSITIONS = {}
+
+
+def intern(value):
+    """
+    Intern value if it is a string
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """
+    Mixin of our record types. SCHEMA maps field names to stored keys/
+    for the fields whose stored key is not the field name, OPTIONAL/
+    fields are left out of the stored dictionary when they are None.
+    """
+
+    __slots__ = ()
+    SCHEMA = {}
+    INTERNED = ()
+    OPTIONAL = ()
+
+    @classmethod
+    def stored_keys(cls) -> dict:
+        """
+        Return {field name: stored key} of the record type
+        """
+        keys = STORED_KEYS.get(cls)
+        if keys is None:
+            keys = STORED_KEYS[cls] = {
+                item.name: cls.SCHEMA.get(item.name, item.name)
+                for item in fields(cls)
+                if item.name != "extra"
+            }
+            KNOWN[cls] = set(keys.values())
+        return keys
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        """
+        Build a record from its stored dictionary
+        """
+        keys = cls.stored_keys()
+        values = [record.get(key) for key in keys.values()]
+        for index in cls.interned_positions():
+            values[index] = intern(values[index])
+        extra = None
+        if not KNOWN[cls].issuperset(record):
+            extra = {key: value for key, value in record.items() if key not in KNOWN[cls]}
+        return cls(*values, extra=extra)
+
+    @classmethod
+    def interned_positions(cls) -> tuple:
+        positions = POSITIONS.get(cls)
+        if positions is None:
+            names = list(cls.stored_keys())
+            positions = POSITIONS[cls] = tuple(names.index(name) for name in cls.INTERNED)
+        return positions
+
+    def to_dict(self) -> dict:
+        """
+        Return the stored dictionary of the record
+        """
+        record = {
+            key: getattr(self, name)
+            for name, key in type(self).stored_keys().items()
+            if getattr(self, name) is not None or name not in self.OPTIONAL
+        }
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+
+@dataclass(slots=True)
+class ShowtimeRecord(Record):
+    name: str
+    scene_date: str
+    showtime: str
+    available_seats: int
+    price: int
+    capacity: int = None
+    seat_map: dict = None
+    holds: dict = None
+    extra: dict = None
+
+    INTERNED = ("name", "scene_date", "showtime")
+    OPTIONAL = ("capacity", "seat_map", "holds")
+
+    @property
+    def key(self) -> str:
+        return f"{self.scene_date} _ {self.showtime}"
+
+
+@dataclass(slots=True)
+class FilmRecord(Record):
+    name: str
+    genre: str
+    age_rating: str
+    tickets: dict = None
+    extra: dict = None
+
+    INTERNED = ("genre", "age_rating")
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        film = super(FilmRecord, cls).from_dict(record)
+        film.tickets = {
+            key: ShowtimeRecord.from_dict(ticket)
+            for key, ticket in (film.tickets or {}).items()
+        }
+        return film
+
+    def to_dict(self) -> dict:
+        record = super(FilmRecord, self).to_dict()
+        record["tickets"] = {
+            key: ticket.to_dict() for key, ticket in (self.tickets or {}).items()
+        }
+        return record
+
+
+@dataclass(slots=True)
+class UserRecord(Record):
+    fname: str
+    lname: str
+    username: str
+    password: str
+    user_id: str
+    phone_number: str
+    birth_date: str
+    join_date: str
+    current_plan: str = "Bronze"
+    wallet: float = 0
+    bank_accounts: dict = None
+    extra: dict = None
+
+    SCHEMA = {
+        "username": "_username",
+        "password": "_User__password",
+        "phone_number": "_phone_number",
+    }
+    INTERNED = ("birth_date", "current_plan")
+
+
+@dataclass(slots=True)
+class AccountRecord(Record):
+    national_id: str
+    account_name: str
+    balance: float
+    password: str
+    creation_date: str
+    cvv2: int
+    extra: dict = None
+
+    SCHEMA = {"balance": "_balance", "password": "_BankAccount__password"}
+    INTERNED = ("national_id", "account_name")
+
+
+@dataclass(slots=True)
+class ClientRecord(Record):
+    national_id: str
+    first_name: str
+    last_name: str
+    accounts: dict = None
+    extra: dict = None
+
+    INTERNED = ("national_id",)
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        client = super(ClientRecord, cls).from_dict(record)
+        client.accounts = {
+            name: AccountRecord.from_dict(account)
+            for name, account in (client.accounts or {}).items()
+        }
+        return client
+
+    def to_dict(self) -> dict:
+        record = super(ClientRecord, self).to_dict()
+        record["accounts"] = {
+            name: account.to_dict() for name, account in (self.accounts or {}).items()
+        }
+        return record
+
@@ -0,0 +1,162 @@
+"""
+This module contains the sales and occupancy reports of our films.
+
+Every showtime stores its capacity next to its available_seats (see
+Ticket.__init__), so its sold seats are capacity - available_seats -
+seats held right now. Seats of holds that expired count as available.
+Old showtimes without a capacity get it from their seat map, or have
+an unknown (empty) capacity and sales.
+
+Reports are generator pipelines over Film.films, written row by row
+as CSV or JSON lines:
+
+    showtime  one row per showtime, sorted by date and time
+    day       totals of the showtimes of each day
+    film      totals of the showtimes of each film
+
+Only one row (or the totals of one day or film) is built at a time,
+so exporting a year of showtimes takes no memory beyond the films
+dictionary itself. Revenue is sold seats at list price.
+"""
+
+import csv
+from itertools import groupby
+import json
+import time
+from movie import Film
+from schedule import moment_key
+
+FIELDS = {
+    "showtime": (
+        "film", "scene_date", "showtime", "price", "capacity", "sold", "held",
+        "available_seats", "revenue", "occupancy",
+    ),
+    "day": ("scene_date", "showtimes", "capacity", "sold", "held", "revenue", "occupancy"),
+    "film": ("film", "showtimes", "capacity", "sold", "held", "revenue", "occupancy"),
+}
+
+
+def seat_counts(ticket: dict, now: float = None) -> tuple:
+    """
+    Return (capacity, sold, held, available) of a showtime, capacity and/
+    sold are None if unknown. Seats of expired holds count as available,/
+    the next sale of the showtime gives them back.
+    """
+    now = time.time() if now is None else now
+    held = expired = 0
+    for hold in ticket.get("holds", {}).values():
+        if hold["expires"] <= now:
+            expired += hold["quantity"]
+        else:
+            held += hold["quantity"]
+    available = ticket["available_seats"] + expired
+    capacity = ticket.get("capacity")
+    seat_map = ticket.get("seat_map")
+    if capacity is None and seat_map is not None:
+        capacity = seat_map["rows"] * seat_map["cols"]
+    if capacity is None:
+        return None, None, held, available
+    return capacity, capacity - available - held, held, available
+
+
+def occupancy(sold, capacity):
+    if not capacity or sold is None:
+        return None
+    return round(sold / capacity, 4)
+
+
+def showtime_row(film_name, ticket: dict) -> dict:
+    capacity, sold, held, available = seat_counts(ticket)
+    return {
+        "film": film_name,
+        "scene_date": ticket["scene_date"],
+        "showtime": ticket["showtime"],
+        "price": ticket["price"],
+        "capacity": capacity,
+        "sold": sold,
+        "held": held,
+        "available_seats": available,
+        "revenue": None if sold is None else sold * ticket["price"],
+        "occupancy": occupancy(sold, capacity),
+    }
+
+
+def showtimes(start=None, end=None):
+    """
+    Yield the row of every showtime from start up to (not including)/
+    end, sorted by date and time
+    """
+    for _, _, film_name, ticket_key in Film.schedule().keys(start, end):
+        ticket = Film.films.get(film_name, {}).get("tickets", {}).get(ticket_key)
+        if ticket is not None:
+            yield showtime_row(film_name, ticket)
+
+
+def totals(rows, **fields) -> dict:
+    """
+    Return the totals of showtime rows, known capacities and sales only
+    """
+    total = dict(fields, showtimes=0, capacity=0, sold=0, held=0, revenue=0)
+    for row in rows:
+        total["showtimes"] += 1
+        total["held"] += row["held"]
+        if row["capacity"] is not None:
+            total["capacity"] += row["capacity"]
+            total["sold"] += row["sold"]
+            total["revenue"] += row["revenue"]
+    total["occupancy"] = occupancy(total["sold"], total["capacity"])
+    return total
+
+
+def days(start=None, end=None):
+    """
+    Yield the totals of every day from start up to end
+    """
+    for scene_date, rows in groupby(showtimes(start, end), key=lambda row: row["scene_date"]):
+        yield totals(rows, scene_date=scene_date)
+
+
+def films(start=None, end=None):
+    """
+    Yield the totals of every film, over its showtimes from start up to end
+    """
+    low = None if start is None else moment_key(start)
+    high = None if end is None else moment_key(end)
+    for film_name, film in list(Film.films.items()):
+        rows = (
+            showtime_row(film_name, ticket)
+            for ticket in list(film.get("tickets", {}).values())
+            if (low is None or (ticket["scene_date"], ticket["showtime"]) >= low)
+            and (high is None or (ticket["scene_date"], ticket["showtime"]) < high)
+        )
+        yield totals(rows, film=film_name)
+
+
+REPORTS = {"showtime": showtimes, "day": days, "film": films}
+
+
+def write(rows, file, format: str, fields) -> int:
+    """
+    Write rows to an open file as CSV or JSON lines and return their count
+    """
+    count = 0
+    if format == "csv":
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in rows:
+        file.write(json.dumps({field: row[field] for field in fields}) + "\n")
+        count += 1
+    return count
+
+
+def export(report: str, file, format: str = "csv", start=None, end=None) -> int:
+    """
+    Write a report (showtime, day or film) of Film.films to an open file/
+    and return the number of rows. start and end are a date/
+    ("YYYY-MM-DD"), a "YYYY-MM-DD HH:MM" string or a datetime.
+    """
+    return write(REPORTS[report](start, end), file, format, FIELDS[report])
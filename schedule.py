@@ -0,0 +1,152 @@
+"""
+This module contains the ShowtimeIndex class, a sorted index of every/
+showtime of our films
+"""
+
+from bisect import bisect_left, insort
+from collections import namedtuple
+import datetime
+import threading
+
+Show = namedtuple("Show", "scene_date showtime film ticket_key available_seats")
+
+
+def moment_key(moment) -> tuple:
+    """
+    Turn a datetime (or a "YYYY-MM-DD HH:MM" string) into the (date, time)/
+    strings showtimes are sorted by
+    """
+    if isinstance(moment, str):
+        moment = datetime.datetime.fromisoformat(moment)
+    return (moment.date().isoformat(), moment.strftime("%H:%M"))
+
+
+class ShowtimeIndex:
+    """
+    Showtimes of a films dictionary sorted by (date, time, film).
+
+    Range queries are a bisect into the sorted list, and every film also
+    keeps its own sorted list, so "next shows of film X" does not look
+    at other films. The index follows the films dictionary it was built
+    from through on_record(), which storage.apply_record calls for every
+    change record, and is rebuilt only if Film.films is replaced by
+    another dictionary.
+    """
+
+    def __init__(self):
+        self.source = None
+        self.entries = []
+        self.by_film = {}
+        self.seats = {}
+        self.lock = threading.RLock()
+
+    def sync(self, films: dict):
+        """
+        Rebuild the index if it was built from another films dictionary
+        """
+        with self.lock:
+            if self.source is not films:
+                self.build(films)
+        return self
+
+    def build(self, films: dict):
+        with self.lock:
+            self.source = films
+            self.entries, self.by_film, self.seats = [], {}, {}
+            for film_name, film in films.items():
+                for ticket_key, ticket in film.get("tickets", {}).items():
+                    self.add(film_name, ticket_key, ticket)
+
+    @staticmethod
+    def entry(film_name, ticket_key, ticket) -> tuple:
+        return (ticket["scene_date"], ticket["showtime"], film_name, ticket_key)
+
+    def add(self, film_name, ticket_key, ticket: dict):
+        """
+        Add one showtime, keeping both lists sorted
+        """
+        with self.lock:
+            if (film_name, ticket_key) in self.seats:
+                return
+            entry = ShowtimeIndex.entry(film_name, ticket_key, ticket)
+            insort(self.entries, entry)
+            insort(self.by_film.setdefault(film_name, []), entry)
+            self.seats[(film_name, ticket_key)] = ticket["available_seats"]
+
+    def remove_film(self, film_name):
+        """
+        Drop every showtime of a film
+        """
+        with self.lock:
+            for entry in self.by_film.pop(film_name, []):
+                index = bisect_left(self.entries, entry)
+                del self.entries[index]
+                del self.seats[(film_name, entry[3])]
+
+    def on_record(self, dictionary: dict, record: dict):
+        """
+        Follow a change record applied to the films dictionary we index
+        """
+        if dictionary is not self.source:
+            return
+        with self.lock:
+            operation = record["op"]
+            key = (record.get("film"), record.get("ticket"))
+            if operation == "add_ticket":
+                ticket = dictionary.get(key[0], {}).get("tickets", {}).get(key[1])
+                if ticket is not None:
+                    self.add(*key, ticket)
+            elif operation == "add_film":
+                film = dictionary.get(key[0], {})
+                for ticket_key, ticket in film.get("tickets", {}).items():
+                    self.add(key[0], ticket_key, ticket)
+            elif operation == "remove_film":
+                self.remove_film(key[0])
+            elif "available_seats" in record and key in self.seats:
+                self.seats[key] = record["available_seats"]
+
+    def shows(self, entries, available: bool) -> list:
+        shows = [Show(*entry, self.seats[(entry[2], entry[3])]) for entry in entries]
+        if available:
+            shows = [show for show in shows if show.available_seats > 0]
+        return shows
+
+    def between(self, start, end, available: bool = True) -> list:
+        """
+        Return the shows from start up to (not including) end, sorted by time
+        """
+        with self.lock:
+            low = bisect_left(self.entries, moment_key(start))
+            high = bisect_left(self.entries, moment_key(end))
+            return self.shows(self.entries[low:high], available)
+
+    def keys(self, start=None, end=None) -> list:
+        """
+        Return (scene_date, showtime, film, ticket_key) of the showtimes/
+        from start up to (not including) end, sorted by time, all of them/
+        by default. Only the references are copied.
+        """
+        with self.lock:
+            low = 0 if start is None else bisect_left(self.entries, moment_key(start))
+            high = len(self.entries) if end is None else bisect_left(self.entries, moment_key(end))
+            return self.entries[low:high]
+
+    def upcoming(
+        self, count: int = None, after=None, film_name=None, available: bool = True
+    ) -> list:
+        """
+        Return the next count shows (all if count is None) from after/
+        (now by default), of one film if film_name is given
+        """
+        after = datetime.datetime.now() if after is None else after
+        with self.lock:
+            entries = self.entries if film_name is None else self.by_film.get(film_name, [])
+            shows = []
+            index = bisect_left(entries, moment_key(after))
+            while index < len(entries) and (count is None or len(shows) < count):
+                shows.extend(self.shows([entries[index]], available))
+                index += 1
+            return shows
+
+    def __len__(self):
+        return len(self.entries)
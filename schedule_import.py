@@ -0,0 +1,148 @@
+"""
+This module contains the bulk import of films and showtimes from CSV.
+
+The first line names the columns, in any order:
+
+    film,genre,age_rating,scene_date,showtime,capacity,price,rows,cols
+    Dune,Sci-Fi,PG-13,2025-03-01,19:30,100,150000,10,10
+    Dune,,,2025-03-02,19:30,80,150000,,
+
+film, scene_date (YYYY-MM-DD) and showtime (HH:MM) are required. genre
+and age_rating are only needed for films that don't exist yet. rows and
+cols give the showtime a seat map of rows * cols seats, capacity may
+then be left empty. Rows are read one at a time, checked and applied
+to the films dictionary in memory; a row with an error is reported and
+skipped. films.json is written once, at the end (see Film.checkpoint).
+"""
+
+import csv
+import datetime
+import storage
+from custom_exceptions import AddTicketFailed, FilmError
+from movie import Film
+from seatmap import SeatMap
+
+COLUMNS = ("film", "genre", "age_rating", "scene_date", "showtime", "capacity", "price", "rows", "cols")
+REQUIRED = ("film", "scene_date", "showtime")
+
+
+def scene_date(value: str) -> str:
+    """
+    Return a YYYY-MM-DD date the way the admin panel stores it
+    """
+    try:
+        year, month, day = value.split("-")
+        return datetime.date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        raise AddTicketFailed(f"Invalid scene date '{value}' (YYYY-MM-DD).")
+
+
+def scene_time(value: str) -> str:
+    """
+    Return a HH:MM time the way the admin panel stores it
+    """
+    try:
+        hour, minute = value.split(":")
+        return datetime.time(hour=int(hour), minute=int(minute)).isoformat(timespec="minutes")
+    except ValueError:
+        raise AddTicketFailed(f"Invalid scene time '{value}' (HH:MM).")
+
+
+def number(row: dict, column: str, minimum: int):
+    """
+    Return the integer of a column, or None if it is empty
+    """
+    value = (row.get(column) or "").strip()
+    if value == "":
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise AddTicketFailed(f"Invalid {column} '{value}'.")
+    if value < minimum:
+        raise AddTicketFailed(f"{column} must be at least {minimum}.")
+    return value
+
+
+def showtime_record(row: dict) -> dict:
+    """
+    Return the stored record of the showtime of a row, like Ticket.__init__ makes
+    """
+    rows, cols = number(row, "rows", 1), number(row, "cols", 1)
+    capacity, price = number(row, "capacity", 1), number(row, "price", 0)
+    if (rows is None) != (cols is None):
+        raise AddTicketFailed("rows and cols must be given together.")
+    if capacity is None:
+        if rows is None:
+            raise AddTicketFailed("capacity is required without a seat map.")
+        capacity = rows * cols
+    if price is None:
+        raise AddTicketFailed("price is required.")
+    record = {
+        "name": row["film"].strip(),
+        "scene_date": scene_date(row["scene_date"].strip()),
+        "showtime": scene_time(row["showtime"].strip()),
+        "available_seats": capacity,
+        "price": price,
+        "capacity": capacity,
+    }
+    if rows is not None:
+        if rows * cols != capacity:
+            raise AddTicketFailed("Capacity must be rows * columns of the seat map.")
+        record["seat_map"] = SeatMap(rows, cols).to_record()
+    return record
+
+
+def import_schedule(file, on_error=None, dry_run: bool = False) -> dict:
+    """
+    Import the rows of an open CSV file into Film.films and save it once./
+    on_error(line number, message) is called for every skipped row./
+    With dry_run nothing is changed. Returns the counts of rows, added/
+    films, added showtimes and errors.
+    """
+    reader = csv.DictReader(file)
+    missing = [column for column in REQUIRED if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    counts = {"rows": 0, "films": 0, "showtimes": 0, "errors": 0}
+    new_films, new_showtimes = set(), set()
+    for row in reader:
+        counts["rows"] += 1
+        try:
+            name = (row.get("film") or "").strip()
+            if not name:
+                raise FilmError("film is required.")
+            ticket = showtime_record(row)
+            ticket_key = f"{ticket['scene_date']} _ {ticket['showtime']}"
+            records = []
+            if name not in Film.films and name not in new_films:
+                genre = (row.get("genre") or "").strip()
+                age_rating = (row.get("age_rating") or "").strip()
+                if not genre or not age_rating:
+                    raise FilmError(f"Film '{name}' not found, genre and age_rating are needed to add it.")
+                records.append(
+                    {
+                        "op": "add_film",
+                        "film": name,
+                        "record": {"name": name, "genre": genre, "age_rating": age_rating, "tickets": {}},
+                    }
+                )
+            if (name, ticket_key) in new_showtimes or ticket_key in Film.films.get(name, {}).get("tickets", {}):
+                raise AddTicketFailed(f"Showtime {ticket_key} of '{name}' already exists.")
+        except (AddTicketFailed, FilmError) as error:
+            counts["errors"] += 1
+            if on_error is not None:
+                on_error(reader.line_num, str(error))
+            continue
+        if records:
+            new_films.add(name)
+            counts["films"] += 1
+        new_showtimes.add((name, ticket_key))
+        counts["showtimes"] += 1
+        if not dry_run:
+            records.append({"op": "add_ticket", "film": name, "ticket": ticket_key, "record": ticket})
+            for record in records:
+                storage.apply_record(Film.films, record)
+    if not dry_run and counts["showtimes"]:
+        Film.checkpoint()
+    return counts
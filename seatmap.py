@@ -0,0 +1,227 @@
+"""
+This module contains the SeatMap class for modeling the seats of a showtime
+"""
+
+import base64
+from custom_exceptions import SeatError
+
+
+class SeatMap:
+    """
+    Seats of one showtime as rows x cols bitsets.
+
+    Sold and held seats are kept in two bytearrays with one bit per
+    seat; every row starts on a byte boundary so a whole row can be read
+    as one integer. Searching for N adjacent free seats is then a few
+    shift and AND operations per row instead of a loop over every seat.
+    Rows and columns are counted from zero, row 0 is nearest the screen.
+    """
+
+    ROW_WEIGHT = 2.0
+    PREFERRED_ROW = 2 / 3
+
+    def __init__(self, rows: int, cols: int, sold: bytes = None, held: bytes = None):
+        if rows <= 0 or cols <= 0:
+            raise SeatError("A seat map needs at least one row and one column.")
+        self.rows, self.cols = rows, cols
+        self.stride = (cols + 7) // 8
+        size = rows * self.stride
+        self.sold = bytearray(sold) if sold is not None else bytearray(size)
+        if len(self.sold) != size:
+            raise SeatError("Seat map size does not match rows and columns.")
+        self.held = bytearray(held) if held is not None else bytearray(size)
+        if len(self.held) != size:
+            raise SeatError("Seat map size does not match rows and columns.")
+        self.full_row = (1 << cols) - 1
+
+    @classmethod
+    def from_record(cls, record: dict):
+        """
+        Create a SeatMap from the seat_map record stored in a showtime
+        """
+        held = record.get("held")
+        return cls(
+            record["rows"],
+            record["cols"],
+            base64.b64decode(record["sold"]),
+            base64.b64decode(held) if held is not None else None,
+        )
+
+    def to_record(self) -> dict:
+        """
+        Return the seat_map record to store in a showtime
+        """
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "sold": self.encoded(),
+            "held": self.encoded(self.held),
+        }
+
+    def encoded(self, bits: bytearray = None) -> str:
+        """
+        Return a bitset as a base64 string, the sold seats by default
+        """
+        bits = self.sold if bits is None else bits
+        return base64.b64encode(bytes(bits)).decode("ascii")
+
+    def copy(self):
+        """
+        Return a new SeatMap with the same sold and held seats
+        """
+        return SeatMap(self.rows, self.cols, self.sold, self.held)
+
+    def sync(self, record: dict):
+        """
+        Take the sold and held seats from a stored record
+        """
+        if record["sold"] != self.encoded():
+            self.sold[:] = base64.b64decode(record["sold"])
+        held = record.get("held")
+        if held is None:
+            self.held[:] = bytes(len(self.held))
+        elif held != self.encoded(self.held):
+            self.held[:] = base64.b64decode(held)
+
+    def row_bits(self, bits: bytearray, row: int) -> int:
+        start = row * self.stride
+        return int.from_bytes(bits[start:start + self.stride], "little")
+
+    def taken_bits(self, row: int) -> int:
+        """
+        Return a row as an integer with bit c set if seat c is sold or held
+        """
+        return self.row_bits(self.sold, row) | self.row_bits(self.held, row)
+
+    def check(self, row: int, col: int):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise SeatError(f"Seat ({row}, {col}) does not exist.")
+
+    def is_set(self, bits: bytearray, row: int, col: int) -> bool:
+        self.check(row, col)
+        return bool(bits[row * self.stride + col // 8] & (1 << (col % 8)))
+
+    def set(self, bits: bytearray, row: int, col: int, value: bool):
+        self.check(row, col)
+        index = row * self.stride + col // 8
+        if value:
+            bits[index] |= 1 << (col % 8)
+        else:
+            bits[index] &= ~(1 << (col % 8))
+
+    def state(self, row: int, col: int) -> str:
+        """
+        Return "sold", "held" or "free" for one seat
+        """
+        if self.is_set(self.sold, row, col):
+            return "sold"
+        if self.is_set(self.held, row, col):
+            return "held"
+        return "free"
+
+    def free_count(self) -> int:
+        """
+        Return the number of seats neither sold nor held
+        """
+        taken = sum(bin(byte).count("1") for byte in self.sold)
+        taken += sum(bin(byte).count("1") for byte in self.held)
+        return self.rows * self.cols - taken
+
+    def score(self, row: int, start: int, count: int) -> float:
+        """
+        Score of a block of count seats starting at (row, start),/
+        lower is better: near the preferred row and the centre of the row
+        """
+        preferred = (self.rows - 1) * SeatMap.PREFERRED_ROW
+        centre = (self.cols - 1) / 2
+        distance = abs(start + (count - 1) / 2 - centre)
+        return SeatMap.ROW_WEIGHT * abs(row - preferred) + distance
+
+    def best_available(self, count: int):
+        """
+        Return the best block of count adjacent free seats of one row/
+        as a list of (row, col), or None if no row has such a block
+        """
+        if count <= 0 or count > self.cols:
+            return None
+        preferred = (self.rows - 1) * SeatMap.PREFERRED_ROW
+        ideal = max(0, int((self.cols - count) / 2))
+        low_mask = (1 << ideal) - 1
+        best = None
+        for row in sorted(range(self.rows), key=lambda row: abs(row - preferred)):
+            if best is not None and SeatMap.ROW_WEIGHT * abs(row - preferred) >= best[0]:
+                break
+            free = ~self.taken_bits(row) & self.full_row
+            starts = free
+            for shift in range(1, count):
+                starts &= free >> shift
+            if not starts:
+                continue
+            candidates = []
+            above = starts >> ideal
+            if above:
+                candidates.append(ideal + (above & -above).bit_length() - 1)
+            below = starts & low_mask
+            if below:
+                candidates.append(below.bit_length() - 1)
+            for start in candidates:
+                score = self.score(row, start, count)
+                if best is None or score < best[0]:
+                    best = (score, row, start)
+        if best is None:
+            return None
+        _, row, start = best
+        return [(row, col) for col in range(start, start + count)]
+
+    def best_seats(self, count: int):
+        """
+        Return count free seats, adjacent if possible, otherwise the/
+        count best single seats. Returns None if not enough seats are free.
+        """
+        seats = self.best_available(count)
+        if seats is not None:
+            return seats
+        if count > self.free_count():
+            return None
+        free = [
+            (self.score(row, col, 1), row, col)
+            for row in range(self.rows)
+            for col in range(self.cols)
+            if not self.taken_bits(row) >> col & 1
+        ]
+        return [(row, col) for _, row, col in sorted(free)[:count]]
+
+    def hold(self, seats):
+        """
+        Hold free seats so no one else can take them
+        """
+        seats = [tuple(seat) for seat in seats]
+        if len(set(seats)) != len(seats):
+            raise SeatError("A seat is chosen twice.")
+        for row, col in seats:
+            if self.state(row, col) != "free":
+                raise SeatError(f"Seat ({row}, {col}) is not available.")
+        for row, col in seats:
+            self.set(self.held, row, col, True)
+
+    def release(self, seats):
+        """
+        Give held seats back
+        """
+        for row, col in seats:
+            self.set(self.held, row, col, False)
+
+    def commit(self, seats, held: bool = False):
+        """
+        Sell seats. They must be free, or held by the caller if held is True.
+        """
+        seats = [tuple(seat) for seat in seats]
+        if len(set(seats)) != len(seats):
+            raise SeatError("A seat is chosen twice.")
+        expected = "held" if held else "free"
+        for row, col in seats:
+            if self.state(row, col) != expected:
+                raise SeatError(f"Seat ({row}, {col}) is not available.")
+        for row, col in seats:
+            self.set(self.held, row, col, False)
+            self.set(self.sold, row, col, True)
@@ -0,0 +1,400 @@
+#! /usr/bin/python3
+"""
+This module contains a small asyncio HTTP server for our ticketing system.
+
+It listens on localhost only and exposes the same actions as the user
+panel of main.py as JSON endpoints:
+
+    POST /sign-in       {"username", "password"} -> {"token", "user"}
+    POST /sign-out      {"token"}
+    GET  /tickets       -> {film name: [scene, ...]}
+    POST /payment-session        {"national_id", "account_name", "password",
+                                  "cvv2", optional "ttl"} -> {"session"}
+    POST /payment-session/close  {"session"}
+    POST /reserve       {"film_name", "scene_date", "showtime", "quantity",
+                         "national_id", "account_name", "password", "cvv2",
+                         optional "seats": [[row, col], ...]}
+    POST /reserve-many  {"orders": [reserve body, ...]} -> {"results": [...]}
+    POST /wallet        {"token", "national_id", "account_name", "password",
+                         "cvv2", "amount"}
+
+/reserve, /reserve-many orders and /wallet take a "session" from
+/payment-session instead of "password" and "cvv2", so a returning buyer
+is not verified again until the session expires.
+
+Connections are kept alive (HTTP/1.1), so one terminal can send many
+requests over one socket. Disk I/O runs in a thread pool and password
+hashing on a process pool (see hashers.py), so one slow request never
+blocks the others.
+
+Usage:
+    python server.py --port 8080
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+import json
+import secrets
+import threading
+import bootstrap
+import hashers
+from movie import Film
+from human import Human, User, Admin
+from bank_accounts import BankAccount
+from custom_exceptions import (
+    UserError,
+    PasswordError,
+    FilmError,
+    TicketError,
+    NoCapacityError,
+    SeatError,
+    HoldError,
+    SessionError,
+    BalanceMinimum,
+    UnsuccessfulIdDeposit,
+    UnsuccessfulAccountDeposit,
+    UnsuccessfulPasswordDeposit,
+    UnsuccessfulCvv2Deposit,
+)
+
+HOST = "127.0.0.1"
+PORT = 8080
+MAX_BODY = 1 << 20
+
+ERRORS = {
+    UserError: HTTPStatus.NOT_FOUND,
+    FilmError: HTTPStatus.NOT_FOUND,
+    TicketError: HTTPStatus.NOT_FOUND,
+    UnsuccessfulIdDeposit: HTTPStatus.NOT_FOUND,
+    UnsuccessfulAccountDeposit: HTTPStatus.NOT_FOUND,
+    PasswordError: HTTPStatus.UNAUTHORIZED,
+    UnsuccessfulPasswordDeposit: HTTPStatus.UNAUTHORIZED,
+    UnsuccessfulCvv2Deposit: HTTPStatus.UNAUTHORIZED,
+    SessionError: HTTPStatus.UNAUTHORIZED,
+    NoCapacityError: HTTPStatus.CONFLICT,
+    SeatError: HTTPStatus.CONFLICT,
+    HoldError: HTTPStatus.CONFLICT,
+    BalanceMinimum: HTTPStatus.CONFLICT,
+}
+
+
+def error_status(error: Exception) -> HTTPStatus:
+    """
+    Return the HTTP status of an exception raised by a handler,/
+    subclasses of the exceptions in ERRORS get the status of their base
+    """
+    for cls in type(error).__mro__:
+        if cls in ERRORS:
+            return ERRORS[cls]
+    return HTTPStatus.BAD_REQUEST
+
+
+class HttpError(Exception):
+    """
+    Raised for malformed requests, carries the HTTP status to answer with
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def load_databases():
+    """
+    Load admins, films and users databases, the server needs all of them
+    """
+    bootstrap.admins()
+    bootstrap.films()
+    bootstrap.users()
+
+
+class TicketServer:
+    """
+    This class is for serving our ticketing actions over HTTP
+    """
+
+    def __init__(self, host: str = HOST, port: int = PORT, workers: int = None):
+        self.host, self.port = host, port
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+        self.server = None
+        self.routes = {
+            ("POST", "/sign-in"): self.sign_in,
+            ("POST", "/sign-out"): self.sign_out,
+            ("GET", "/tickets"): self.tickets,
+            ("POST", "/payment-session"): self.open_payment_session,
+            ("POST", "/payment-session/close"): self.close_payment_session,
+            ("POST", "/reserve"): self.reserve,
+            ("POST", "/reserve-many"): self.reserve_many,
+            ("POST", "/wallet"): self.charge_wallet,
+        }
+
+    def session(self, token) -> User:
+        with self.sessions_lock:
+            if token not in self.sessions:
+                raise HttpError(HTTPStatus.UNAUTHORIZED, "Invalid session token.")
+            return self.sessions[token]
+
+    def sign_in(self, body: dict) -> dict:
+        username, password = body["username"], body["password"]
+        with self.sessions_lock:
+            signed_in = [
+                user for user in self.sessions.values() if user.username == username
+            ]
+        if signed_in:
+            if not hashers.verify(password, User.dictionary[username]["_User__password"]):
+                raise PasswordError("Wrong Password!")
+            user = signed_in[0]
+        else:
+            user = User.sign_in_validation(username, password)
+        token = secrets.token_urlsafe(32)
+        with self.sessions_lock:
+            self.sessions[token] = user
+        return {
+            "token": token,
+            "user": {
+                "username": user.username,
+                "current_plan": user.current_plan,
+                "wallet": user.wallet,
+            },
+        }
+
+    def sign_out(self, body: dict) -> dict:
+        user = self.session(body["token"])
+        with self.sessions_lock:
+            del self.sessions[body["token"]]
+            still_signed_in = any(
+                other is user for other in self.sessions.values()
+            )
+        if not still_signed_in:
+            user.delete_user()
+        return {}
+
+    def tickets(self, body: dict) -> dict:
+        Film.refresh()
+        tickets = {}
+        for _, _, film_name, ticket_key in Film.schedule().keys():
+            tickets.setdefault(film_name, []).append(ticket_key)
+        return tickets
+
+    @staticmethod
+    def credentials(body: dict) -> tuple:
+        """
+        Return (password, cvv2, session) of a paying request,/
+        password and cvv2 are only needed without a session
+        """
+        if "session" in body:
+            return None, None, body["session"]
+        return body["password"], int(body["cvv2"]), None
+
+    def open_payment_session(self, body: dict) -> dict:
+        ttl = body.get("ttl")
+        session = BankAccount.open_session(
+            body["national_id"],
+            body["account_name"],
+            body["password"],
+            int(body["cvv2"]),
+            None if ttl is None else float(ttl),
+        )
+        return {"session": session}
+
+    def close_payment_session(self, body: dict) -> dict:
+        BankAccount.close_session(body["session"])
+        return {}
+
+    def reserve(self, body: dict) -> dict:
+        password, cvv2, session = TicketServer.credentials(body)
+        seats = User.reserve_ticket(
+            body["film_name"],
+            body["scene_date"],
+            body["showtime"],
+            int(body["quantity"]),
+            body["national_id"],
+            body["account_name"],
+            password,
+            cvv2,
+            body.get("seats"),
+            session,
+        )
+        if seats is None:
+            return {"reserved": int(body["quantity"])}
+        return {"reserved": len(seats), "seats": seats}
+
+    def reserve_many(self, body: dict) -> dict:
+        orders = []
+        for order in body["orders"]:
+            password, cvv2, session = TicketServer.credentials(order)
+            orders.append(
+                dict(
+                    order,
+                    quantity=int(order["quantity"]),
+                    password=password,
+                    cvv2=cvv2,
+                    session=session,
+                )
+            )
+        results = []
+        for error in User.reserve_many(orders):
+            if error is None:
+                results.append({"reserved": True})
+            else:
+                results.append({"error": type(error).__name__, "message": str(error)})
+        return {"results": results}
+
+    def charge_wallet(self, body: dict) -> dict:
+        user = self.session(body["token"])
+        password, cvv2, session = TicketServer.credentials(body)
+        user.charge_wallet(
+            body["national_id"],
+            body["account_name"],
+            password,
+            cvv2,
+            int(body["amount"]),
+            session,
+        )
+        return {"wallet": user.wallet}
+
+    async def read_request(self, reader):
+        """
+        Read one request from the connection.
+        Returns None when the client closed the connection.
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Incomplete request.")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(
+                HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Headers too large."
+            )
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        if length > MAX_BODY:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large.")
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+        return method, target.split("?")[0], body, keep_alive
+
+    async def dispatch(self, method, path, body) -> tuple:
+        """
+        Run the handler of a route in the executor and/
+        turn its result or exception into (status, payload)
+        """
+        handler = self.routes.get((method, path))
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {"error": "NotFound", "message": "No such route."}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("JSON object expected.")
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": "BadRequest", "message": str(error)}
+        loop = asyncio.get_running_loop()
+        try:
+            return HTTPStatus.OK, await loop.run_in_executor(self.executor, handler, data)
+        except HttpError as error:
+            return error.status, {"error": type(error).__name__, "message": str(error)}
+        except KeyError as error:
+            return HTTPStatus.BAD_REQUEST, {
+                "error": "BadRequest",
+                "message": f"Missing field {error}.",
+            }
+        except Exception as error:
+            status = error_status(error)
+            return status, {"error": type(error).__name__, "message": str(error)}
+
+    async def handle(self, reader, writer):
+        """
+        Serve every request sent over one connection
+        """
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HttpError as error:
+                    payload = {"error": "BadRequest", "message": str(error)}
+                    self.write(writer, error.status, payload, False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self.dispatch(method, path, body)
+                self.write(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def write(writer, status: HTTPStatus, payload: dict, keep_alive: bool):
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=False)
+
+
+def main():
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Serve the cinema ticketing API on localhost.")
+    parser.add_argument("--port", type=int, default=PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="Size of the worker thread pool")
+    args = parser.parse_args()
+    bootstrap.start()
+    load_databases()
+    server = TicketServer(HOST, args.port, args.workers)
+    print(f"Serving on http://{HOST}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+This module contains the PaymentSessions class, short lived tokens that/
+stand for a bank account whose credentials were already checked
+"""
+
+import secrets
+import threading
+import time
+from custom_exceptions import SessionError
+
+
+class PaymentSessions:
+    """
+    In memory store of payment sessions.
+
+    open() is called once the password and CVV2 of an account were
+    verified and returns an opaque token. Until it expires (TTL seconds)
+    or is closed, check() of the token is a dict lookup, so a returning
+    buyer is not verified (nor the password hashed) again. Expired
+    sessions are dropped when checked, and all of them now and then
+    when new ones are opened.
+    """
+
+    TTL = 300
+
+    def __init__(self, ttl: float = None):
+        self.ttl = PaymentSessions.TTL if ttl is None else ttl
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.next_purge = 64
+
+    def open(self, national_id, account_name, ttl: float = None, now: float = None) -> str:
+        """
+        Start a session for an account and return its token
+        """
+        now = time.monotonic() if now is None else now
+        token = secrets.token_urlsafe(32)
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            if len(self.sessions) >= self.next_purge:
+                self.purge(now)
+                self.next_purge = 2 * len(self.sessions) + 64
+            self.sessions[token] = (national_id, account_name, expires)
+        return token
+
+    def check(self, token, national_id, account_name, now: float = None):
+        """
+        Raise SessionError unless token is a live session of the account
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            session = self.sessions.get(token)
+            if session is not None and session[2] <= now:
+                del self.sessions[token]
+                session = None
+        if session is None:
+            raise SessionError("Payment session has expired.")
+        if session[:2] != (national_id, account_name):
+            raise SessionError("Payment session belongs to another account.")
+
+    def close(self, token):
+        """
+        Revoke a session, closing an unknown token does nothing
+        """
+        with self.lock:
+            self.sessions.pop(token, None)
+
+    def purge(self, now: float):
+        """
+        Drop every expired session, called with the lock held
+        """
+        self.sessions = {
+            token: session for token, session in self.sessions.items() if session[2] > now
+        }
+
+    def __len__(self):
+        return len(self.sessions)
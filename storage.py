@@ -0,0 +1,755 @@
+"""
+This module contains the storage engines our classes persist through.
+
+Every database file is addressed by its path (e.g. ./database/films.json)
+and handled as a whole dictionary with load() and save(). Small changes
+like selling seats or debiting an account are passed to apply() as
+change records, so an engine can store them without rewriting the
+whole document:
+
+    {"op": "sell", "film", "ticket", "quantity", "available_seats",
+     ["sold", "held", "hold"]}
+    {"op": "hold", "film", "ticket", "hold", "quantity", "expires",
+     "available_seats", ["seats", "held"]}
+    {"op": "release", "film", "ticket", "holds", "quantity",
+     "available_seats", ["held"]}
+    {"op": "add_film", "film", "record"}
+    {"op": "add_ticket", "film", "ticket", "record"}
+    {"op": "remove_film", "film"}
+    {"op": "balance", "national_id", "account", "amount", "balance", "minimum",
+     "time"}
+
+Records carry the resulting value as well as the delta, so replaying one
+that is already part of a snapshot is harmless.
+
+Usage for migration:
+    python storage.py migrate ./database ./database/cinema.sqlite3
+"""
+
+from abc import ABC, abstractmethod
+import argparse
+import functools
+import json
+import os
+import sqlite3
+import threading
+from cache import DocumentCache
+from journal import Journal
+import sys
+import locks
+import metrics
+from writer import GroupCommit, WriteBehind, atomic_write
+from custom_exceptions import BalanceMinimum, NoCapacityError, HoldError
+
+DOCUMENTS = ("admins", "users", "films", "bank_accounts")
+FINANCIAL = ("bank_accounts",)
+SHOWTIME_OPERATIONS = ("sell", "hold", "release")
+INTERNED = {
+    "films": ("genre", "age_rating"),
+    "tickets": ("scene_date", "showtime"),
+    "users": ("current_plan", "birth_date"),
+}
+listeners = []
+
+
+def listen(listener):
+    """
+    Call listener(dictionary, record) after every change record applied/
+    to a loaded dictionary, e.g. to keep an index of it up to date
+    """
+    listeners.append(listener)
+
+
+def apply_showtime(ticket: dict, record: dict):
+    """
+    Apply one sell, hold or release record to a showtime dictionary
+    """
+    operation = record["op"]
+    ticket["available_seats"] = record["available_seats"]
+    holds = ticket.get("holds", {})
+    if operation == "hold":
+        hold = {"quantity": record["quantity"], "expires": record["expires"]}
+        if "seats" in record:
+            hold["seats"] = record["seats"]
+        ticket["holds"] = dict(holds, **{record["hold"]: hold})
+    elif operation == "release":
+        for hold_id in record["holds"]:
+            holds.pop(hold_id, None)
+    elif "hold" in record:
+        holds.pop(record["hold"], None)
+    for bits in ("sold", "held"):
+        if bits in record:
+            ticket["seat_map"][bits] = record[bits]
+
+
+def apply_record(dictionary: dict, record: dict):
+    """
+    Apply one change record to a loaded document dictionary
+    """
+    operation = record["op"]
+    if operation in SHOWTIME_OPERATIONS:
+        tickets = dictionary.get(record["film"], {}).get("tickets", {})
+        if record["ticket"] in tickets:
+            apply_showtime(tickets[record["ticket"]], record)
+    elif operation == "add_film":
+        dictionary.setdefault(record["film"], record["record"])
+    elif operation == "add_ticket":
+        if record["film"] in dictionary:
+            tickets = dict(dictionary[record["film"]]["tickets"])
+            tickets.setdefault(record["ticket"], record["record"])
+            dictionary[record["film"]]["tickets"] = tickets
+    elif operation == "remove_film":
+        dictionary.pop(record["film"], None)
+    elif operation == "balance":
+        accounts = dictionary.get(record["national_id"], {}).get("accounts", {})
+        if record["account"] in accounts:
+            accounts[record["account"]]["_balance"] = record["balance"]
+    for listener in listeners:
+        listener(dictionary, record)
+
+
+def intern_fields(record: dict, keys) -> dict:
+    for key in keys:
+        if isinstance(record.get(key), str):
+            record[key] = sys.intern(record[key])
+    return record
+
+
+def intern_values(name: str, dictionary: dict) -> dict:
+    """
+    Intern the values repeated across the records of a loaded document/
+    (genres, dates, plans, ...) in place, name is the document name
+    """
+    keys = INTERNED.get(name, ())
+    for record in dictionary.values():
+        if not isinstance(record, dict):
+            continue
+        intern_fields(record, keys)
+        if name == "films":
+            for ticket in record.get("tickets", {}).values():
+                intern_fields(ticket, INTERNED["tickets"])
+    return dictionary
+
+
+def document_name(path) -> str:
+    """
+    Return the document name of a database path, e.g. films for ./database/films.json
+    """
+    return os.path.splitext(os.path.basename(str(path)))[0]
+
+
+def measured(operation: str):
+    """
+    Decorator timing a storage method into metrics as operation,/
+    labelled with the name of the document it was called for
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, path, *args):
+            if not metrics.enabled():
+                return method(self, path, *args)
+            with metrics.Timer(operation, document=document_name(path)):
+                return method(self, path, *args)
+
+        return wrapper
+
+    return decorator
+
+
+class Storage(ABC):
+    """
+    This is an Abstract class for our storage engines
+    """
+
+    @abstractmethod
+    def exists(self, path) -> bool:
+        """
+        Return True if the document has been saved before
+        """
+
+    @abstractmethod
+    def load(self, path) -> dict:
+        """
+        Return the whole document as a dictionary
+        """
+
+    @abstractmethod
+    def save(self, path, dictionary: dict):
+        """
+        Replace the whole document with dictionary
+        """
+
+    @abstractmethod
+    def apply(self, path, records: list):
+        """
+        Store a list of change records for the document
+        """
+
+    def flush(self, path=None):
+        """
+        Write out saves that are still waiting in memory, of one/
+        document or of every document if path is None
+        """
+
+
+class JsonStorage(Storage):
+    """
+    Storage engine that keeps every document in its own JSON file.
+    Change records are appended to a journal next to the file
+    (./database/films.json -> ./database/films.journal) and folded
+    into a new snapshot every CHECKPOINT_EVERY records.
+
+    Parsed documents are kept in a DocumentCache, so loading a file that
+    nobody has rewritten only reads the journal records appended since
+    the last load.
+
+    With write_behind=True, save() of any document but the FINANCIAL ones
+    only marks it dirty and a WriteBehind thread writes it a moment
+    later; the journal is truncated only once the snapshot is on disk.
+    Every snapshot is written atomically (temporary file, fsync, rename).
+
+    Saves and change records of FINANCIAL documents are durable when
+    save() or apply() returns. They go through a GroupCommit, so
+    payments arriving while one is being fsynced share the next fsync.
+    Their journal is the ledger of the document: at a checkpoint its
+    records are moved to ./database/<name>.ledger instead of dropped.
+    """
+
+    CHECKPOINT_EVERY = 1000
+
+    def __init__(self, write_behind: bool = False, interval: float = None):
+        self.journals = {}
+        self.offsets = {}
+        self.cache = DocumentCache()
+        self.lock = threading.RLock()
+        self.write_behind = WriteBehind(self.write, interval) if write_behind else None
+        self.groups = {}
+
+    def journal(self, path) -> Journal:
+        """
+        Return the Journal object of a document
+        """
+        key = os.path.abspath(str(path))
+        with self.lock:
+            if key not in self.journals:
+                self.journals[key] = Journal(os.path.splitext(key)[0] + ".journal")
+            return self.journals[key]
+
+    def exists(self, path) -> bool:
+        return os.path.exists(path) or self.pending(path) is not None
+
+    def pending(self, path):
+        """
+        Return the dictionary of a save still waiting to be written, or None
+        """
+        if self.write_behind is None:
+            return None
+        return self.write_behind.get(os.path.abspath(str(path)))
+
+    def parse(self, path) -> dict:
+        """
+        Parse the snapshot file of a document
+        """
+        with open(path, mode="r", encoding="utf-8") as file:
+            return intern_values(document_name(path), json.load(file))
+
+    def read(self, path, dictionary: dict = None) -> dict:
+        """
+        Parse the snapshot file of a document and replay its whole journal./
+        Given the dictionary of a save still waiting to be written, its/
+        records are kept and only the ones it lacks are taken from the/
+        snapshot before the journal is replayed onto it.
+        """
+        key = os.path.abspath(str(path))
+        if dictionary is None:
+            dictionary = self.parse(path)
+        elif os.path.exists(path):
+            for name, record in self.parse(path).items():
+                dictionary.setdefault(name, record)
+        journal = self.journal(path)
+        journal.replay(dictionary, apply_record)
+        self.offsets[key] = journal.offset
+        return dictionary
+
+    @measured("storage_load")
+    def load(self, path) -> dict:
+        """
+        Return the cached document with the journal records appended/
+        since the last load. The document lock keeps a checkpoint of/
+        another process (new snapshot, then empty journal) from landing/
+        between reading the snapshot and remembering the journal offset.
+        """
+        key = os.path.abspath(str(path))
+        with locks.document(path), self.lock:
+            pending = self.pending(path)
+            if pending is None:
+                dictionary = self.cache.get(path, lambda: self.read(path))
+            else:
+                dictionary = pending
+            journal = self.journal(path)
+            size = DocumentCache.signature(journal.path)
+            size = 0 if size is None else size[1]
+            offset = self.offsets.get(key, 0)
+            if size < offset or (pending is not None and self.cache.stale(path)):
+                # another process folded the journal into a new snapshot
+                dictionary = self.read(path, pending)
+                self.cache.put(path, dictionary)
+            elif size > offset:
+                journal.replay(dictionary, apply_record, offset)
+                self.offsets[key] = journal.offset
+            return dictionary
+
+    @measured("storage_save")
+    def save(self, path, dictionary: dict):
+        if document_name(path) in FINANCIAL:
+            self.group(path).submit(("save", dictionary))
+        elif self.write_behind is not None:
+            self.write_behind.mark(os.path.abspath(str(path)), path, dictionary)
+        else:
+            self.write(path, dictionary)
+
+    @measured("storage_write")
+    def write(self, path, dictionary: dict):
+        """
+        Write a new snapshot of a document and empty its journal./
+        Records other processes appended since our last load are/
+        replayed first, so truncating the journal never loses them.
+        """
+        key = os.path.abspath(str(path))
+        with locks.document(path), self.lock:
+            journal = self.journal(path)
+            if dictionary is self.cache.peek(path) and key in self.offsets:
+                journal.replay(dictionary, apply_record, self.offsets[key])
+            atomic_write(path, json.dumps(dictionary, indent=4))
+            if document_name(path) in FINANCIAL:
+                journal.archive(os.path.splitext(key)[0] + ".ledger")
+            else:
+                journal.truncate()
+            self.offsets[key] = 0
+            self.cache.put(path, dictionary)
+
+    def flush(self, path=None):
+        if self.write_behind is not None:
+            key = None if path is None else os.path.abspath(str(path))
+            self.write_behind.flush(key)
+
+    @measured("storage_apply")
+    def apply(self, path, records: list):
+        if document_name(path) in FINANCIAL:
+            self.group(path).submit(("apply", records))
+            return
+        with locks.document(path), self.lock:
+            journal = self.journal(path)
+            journal.extend(records)
+            if len(journal) >= self.CHECKPOINT_EVERY and self.exists(path):
+                self.save(path, self.load(path))
+
+    def group(self, path) -> GroupCommit:
+        """
+        Return the GroupCommit of a financial document
+        """
+        key = os.path.abspath(str(path))
+        with self.lock:
+            if key not in self.groups:
+                self.groups[key] = GroupCommit(lambda items: self.commit(path, items))
+            return self.groups[key]
+
+    def commit(self, path, items: list):
+        """
+        Store a batch of ("save", dictionary) and ("apply", records)/
+        items in their order. Records in a row are appended and fsynced/
+        together and snapshots are written atomically.
+        """
+        with locks.document(path), self.lock:
+            journal = self.journal(path)
+            records = []
+            for operation, value in items:
+                if operation == "apply":
+                    records.extend(value)
+                    continue
+                journal.extend(records, durable=True)
+                records = []
+                self.write(path, value)
+            journal.extend(records, durable=True)
+            if len(journal) >= self.CHECKPOINT_EVERY and os.path.exists(path):
+                self.write(path, self.load(path))
+
+
+class SQLiteStorage(Storage):
+    """
+    Storage engine that keeps every document in one SQLite database
+    (WAL mode). Films, showtimes, users, admins, clients and accounts
+    are stored one row each, so change records turn into single row
+    updates, and every balance change is also kept in the ledger table.
+    Any other document is stored as a JSON text.
+
+    Loaded documents are kept until another connection commits (its
+    PRAGMA data_version changes), our own saves and change records are
+    applied to them, so a payment or a sale does not build the whole
+    document from its rows again.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            name TEXT PRIMARY KEY, body TEXT
+        );
+        CREATE TABLE IF NOT EXISTS films (
+            name TEXT PRIMARY KEY, record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS showtimes (
+            film TEXT NOT NULL, ticket_key TEXT NOT NULL, record TEXT NOT NULL,
+            available_seats INTEGER NOT NULL, PRIMARY KEY (film, ticket_key)
+        );
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY, record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS admins (
+            username TEXT PRIMARY KEY, record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS clients (
+            national_id TEXT PRIMARY KEY, record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS accounts (
+            national_id TEXT NOT NULL, account_name TEXT NOT NULL,
+            record TEXT NOT NULL, balance REAL NOT NULL,
+            PRIMARY KEY (national_id, account_name)
+        );
+        CREATE TABLE IF NOT EXISTS ledger (
+            id INTEGER PRIMARY KEY, national_id TEXT NOT NULL,
+            account_name TEXT NOT NULL, amount REAL NOT NULL,
+            balance REAL NOT NULL, time TEXT
+        );
+    """
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            self.filename, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SQLiteStorage.SCHEMA)
+        self.documents = {}
+        self.version = None
+
+    def validate(self):
+        """
+        Forget the loaded documents if another connection has committed/
+        since we last looked
+        """
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if version != self.version:
+            self.documents.clear()
+            self.version = version
+
+    def exists(self, path) -> bool:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM documents WHERE name = ?", (document_name(path),)
+            ).fetchone()
+        return row is not None
+
+    @measured("storage_load")
+    def load(self, path) -> dict:
+        name = document_name(path)
+        with self.lock:
+            self.validate()
+            if name not in self.documents:
+                self.documents[name] = self._load(name)
+            return self.documents[name]
+
+    def _load(self, name) -> dict:
+        row = self.connection.execute(
+            "SELECT body FROM documents WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No such document: '{name}'")
+        if name == "films":
+            return intern_values(name, self._load_films())
+        if name in ("users", "admins"):
+            return intern_values(
+                name,
+                {
+                    username: json.loads(record)
+                    for username, record in self.connection.execute(
+                        f"SELECT username, record FROM {name}"
+                    )
+                },
+            )
+        if name == "bank_accounts":
+            return self._load_accounts()
+        return json.loads(row[0])
+
+    def _load_films(self) -> dict:
+        films = {}
+        for name, record in self.connection.execute("SELECT name, record FROM films"):
+            films[name] = json.loads(record)
+            films[name]["tickets"] = {}
+        for film, ticket_key, record, seats in self.connection.execute(
+            "SELECT film, ticket_key, record, available_seats FROM showtimes"
+        ):
+            ticket = json.loads(record)
+            ticket["available_seats"] = seats
+            films[film]["tickets"][ticket_key] = ticket
+        return films
+
+    def _load_accounts(self) -> dict:
+        clients = {}
+        for national_id, record in self.connection.execute(
+            "SELECT national_id, record FROM clients"
+        ):
+            clients[national_id] = json.loads(record)
+            clients[national_id]["accounts"] = {}
+        for national_id, account_name, record, balance in self.connection.execute(
+            "SELECT national_id, account_name, record, balance FROM accounts"
+        ):
+            account = json.loads(record)
+            account["_balance"] = balance
+            clients[national_id]["accounts"][account_name] = account
+        return clients
+
+    @measured("storage_save")
+    def save(self, path, dictionary: dict):
+        name = document_name(path)
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.validate()
+                if name == "films":
+                    self._save_films(dictionary)
+                    body = None
+                elif name in ("users", "admins"):
+                    self.connection.execute(f"DELETE FROM {name}")
+                    self.connection.executemany(
+                        f"INSERT INTO {name} (username, record) VALUES (?, ?)",
+                        [(key, json.dumps(value)) for key, value in dictionary.items()],
+                    )
+                    body = None
+                elif name == "bank_accounts":
+                    self._save_accounts(dictionary)
+                    body = None
+                else:
+                    body = json.dumps(dictionary)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO documents (name, body) VALUES (?, ?)",
+                    (name, body),
+                )
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            self.documents[name] = dictionary
+
+    def _save_films(self, films: dict):
+        self.connection.execute("DELETE FROM films")
+        self.connection.execute("DELETE FROM showtimes")
+        for name, film in films.items():
+            self._insert_film(name, film)
+
+    def _insert_film(self, name, film: dict):
+        record = {key: value for key, value in film.items() if key != "tickets"}
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO films (name, record) VALUES (?, ?)",
+            (name, json.dumps(record)),
+        )
+        if cursor.rowcount:
+            for ticket_key, ticket in film.get("tickets", {}).items():
+                self._insert_showtime(name, ticket_key, ticket)
+
+    def _insert_showtime(self, film, ticket_key, ticket: dict):
+        self.connection.execute(
+            "INSERT OR IGNORE INTO showtimes"
+            " (film, ticket_key, record, available_seats) VALUES (?, ?, ?, ?)",
+            (film, ticket_key, json.dumps(ticket), ticket["available_seats"]),
+        )
+
+    def _save_accounts(self, clients: dict):
+        self.connection.execute("DELETE FROM clients")
+        self.connection.execute("DELETE FROM accounts")
+        for national_id, client in clients.items():
+            record = {key: value for key, value in client.items() if key != "accounts"}
+            self.connection.execute(
+                "INSERT INTO clients (national_id, record) VALUES (?, ?)",
+                (national_id, json.dumps(record)),
+            )
+            for account_name, account in client.get("accounts", {}).items():
+                self.connection.execute(
+                    "INSERT INTO accounts"
+                    " (national_id, account_name, record, balance) VALUES (?, ?, ?, ?)",
+                    (national_id, account_name, json.dumps(account), account["_balance"]),
+                )
+
+    @measured("storage_apply")
+    def apply(self, path, records: list):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.validate()
+                for record in records:
+                    self._apply_record(record)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            dictionary = self.documents.get(document_name(path))
+            if dictionary is not None:
+                for record in records:
+                    apply_record(dictionary, record)
+
+    def _apply_record(self, record: dict):
+        operation = record["op"]
+        if operation in SHOWTIME_OPERATIONS:
+            self._apply_showtime(record)
+        elif operation == "add_film":
+            self._insert_film(record["film"], record["record"])
+        elif operation == "add_ticket":
+            self._insert_showtime(record["film"], record["ticket"], record["record"])
+        elif operation == "remove_film":
+            self.connection.execute("DELETE FROM films WHERE name = ?", (record["film"],))
+            self.connection.execute(
+                "DELETE FROM showtimes WHERE film = ?", (record["film"],)
+            )
+        elif operation == "balance":
+            cursor = self.connection.execute(
+                "UPDATE accounts SET balance = balance + ?"
+                " WHERE national_id = ? AND account_name = ? AND balance + ? >= ?",
+                (
+                    record["amount"],
+                    record["national_id"],
+                    record["account"],
+                    record["amount"],
+                    record.get("minimum", float("-inf")),
+                ),
+            )
+            if cursor.rowcount == 0:
+                raise BalanceMinimum("Invalid balance.")
+            self.connection.execute(
+                "INSERT INTO ledger (national_id, account_name, amount, balance, time)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    record["national_id"],
+                    record["account"],
+                    record["amount"],
+                    record["balance"],
+                    record.get("time"),
+                ),
+            )
+
+    def _apply_showtime(self, record: dict):
+        """
+        Sales and holds take seats only if enough are left, releases give/
+        back only the holds still stored and a held sale needs its hold
+        """
+        key = (record["film"], record["ticket"])
+        operation = record["op"]
+        ticket, change = None, -record.get("quantity", 0)
+        if operation != "sell" or {"sold", "held", "hold"} & record.keys():
+            row = self.connection.execute(
+                "SELECT record FROM showtimes WHERE film = ? AND ticket_key = ?", key
+            ).fetchone()
+            if row is None:
+                return
+            ticket = json.loads(row[0])
+            holds = ticket.get("holds", {})
+            if operation == "release":
+                change = sum(
+                    holds[hold_id]["quantity"]
+                    for hold_id in record["holds"]
+                    if hold_id in holds
+                )
+            elif "hold" in record and operation == "sell":
+                if record["hold"] not in holds:
+                    raise HoldError("Hold expired or not found! ")
+                change = 0
+        cursor = self.connection.execute(
+            "UPDATE showtimes SET available_seats = available_seats + ?"
+            " WHERE film = ? AND ticket_key = ? AND available_seats + ? >= 0",
+            (change, *key, change),
+        )
+        if cursor.rowcount == 0:
+            raise NoCapacityError("Insufficient ticket! ")
+        if ticket is not None:
+            apply_showtime(ticket, record)
+            self.connection.execute(
+                "UPDATE showtimes SET record = ? WHERE film = ? AND ticket_key = ?",
+                (json.dumps(ticket), *key),
+            )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+_backend = None
+
+
+def backend() -> Storage:
+    """
+    Return the storage engine in use. It is chosen by the CINEMA_STORAGE
+    environment variable ("json" or "sqlite:<path>") and defaults to JSON files.
+    Setting CINEMA_WRITE_BEHIND to a number of milliseconds turns on
+    write-behind saves for the JSON engine.
+    """
+    global _backend
+    if _backend is None:
+        setting = os.environ.get("CINEMA_STORAGE", "json")
+        write_behind = os.environ.get("CINEMA_WRITE_BEHIND")
+        if setting.startswith("sqlite:"):
+            _backend = SQLiteStorage(setting[len("sqlite:"):])
+        elif write_behind:
+            _backend = JsonStorage(True, int(write_behind) / 1000)
+        else:
+            _backend = JsonStorage()
+    return _backend
+
+
+def use(storage: Storage):
+    """
+    Replace the storage engine in use
+    """
+    global _backend
+    _backend = storage
+
+
+def migrate(source_dir, target: Storage) -> list:
+    """
+    Import every ./database/*.json file found in source_dir into target.
+    Returns the list of migrated document names.
+    """
+    source = JsonStorage()
+    migrated = []
+    for name in DOCUMENTS:
+        path = os.path.join(source_dir, f"{name}.json")
+        if source.exists(path):
+            target.save(path, source.load(path))
+            migrated.append(name)
+    return migrated
+
+
+def main():
+    """
+    This is main function of our module
+    """
+    parser = argparse.ArgumentParser(description="Cinema storage engine tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_cmd = commands.add_parser(
+        "migrate", help="Import ./database/*.json files into an SQLite database"
+    )
+    migrate_cmd.add_argument("source", help="Directory of the JSON database files")
+    migrate_cmd.add_argument("target", help="Path of the SQLite database")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        target = SQLiteStorage(args.target)
+        for name in migrate(args.source, target):
+            print(f"{name} migrated.")
+        target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+This module contains DatabaseTestCase, the base class of our tests/
+that run against a database of their own
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import bootstrap
+import storage
+from bank_accounts import Client
+from human import User
+from movie import Film, Ticket
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Runs every test in a new temporary directory with an empty
+    ./database directory and a new storage engine (make_storage(), JSON
+    files by default). Afterwards the directory is removed and the
+    storage engine, loaded databases, films and seat maps are forgotten.
+    """
+
+    def make_storage(self) -> storage.Storage:
+        return storage.JsonStorage()
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.dirpath = tempfile.mkdtemp()
+        os.chdir(self.dirpath)
+        os.mkdir("./database")
+        storage.use(self.make_storage())
+        bootstrap.reset()
+        Film.films = {}
+        Ticket.seat_maps.clear()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        backend = storage.backend()
+        if hasattr(backend, "close"):
+            backend.close()
+        shutil.rmtree(self.dirpath)
+        storage.use(None)
+        bootstrap.reset()
+        Film.films = {}
+        Ticket.seat_maps.clear()
+        User.dictionary = {}
+        Client.clients_info = {}
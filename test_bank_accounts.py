@@ -0,0 +1,63 @@
+import hashlib
+import json
+import unittest
+import hashers
+import storage
+from bank_accounts import BankAccount
+from custom_exceptions import UnsuccessfulCvv2Deposit, UnsuccessfulPasswordDeposit
+from tempdb import DatabaseTestCase
+
+
+class TestCreateAccount(DatabaseTestCase):
+    """
+    This test class is for testing BankAccount.create_account
+    """
+
+    def test_clients_sharing_an_account_name(self):
+        BankAccount.create_account("1000000000", "main", "Sara", "Karimi", 50_000, "pass1")
+        BankAccount.create_account("2000000000", "main", "Omid", "Alavi", 90_000, "pass2")
+        BankAccount.create_account("2000000000", "savings", "Omid", "Alavi", 20_000, "pass3")
+        with open(BankAccount.FILENAME, mode="r", encoding="utf-8") as file:
+            stored = json.load(file)
+        first, second = stored["1000000000"]["accounts"], stored["2000000000"]["accounts"]
+        self.assertEqual(list(first), ["main"])
+        self.assertEqual(list(second), ["main", "savings"])
+        self.assertEqual((first["main"]["national_id"], first["main"]["_balance"]), ("1000000000", 50_000))
+        self.assertTrue(hashers.verify("pass1", first["main"]["_BankAccount__password"]))
+        self.assertEqual((second["main"]["national_id"], second["main"]["_balance"]), ("2000000000", 90_000))
+        self.assertTrue(hashers.verify("pass2", second["main"]["_BankAccount__password"]))
+
+
+class TestDeposit(DatabaseTestCase):
+    """
+    This test class is for testing BankAccount.deposit
+    """
+
+    def setUp(self):
+        super().setUp()
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 50_000, "pass")
+        accounts = BankAccount.json_import(BankAccount.FILENAME)
+        self.account = accounts["1234567890"]["accounts"]["main"]
+        self.account["_BankAccount__password"] = hashlib.sha256(b"pass").hexdigest()
+        BankAccount.json_save(BankAccount.FILENAME, accounts)
+
+    def stored(self) -> dict:
+        accounts = storage.JsonStorage().load(BankAccount.FILENAME)
+        return accounts["1234567890"]["accounts"]["main"]
+
+    def test_deposit_verifies_before_upgrading_the_password(self):
+        cvv2 = self.account["cvv2"]
+        with self.assertRaises(UnsuccessfulPasswordDeposit):
+            BankAccount.deposit("1234567890", "main", "wrong", cvv2, 1_000)
+        with self.assertRaises(UnsuccessfulCvv2Deposit):
+            BankAccount.deposit("1234567890", "main", "pass", cvv2 + 1, 1_000)
+        self.assertTrue(hashers.outdated(self.stored()["_BankAccount__password"]))
+        BankAccount.deposit("1234567890", "main", "pass", cvv2, 1_000)
+        stored = self.stored()
+        self.assertEqual(stored["_balance"], 51_000)
+        self.assertFalse(hashers.outdated(stored["_BankAccount__password"]))
+        self.assertTrue(hashers.verify("pass", stored["_BankAccount__password"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
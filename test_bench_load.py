@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+import bench_load
+import hashers
+
+
+class TestBenchLoad(unittest.TestCase):
+    """
+    This test class is for testing the load benchmark harness
+    """
+
+    def setUp(self):
+        self.addCleanup(hashers.use, None)
+
+    def test_report(self):
+        handle, output = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.addCleanup(os.remove, output)
+        cwd = os.getcwd()
+        bench_load.main(
+            [
+                "--users", "4", "--films", "1", "--showtimes", "2", "--accounts", "2",
+                "--orders", "10", "--workers", "2", "--hasher", "sha256", "--output", output,
+            ]
+        )
+        self.assertEqual(os.getcwd(), cwd)
+        with open(output, mode="r", encoding="utf-8") as file:
+            report = json.load(file)
+        operations = report["operations"]
+        self.assertEqual(list(operations), list(bench_load.OPERATIONS))
+        for operation in operations.values():
+            self.assertEqual(operation["errors"], 0)
+        self.assertEqual(operations["reserve_ticket"]["calls"], 10)
+        self.assertEqual(operations["add_ticket"]["calls"], 2)
+        latency = operations["deposit"]["latency_ms"]
+        self.assertLessEqual(latency["p50"], latency["p95"])
+        self.assertLessEqual(latency["p95"], latency["p99"])
+
+    def test_summarize(self):
+        summary = bench_load.summarize([(0.001, None), (0.003, "BalanceMinimum")], 0.5, 100)
+        self.assertEqual(summary["calls"], 2)
+        self.assertEqual(summary["error_types"], {"BalanceMinimum": 1})
+        self.assertEqual(summary["throughput"], 4.0)
+        self.assertEqual(summary["bytes_per_call"], 50.0)
+        self.assertEqual(summary["latency_ms"]["p50"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
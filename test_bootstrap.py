@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+import bootstrap
+from human import Admin, Human
+from movie import Film
+from tempdb import DatabaseTestCase
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestBootstrap(DatabaseTestCase):
+    """
+    This test class is for testing lazy loading of our databases
+    """
+
+    def test_import_has_no_side_effects(self):
+        subprocess.run(
+            [sys.executable, "-c", "import main, server"],
+            env=dict(os.environ, PYTHONPATH=HERE),
+            check=True,
+        )
+        self.assertEqual(os.listdir(self.dirpath), ["database"])
+        self.assertEqual(os.listdir("./database"), [])
+
+    def test_scripting_commands_import_lazily(self):
+        modules = ("provision", "reports", "schedule_import", "records")
+        loaded = subprocess.run(
+            [sys.executable, "-c", f"import sys, main; print([m for m in {modules} if m in sys.modules])"],
+            env=dict(os.environ, PYTHONPATH=HERE),
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        self.assertEqual(loaded.strip(), "[]")
+
+    def test_databases_load_once(self):
+        self.assertEqual(bootstrap.films(), {})
+        self.assertTrue(os.path.exists("./database/films.json"))
+        self.assertFalse(os.path.exists("./database/admins.json"))
+        with mock.patch.object(Film, "load_films_from_json") as load:
+            self.assertIs(bootstrap.films(), Film.films)
+        load.assert_not_called()
+        Human.json_save("./database/admins.json", {"admin": {"_username": "admin"}})
+        self.assertIn("admin", bootstrap.admins())
+        self.assertIs(Admin.dictionary, bootstrap.admins())
+
+    def tearDown(self):
+        super().tearDown()
+        Admin.dictionary = {}
+
+
+if __name__ == "__main__":
+    unittest.main()
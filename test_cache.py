@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from cache import DocumentCache
+import storage
+
+
+class TestDocumentCache(unittest.TestCase):
+    """
+    This test class is for testing DocumentCache class/
+    and its use by the JSON storage engine
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.dirpath, "bank_accounts.json")
+        with open(self.filepath, mode="w", encoding="utf-8") as file:
+            json.dump({"a": 1}, file)
+
+    def load(self):
+        with open(self.filepath, mode="r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_hits_and_misses(self):
+        cache = DocumentCache()
+        first = cache.get(self.filepath, self.load)
+        second = cache.get(self.filepath, self.load)
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_reload_after_external_write(self):
+        cache = DocumentCache()
+        cache.get(self.filepath, self.load)
+        with open(self.filepath, mode="w", encoding="utf-8") as file:
+            json.dump({"a": 2, "b": 3}, file)
+        self.assertEqual(cache.get(self.filepath, self.load), {"a": 2, "b": 3})
+        self.assertEqual(cache.misses, 2)
+
+    def test_storage_reads_only_journal_tail(self):
+        accounts = {"1234567890": {"accounts": {"main": {"_balance": 50_000}}}}
+        reader, writer = storage.JsonStorage(), storage.JsonStorage()
+        writer.save(self.filepath, accounts)
+        self.assertEqual(reader.load(self.filepath), accounts)
+        writer.apply(
+            self.filepath,
+            [
+                {
+                    "op": "balance",
+                    "national_id": "1234567890",
+                    "account": "main",
+                    "amount": -1_000,
+                    "balance": 49_000,
+                }
+            ],
+        )
+        loaded = reader.load(self.filepath)
+        self.assertEqual(loaded["1234567890"]["accounts"]["main"]["_balance"], 49_000)
+        self.assertEqual(reader.cache.stats()["hits"], 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.dirpath)
+
+
+if __name__ == "__main__":
+    unittest.main()
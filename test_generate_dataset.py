@@ -0,0 +1,66 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import generate_dataset
+import hashers
+import records
+
+
+class TestGenerateDataset(unittest.TestCase):
+    """
+    This test class is for testing the synthetic dataset generator
+    """
+
+    def setUp(self):
+        hashers.use(hashers.Sha256Hasher())
+        self.addCleanup(hashers.use, None)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def read(self, name, directory=None) -> dict:
+        with open(os.path.join(directory or self.directory, name), mode="r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_schemas_and_links(self):
+        written = generate_dataset.generate(self.directory, users=20, films=3, showtimes=7, clients=5)
+        self.assertEqual(written["users.json"][0], 20)
+        self.assertEqual(written["bank_accounts.json"][0], 5)
+        users = self.read("users.json")
+        clients = self.read("bank_accounts.json")
+        films = self.read("films.json")
+        admins = self.read("admins.json")
+        self.assertEqual(set(admins["admin0"]), {"_username", "_Admin__password", "user_id"})
+        user = users["user0"]
+        self.assertTrue(hashers.verify("secret", user["_User__password"]))
+        self.assertEqual(records.UserRecord.from_dict(user).extra, None)
+        self.assertEqual(user["bank_accounts"], clients["1000000000"]["accounts"])
+        self.assertEqual(users["user5"]["bank_accounts"], {})
+        for client in clients.values():
+            self.assertEqual(records.ClientRecord.from_dict(client).to_dict(), client)
+            for account in client["accounts"].values():
+                self.assertIn("_BankAccount__password", account)
+        film = films["film0"]
+        self.assertEqual(len(film["tickets"]), 7)
+        for key, ticket in film["tickets"].items():
+            self.assertEqual(key, f"{ticket['scene_date']} _ {ticket['showtime']}")
+
+    def test_deterministic(self):
+        other = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other)
+        generate_dataset.generate(self.directory, users=10, films=2, showtimes=3, seed=7)
+        generate_dataset.generate(other, users=10, films=2, showtimes=3, seed=7)
+        for name in ("admins.json", "users.json", "films.json", "bank_accounts.json"):
+            self.assertEqual(self.read(name), self.read(name, other))
+
+    def test_stale_journal_removed(self):
+        journal = os.path.join(self.directory, "films.journal")
+        with open(journal, mode="w", encoding="utf-8") as file:
+            file.write('{"op": "add_film"}\n')
+        generate_dataset.generate(self.directory, users=1, films=1, showtimes=1)
+        self.assertFalse(os.path.exists(journal))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import unittest
+from unittest import mock
+import hashers
+from hashers import Pbkdf2Hasher, ScryptHasher, Sha256Hasher
+
+
+class TestHashers(unittest.TestCase):
+    """
+    This test class is for testing password hashers and hash records
+    """
+
+    def test_records_verify(self):
+        for hasher in (Sha256Hasher(), Pbkdf2Hasher(1_000), ScryptHasher(1 << 10)):
+            record = hasher.encode("matin")
+            self.assertIs(type(hashers.identify(record)), type(hasher))
+            self.assertTrue(hashers.verify("matin", record))
+            self.assertFalse(hashers.verify("matinn", record))
+            self.assertFalse(hasher.outdated(record))
+        hasher = ScryptHasher(1 << 10)
+        self.assertNotEqual(hasher.encode("matin"), hasher.encode("matin"))
+
+    def test_outdated_records(self):
+        legacy = Sha256Hasher().encode("matin")
+        self.assertTrue(ScryptHasher().outdated(legacy))
+        self.assertTrue(ScryptHasher().outdated(ScryptHasher(1 << 10).encode("matin")))
+        self.assertTrue(ScryptHasher().outdated(Pbkdf2Hasher(1_000).encode("matin")))
+        with self.assertRaises(ValueError):
+            hashers.identify("bcrypt$12$abc")
+
+    def test_process_pool(self):
+        record = ScryptHasher(1 << 10).encode("matin")
+        with mock.patch.dict(os.environ, {"CINEMA_HASH_WORKERS": "2"}), mock.patch.object(
+            hashers, "_pool", None
+        ):
+            self.assertTrue(hashers.verify("matin", record))
+            self.assertIsNotNone(hashers._pool)
+            hashers._pool.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
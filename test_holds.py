@@ -0,0 +1,131 @@
+import unittest
+import storage
+from bank_accounts import BankAccount
+from custom_exceptions import HoldError, NoCapacityError
+from holds import HoldSweeper
+from human import User
+from movie import Film, Ticket
+from tempdb import DatabaseTestCase
+
+TICKET_KEY = "2024-01-01 _ 19:00"
+
+
+class TestHoldSweeper(unittest.TestCase):
+    """
+    This test class is for testing HoldSweeper class
+    """
+
+    def test_sweep_groups_expired_holds(self):
+        released = []
+        sweeper = HoldSweeper(lambda *args: released.append(args))
+        sweeper.run = lambda: None
+        sweeper.add(30.0, "film1", "b", "h3")
+        sweeper.add(10.0, "film1", "a", "h1")
+        sweeper.add(20.0, "film1", "a", "h2")
+        self.assertEqual(sweeper.sweep(now=25.0), 2)
+        self.assertEqual(released, [("film1", "a", ["h1", "h2"])])
+        self.assertEqual(len(sweeper), 1)
+
+
+class TestHolds(DatabaseTestCase):
+    """
+    This test class is for testing seat holds of showtimes
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.sweeper = Ticket.sweeper
+        Ticket.sweeper = HoldSweeper(Ticket.release_holds)
+        Ticket.sweeper.run = lambda: None
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 5, 1_000)
+        Ticket.add_ticket("film1", "2024-01-02", "19:00", 6, 1_000, 2, 3)
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 50_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def available(self, ticket_key=TICKET_KEY):
+        films = storage.JsonStorage().load("./database/films.json")
+        return films["film1"]["tickets"][ticket_key]["available_seats"]
+
+    def checkout(self, hold):
+        return User.checkout(hold, "1234567890", "main", "pass", self.cvv2)
+
+    def test_hold_takes_capacity_until_confirmed(self):
+        hold = User.hold_ticket("film1", "2024-01-01", "19:00", 3)
+        self.assertEqual(self.available(), 2)
+        with self.assertRaises(NoCapacityError):
+            User.hold_ticket("film1", "2024-01-01", "19:00", 3)
+        self.assertIsNone(self.checkout(hold))
+        self.assertEqual(self.available(), 2)
+        with self.assertRaises(HoldError):
+            self.checkout(hold)
+        accounts = BankAccount.json_import(BankAccount.FILENAME)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 47_000)
+        self.assertEqual(Ticket.release_holds("film1", TICKET_KEY, [hold["id"]]), 0)
+
+    def test_expired_hold_is_released(self):
+        hold = User.hold_ticket("film1", "2024-01-01", "19:00", 4, ttl=-1)
+        self.assertEqual(self.available(), 1)
+        with self.assertRaises(HoldError):
+            self.checkout(hold)
+        Ticket.sweeper.sweep()
+        self.assertEqual(self.available(), 5)
+        accounts = BankAccount.json_import(BankAccount.FILENAME)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 50_000)
+
+    def test_sales_release_holds_left_by_a_restart(self):
+        User.hold_ticket("film1", "2024-01-01", "19:00", 4, ttl=-1)
+        User.hold_ticket("film1", "2024-01-02", "19:00", 6, ttl=-1)
+        Ticket.sweeper.heap.clear()
+        Ticket.sell_ticket("film1", TICKET_KEY, 5)
+        self.assertEqual(self.available(), 0)
+        order = {
+            "film_name": "film1",
+            "scene_date": "2024-01-02",
+            "showtime": "19:00",
+            "quantity": 6,
+            "national_id": "1234567890",
+            "account_name": "main",
+            "password": "pass",
+            "cvv2": self.cvv2,
+        }
+        self.assertEqual(User.reserve_many([order]), [None])
+        self.assertEqual(self.available("2024-01-02 _ 19:00"), 0)
+
+    def test_reserve_releases_expired_holds(self):
+        User.hold_ticket("film1", "2024-01-01", "19:00", 5, ttl=-1)
+        User.hold_ticket("film1", "2024-01-02", "19:00", 6, ttl=-1)
+        Ticket.sweeper.heap.clear()
+        self.assertEqual(self.available(), 0)
+        User.reserve_ticket("film1", "2024-01-01", "19:00", 5, "1234567890", "main", "pass", self.cvv2)
+        self.assertEqual(self.available(), 0)
+        seats = User.reserve_ticket(
+            "film1", "2024-01-02", "19:00", 6, "1234567890", "main", "pass", self.cvv2
+        )
+        self.assertEqual(len(seats), 6)
+        self.assertEqual(self.available("2024-01-02 _ 19:00"), 0)
+
+    def test_hold_seats(self):
+        hold = User.hold_ticket("film1", "2024-01-02", "19:00", 2)
+        seat_map = Ticket.seat_map("film1", "2024-01-02 _ 19:00")
+        self.assertEqual([seat_map.state(*seat) for seat in hold["seats"]], ["held"] * 2)
+        other = User.hold_ticket("film1", "2024-01-02", "19:00", 2)
+        self.assertFalse(set(hold["seats"]) & set(other["seats"]))
+        User.cancel_hold(other)
+        seats = self.checkout(hold)
+        self.assertEqual(seats, hold["seats"])
+        self.assertEqual(self.available("2024-01-02 _ 19:00"), 4)
+        seat_map = Ticket.seat_map("film1", "2024-01-02 _ 19:00")
+        self.assertEqual([seat_map.state(*seat) for seat in seats], ["sold"] * 2)
+        self.assertEqual([seat_map.state(*seat) for seat in other["seats"]], ["free"] * 2)
+
+    def tearDown(self):
+        super().tearDown()
+        Ticket.sweeper = self.sweeper
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,13 @@
 #! /usr/bin/python3
 
+import copy
 import unittest
+from unittest import mock
 import os
 import shutil
 import pathlib
+import tempfile
+import hashers
 from human import Human, User, Admin
 from custom_exceptions import (
     PasswordError,
@@ -22,18 +26,17 @@ class TestHuman(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.dirpath = "./test_database"
-        cls.filepath = "./test_database/test.json"
-        os.makedirs("./test_database")
+        cls.dirpath = tempfile.mkdtemp()
+        cls.filepath = os.path.join(cls.dirpath, "test.json")
 
     def test_json_create(self):
         """
-        creating a file in test_database directory/
-        and creating test.json to Testing json_create/
+        creating test.json in a temporary directory/
+        to Testing json_create/
         static method in Human Abstract class
         """
-        Human.json_save("./test_database/test.json", {})
-        res = os.path.isfile("./test_database/test.json")
+        Human.json_save(TestHuman.filepath, {})
+        res = os.path.isfile(TestHuman.filepath)
         self.assertEqual(res, True)
 
     def test_json_save_and_import(self):
@@ -80,8 +83,7 @@ class TestHuman(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        mydir = pathlib.Path("./test_database")
-        shutil.rmtree(mydir)
+        shutil.rmtree(TestHuman.dirpath)
 
 
 class TestUser(unittest.TestCase):
@@ -92,9 +94,9 @@ class TestUser(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.dirpath = pathlib.Path("./test_database")
-        os.mkdir(TestUser.dirpath)
-        User.jsonpath = pathlib.Path("./test_database/users.json")
+        cls.dirpath = pathlib.Path(tempfile.mkdtemp())
+        cls.jsonpath = User.jsonpath
+        User.jsonpath = cls.dirpath / "users.json"
         Human.json_save(User.jsonpath, {})
 
     def setUp(self):
@@ -114,6 +116,37 @@ class TestUser(unittest.TestCase):
                      user3.username: user3.__dict__}
         self.assertEqual(User.dictionary, test_dict)
 
+    def test_get_obj_identity(self):
+        self.assertIs(User.get_obj("bavaar", "12345"), self.user1)
+        self.assertIsNone(User.get_obj("nobody", "12345"))
+        User.dictionary = copy.deepcopy(User.dictionary)
+        User.all_usernames.clear()
+        user = User.get_obj("bavaar", "12345")
+        self.assertIsNot(user, self.user1)
+        self.assertIs(User.get_obj("bavaar", "12345"), user)
+        self.assertIs(User.dictionary["bavaar"], user.__dict__)
+
+    def test_sign_in_hydration(self):
+        self.user1.delete_user()
+        User.dictionary = copy.deepcopy(User.dictionary)
+        with mock.patch.object(Human, "json_save") as json_save, mock.patch.object(
+            hashers, "verify", side_effect=hashers.verify
+        ) as verify:
+            user = User.sign_in_validation("bavaar", "12345")
+        json_save.assert_not_called()
+        self.assertEqual(verify.call_count, 1)
+        self.assertIs(user.__dict__, User.dictionary["bavaar"])
+        self.assertTrue(hashers.verify("12345", user.password))
+        self.assertIn("bavaar", User.all_usernames)
+
+    def test_legacy_password_upgrade(self):
+        self.user1.delete_user()
+        User.dictionary["bavaar"]["_User__password"] = Human.hashing("12345")
+        User.sign_in_validation("bavaar", "12345")
+        stored = Human.json_import(User.jsonpath)["bavaar"]["_User__password"]
+        self.assertTrue(stored.startswith("scrypt$"))
+        self.assertTrue(hashers.verify("12345", stored))
+
     def test_sign_in_validation(self):
         with self.assertRaises(UserError):
             User.sign_in_validation("Ali", "123456")
@@ -160,9 +193,10 @@ class TestUser(unittest.TestCase):
             self.user1.password_change("12345", "ma", "ma")
         self.user1.password_change("12345", "matinghane", "matinghane")
         User.dictionary = Human.json_import(User.jsonpath)
-        self.assertEqual(
-            User.dictionary[self.user1.username]["_User__password"],
-            Human.hashing("matinghane"),
+        self.assertTrue(
+            hashers.verify(
+                "matinghane", User.dictionary[self.user1.username]["_User__password"]
+            )
         )
 
     def tearDown(self):
@@ -174,6 +208,7 @@ class TestUser(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TestUser.dirpath)
+        User.jsonpath = TestUser.jsonpath
 
 
 class TestAdmin(unittest.TestCase):
@@ -184,9 +219,9 @@ class TestAdmin(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.dirpath = pathlib.Path("./test_database")
-        os.mkdir(TestAdmin.dirpath)
-        Admin.jsonpath = pathlib.Path("./test_database/admins.json")
+        cls.dirpath = pathlib.Path(tempfile.mkdtemp())
+        cls.jsonpath = Admin.jsonpath
+        Admin.jsonpath = cls.dirpath / "admins.json"
         Human.json_save(Admin.jsonpath, {})
 
     def setUp(self):
@@ -202,6 +237,14 @@ class TestAdmin(unittest.TestCase):
                      admin3.username: admin3.__dict__}
         self.assertEqual(Admin.dictionary, test_dict)
 
+    def test_get_obj_identity(self):
+        self.assertIs(Admin.get_obj("matin", "12345"), self.admin2)
+        Admin.dictionary = copy.deepcopy(Admin.dictionary)
+        Admin.all_usernames.clear()
+        admin = Admin.get_obj("matin", "12345")
+        self.assertIsNot(admin, self.admin2)
+        self.assertIs(Admin.get_obj("matin", "12345"), admin)
+
     def test_sign_in_validation(self):
         with self.assertRaises(UserError):
             Admin.sign_in_validation("ali", "123456")
@@ -239,9 +282,10 @@ class TestAdmin(unittest.TestCase):
             self.admin1.password_change("qwerty", "sa", "sa")
         self.admin1.password_change("qwerty", "saman", "saman")
         Admin.dictionary = Human.json_import(Admin.jsonpath)
-        self.assertEqual(
-            Admin.dictionary[self.admin1.username]["_Admin__password"],
-            Human.hashing("saman"),
+        self.assertTrue(
+            hashers.verify(
+                "saman", Admin.dictionary[self.admin1.username]["_Admin__password"]
+            )
         )
 
     def tearDown(self):
@@ -253,6 +297,7 @@ class TestAdmin(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TestAdmin.dirpath)
+        Admin.jsonpath = TestAdmin.jsonpath
 
 
 def main():
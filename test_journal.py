@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+import unittest
+import storage
+from journal import Journal
+from movie import JSON_FILE, Film, Ticket
+from storage import apply_record
+from tempdb import DatabaseTestCase
+
+
+class TestJournal(unittest.TestCase):
+    """
+    This test class is for testing Journal class/
+    and replaying films changes over a snapshot
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.journal = Journal(os.path.join(self.dirpath, "films.journal"))
+
+    def test_append_and_records(self):
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        self.journal.extend([{"op": "remove_film", "film": "film2"}])
+        self.assertEqual(len(self.journal), 2)
+        self.assertEqual(
+            [record["film"] for record, _ in self.journal.records()], ["film1", "film2"]
+        )
+
+    def test_torn_last_line_skipped(self):
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        with open(self.journal.path, mode="a", encoding="utf-8") as file:
+            file.write('{"op": "remove_fi')
+        self.assertEqual(len(list(self.journal.records())), 1)
+
+    def test_reading_resumes_after_a_broken_line(self):
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        with open(self.journal.path, mode="a", encoding="utf-8") as file:
+            file.write('{"op": "remove_fi\n{"op": "remove_fi')
+        self.journal.append({"op": "remove_film", "film": "film2"})
+        self.assertEqual(
+            [record["film"] for record, _ in self.journal.records()], ["film1", "film2"]
+        )
+        self.assertEqual(len(Journal(self.journal.path)), 2)
+
+    def test_replay_from_an_old_offset_counts_once(self):
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        self.journal.replay({}, apply_record)
+        offset = self.journal.offset
+        self.journal.append({"op": "remove_film", "film": "film2"})
+        self.journal.replay({}, apply_record, offset)
+        self.journal.replay({}, apply_record, offset)
+        self.assertEqual(len(self.journal), 2)
+
+    def test_replay_is_idempotent(self):
+        films = {
+            "film1": {
+                "name": "film1",
+                "genre": "Action",
+                "age_rating": "R",
+                "tickets": {"2024-01-01 _ 19:00": {"available_seats": 10}},
+            }
+        }
+        self.journal.append(
+            {
+                "op": "sell",
+                "film": "film1",
+                "ticket": "2024-01-01 _ 19:00",
+                "quantity": 3,
+                "available_seats": 7,
+            }
+        )
+        self.journal.replay(films, apply_record)
+        self.journal.replay(films, apply_record)
+        self.assertEqual(
+            films["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 7
+        )
+
+    def test_archive_finishes_after_a_crash(self):
+        ledger = os.path.join(self.dirpath, "films.ledger")
+        with open(ledger, mode="w", encoding="utf-8") as file:
+            file.write('{"op":"remove_film","film":"film0"}\n')
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        # crash after the journal was renamed, in the middle of the ledger write
+        size = os.path.getsize(ledger)
+        os.replace(self.journal.path, f"{self.journal.path}.{size}.archive")
+        with open(ledger, mode="a", encoding="utf-8") as file:
+            file.write('{"op":"remove_film","fi')
+        self.journal.append({"op": "remove_film", "film": "film2"})
+        self.journal.archive(ledger)
+        self.assertEqual(
+            [record["film"] for record, _ in Journal(ledger).records()],
+            ["film0", "film1", "film2"],
+        )
+        self.assertEqual(os.listdir(self.dirpath), ["films.ledger"])
+        self.assertEqual(len(self.journal), 0)
+
+    def test_truncate(self):
+        self.journal.append({"op": "remove_film", "film": "film1"})
+        self.journal.truncate()
+        self.assertEqual(len(self.journal), 0)
+        self.assertEqual(list(self.journal.records()), [])
+
+    def tearDown(self):
+        shutil.rmtree(self.dirpath)
+
+
+class TestFilmsJournal(DatabaseTestCase):
+    """
+    This test class is for testing changes of our films/
+    going into the journal instead of films.json
+    """
+
+    def test_changes_are_journaled(self):
+        Film.save_films_to_json(JSON_FILE, {})
+        with open(JSON_FILE, mode="rb") as file:
+            snapshot = file.read()
+        Film.add_film("film1", "Action", "R")
+        Film.add_film("film2", "Drama", "PG")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 10, 1_000)
+        Ticket.sell_ticket("film1", "2024-01-01 _ 19:00", 3)
+        Film.remove_film("film2")
+        with open(JSON_FILE, mode="rb") as file:
+            self.assertEqual(file.read(), snapshot)
+        self.assertEqual(
+            [record["op"] for record, _ in Journal("./database/films.journal").records()],
+            ["add_film", "add_film", "add_ticket", "sell", "remove_film"],
+        )
+        films = storage.JsonStorage().load(JSON_FILE)
+        self.assertEqual(list(films), ["film1"])
+        self.assertEqual(
+            films["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 7
+        )
+
+    def test_duplicate_showtime_is_not_journaled(self):
+        Film.save_films_to_json(JSON_FILE, {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 10, 1_000)
+        Ticket.sell_ticket("film1", "2024-01-01 _ 19:00", 3)
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 20, 2_000)
+        self.assertEqual(
+            [record["op"] for record, _ in Journal("./database/films.journal").records()],
+            ["add_film", "add_ticket", "sell"],
+        )
+        ticket = storage.JsonStorage().load(JSON_FILE)["film1"]["tickets"]["2024-01-01 _ 19:00"]
+        self.assertEqual((ticket["available_seats"], ticket["price"]), (7, 1_000))
+
+
+if __name__ == "__main__":
+    unittest.main()
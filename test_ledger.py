@@ -0,0 +1,74 @@
+import json
+import unittest
+from unittest import mock
+import storage
+from bank_accounts import BankAccount
+from custom_exceptions import BalanceMinimum
+from ledger import Ledger
+from tempdb import DatabaseTestCase
+
+
+class TestLedger(unittest.TestCase):
+    """
+    This test class is for testing Ledger class
+    """
+
+    def test_follows_balance_records(self):
+        accounts = {"1234567890": {"accounts": {"main": {"_balance": 50_000}}}}
+        ledger = Ledger().sync(accounts)
+        self.assertEqual(ledger.balance("1234567890", "main"), 50_000)
+        record = BankAccount.balance_record("1234567890", "main", -1_000, 49_000)
+        ledger.on_record({}, record)
+        self.assertEqual(ledger.balance("1234567890", "main"), 50_000)
+        ledger.on_record(accounts, record)
+        self.assertEqual(ledger.balance("1234567890", "main"), 49_000)
+        self.assertIsNone(ledger.balance("1234567890", "other"))
+        self.assertEqual(len(ledger), 1)
+
+
+class LedgerTests:
+    """
+    Tests of deposits and withdraws through the ledger, shared by every storage engine
+    """
+
+    def setUp(self):
+        super().setUp()
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 50_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def test_balance_table_is_kept_current(self):
+        BankAccount.withdraw("1234567890", "main", "pass", self.cvv2, 5_000)
+        BankAccount.deposit("1234567890", "main", "pass", self.cvv2, 1_000)
+        self.assertEqual(BankAccount.ledger.balance("1234567890", "main"), 46_000)
+        with mock.patch.object(Ledger, "build") as build:
+            BankAccount.withdraw("1234567890", "main", "pass", self.cvv2, 1_000)
+        build.assert_not_called()
+        self.assertEqual(BankAccount.ledger.balance("1234567890", "main"), 45_000)
+        with self.assertRaises(BalanceMinimum):
+            BankAccount.withdraw("1234567890", "main", "pass", self.cvv2, 40_000)
+        loaded = self.make_storage().load(BankAccount.FILENAME)
+        self.assertEqual(loaded["1234567890"]["accounts"]["main"]["_balance"], 45_000)
+
+
+class TestBankAccountLedger(LedgerTests, DatabaseTestCase):
+    def test_checkpoint_keeps_audit_trail(self):
+        BankAccount.withdraw("1234567890", "main", "pass", self.cvv2, 5_000)
+        BankAccount.withdraw("1234567890", "main", "pass", self.cvv2, 1_000)
+        backend = storage.backend()
+        backend.save(BankAccount.FILENAME, backend.load(BankAccount.FILENAME))
+        self.assertEqual(len(backend.journal(BankAccount.FILENAME)), 0)
+        with open("./database/bank_accounts.ledger", encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual([entry["amount"] for entry in entries], [-5_000, -1_000])
+        self.assertEqual(entries[-1]["balance"], 44_000)
+
+
+class TestSQLiteBankAccountLedger(LedgerTests, DatabaseTestCase):
+    def make_storage(self):
+        return storage.SQLiteStorage("./database/cinema.sqlite3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import multiprocessing
+import threading
+import unittest
+import locks
+import storage
+from custom_exceptions import NoCapacityError
+from movie import Film, Ticket
+from tempdb import DatabaseTestCase
+
+TICKET_KEY = "2024-01-01 _ 19:00"
+
+
+def sell_all(results, count):
+    """
+    Try to buy one seat count times and put the number of sold seats in results
+    """
+    sold = 0
+    for _ in range(count):
+        try:
+            Ticket.sell_ticket("film1", TICKET_KEY, 1)
+        except NoCapacityError:
+            continue
+        sold += 1
+    results.put(sold)
+
+
+class TestLocks(DatabaseTestCase):
+    """
+    This test class is for testing showtime locks/
+    between threads and processes
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 30, 50)
+
+    def test_same_slot_is_reentrant(self):
+        with locks.hold("./database/films.json", "film1", TICKET_KEY):
+            with locks.hold("./database/films.json", "film1", TICKET_KEY):
+                pass
+
+    def test_no_oversell_between_threads(self):
+        results = multiprocessing.Queue()
+        threads = [
+            threading.Thread(target=sell_all, args=(results, 10)) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(results.get() for _ in threads), 30)
+        self.assertEqual(
+            Film.load_films()["film1"]["tickets"][TICKET_KEY]["available_seats"], 0
+        )
+
+    @unittest.skipIf(locks.fcntl is None, "fcntl is not available")
+    def test_no_oversell_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(target=sell_all, args=(results, 10)) for _ in range(5)
+        ]
+        for process in processes:
+            process.start()
+        sold = sum(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+        self.assertEqual(sold, 30)
+        self.assertEqual(
+            storage.JsonStorage().load("./database/films.json")["film1"]["tickets"][
+                TICKET_KEY
+            ]["available_seats"],
+            0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
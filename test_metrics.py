@@ -0,0 +1,92 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import urllib.request
+import metrics
+import storage
+
+
+class TestHistogram(unittest.TestCase):
+    """
+    This test class is for testing Histogram class
+    """
+
+    def test_quantiles(self):
+        histogram = metrics.Histogram(buckets=(1.0, 2.0, 4.0))
+        for value in [0.5] * 50 + [1.5] * 49 + [3.0]:
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.0)
+        self.assertTrue(1.0 < histogram.quantile(0.99) <= 2.0)
+        histogram.observe(100.0)
+        self.assertEqual(histogram.quantile(1.0), 4.0)
+        self.assertEqual(metrics.Histogram().quantile(0.5), 0.0)
+
+
+class TestTimed(unittest.TestCase):
+    """
+    This test class is for testing timed operations and their export
+    """
+
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        self.addCleanup(metrics.disable)
+
+    def test_disabled_records_nothing(self):
+        metrics.disable()
+        add = metrics.timed("add")(lambda a, b: a + b)
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(metrics.registry.histograms, {})
+
+    def test_calls_and_errors(self):
+        metrics.enable()
+
+        @metrics.timed("divide")
+        def divide(a, b):
+            return a / b
+
+        divide(1, 2)
+        with self.assertRaises(ZeroDivisionError):
+            divide(1, 0)
+        [(labels, count, p50, p99, errors)] = metrics.registry.report()
+        self.assertEqual(labels, (("operation", "divide"),))
+        self.assertEqual((count, errors), (2, 1))
+        self.assertLessEqual(p50, p99)
+
+    def test_storage_is_labelled_by_document(self):
+        metrics.enable()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "films.json")
+        backend = storage.JsonStorage()
+        backend.save(path, {})
+        backend.load(path)
+        operations = {dict(labels)["operation"]: dict(labels) for labels, *_ in metrics.registry.report()}
+        self.assertEqual(operations["storage_load"]["document"], "films")
+        self.assertIn("storage_save", operations)
+        self.assertIn("storage_write", operations)
+
+    def test_exporter_and_dump(self):
+        metrics.enable()
+        metrics.timed("reserve_ticket")(lambda: None)()
+        server = metrics.serve(0)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            text = response.read().decode("utf-8")
+        self.assertIn("# TYPE cinema_operation_seconds histogram", text)
+        self.assertIn('cinema_operation_seconds_count{operation="reserve_ticket"} 1', text)
+        parsed = metrics.parse(text)
+        self.assertEqual(
+            [row[:2] for row in parsed.report()], [row[:2] for row in metrics.registry.report()]
+        )
+        output = io.StringIO()
+        metrics.dump(output, parsed.report())
+        self.assertIn("reserve_ticket", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
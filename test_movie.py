@@ -2,10 +2,13 @@ import json
 import os
 from custom_exceptions import FilmError, NoCapacityError
 import unittest
+from unittest import mock
+import storage
 from movie import Film, Ticket
+from tempdb import DatabaseTestCase
 
 
-class TestFilm(unittest.TestCase):
+class TestFilm(DatabaseTestCase):
     def test_save_films_to_json(self):
         dictionary = {
             "film1": {
@@ -20,14 +23,12 @@ class TestFilm(unittest.TestCase):
             }
         }
 
-        Film.save_films_to_json(dictionary)
+        Film.save_films_to_json("./database/films.json", dictionary)
         self.assertTrue(os.path.exists("./database/films.json"))
         with open("./database/films.json", mode="r", encoding="utf-8") as file:
             content = json.load(file)
             self.assertEqual(content, dictionary)
 
-        os.remove("./database/films.json")
-
     def test_load_films_from_json(self):
         expected_dictionary = {
             "film1": {
@@ -41,7 +42,7 @@ class TestFilm(unittest.TestCase):
         }
         with open("./database/films.json", mode="w+", encoding="utf-8") as file:
             json.dump(expected_dictionary, file, indent=4)
-        actual_dictionary = Film.load_films_from_json()
+        actual_dictionary = Film.load_films_from_json("./database/films.json")
         self.assertEqual(actual_dictionary, expected_dictionary)
 
     def test_remove_film(self):
@@ -59,7 +60,7 @@ def remove_film(cls, name):
     cls.save_films_to_json(Film.films)
 
 
-class TestTicket(unittest.TestCase):
+class TestTicket(DatabaseTestCase):
     def test_add_ticket(self):
         name = "Ticket1"
         scene_date = "2022-01-01"
@@ -90,6 +91,39 @@ def add_ticket(name, scene_date, showtime, capacity):
     t_obj.delete_film_obj()
 
 
+class TestHydration(DatabaseTestCase):
+    """
+    This test class is for testing that building Film and Ticket/
+    objects from stored records does no disk I/O
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 30, 50)
+
+    def test_get_object_without_io(self):
+        with mock.patch.object(storage.JsonStorage, "save") as save, mock.patch.object(
+            storage.JsonStorage, "apply"
+        ) as apply:
+            film = Film.get_object("film1")
+            ticket = Ticket.get_ticket("film1", "2024-01-01 _ 19:00")
+        save.assert_not_called()
+        apply.assert_not_called()
+        self.assertIs(Film.get_object("film1"), film)
+        self.assertEqual(film.genre, "Action")
+        self.assertIn("2024-01-01 _ 19:00", film.tickets)
+        self.assertEqual(ticket.available_seats, 30)
+        self.assertIsNone(Ticket.get_ticket("film1", "2024-01-02 _ 19:00"))
+
+    def test_add_film_keeps_tickets(self):
+        Film.add_film("film1", "Drama", "PG")
+        films = storage.JsonStorage().load("./database/films.json")
+        self.assertEqual(films["film1"]["genre"], "Action")
+        self.assertIn("2024-01-01 _ 19:00", films["film1"]["tickets"])
+
+
 if __name__ == "__main__":
     unittest.main()
 
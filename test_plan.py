@@ -0,0 +1,50 @@
+import datetime
+import json
+import unittest
+import bootstrap
+from bank_accounts import BankAccount
+from human import User
+from plan import Gold, Silver
+from tempdb import DatabaseTestCase
+
+
+class TestPlans(DatabaseTestCase):
+    """
+    This test class is for testing Silver and Gold plans
+    """
+
+    def setUp(self):
+        super().setUp()
+        bootstrap.users()["sara"] = {"username": "sara", "current_plan": "Bronze", "wallet": 0}
+        BankAccount.create_account("1234567890", "main", "Sara", "Karimi", 200_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def stored(self) -> dict:
+        with open(User.jsonpath, mode="r", encoding="utf-8") as file:
+            return json.load(file)["sara"]
+
+    def test_gold_start_date_is_saved(self):
+        Gold().active("sara", "1234567890", "main", "pass", self.cvv2)
+        stored = self.stored()
+        self.assertEqual(stored["current_plan"], "Gold")
+        datetime.datetime.fromisoformat(stored["start_date"])
+        User.json_save(User.jsonpath, User.dictionary)
+
+    def test_gold_expires(self):
+        Gold().active("sara", "1234567890", "main", "pass", self.cvv2)
+        expired = datetime.datetime.now() - datetime.timedelta(days=31)
+        User.dictionary["sara"]["start_date"] = expired.isoformat()
+        self.assertFalse(Gold().use_plan("sara", 10_000, "1234567890", "main", "pass", self.cvv2))
+        self.assertEqual(self.stored()["current_plan"], "Bronze")
+
+    def test_silver_credit(self):
+        Silver().active("sara", "1234567890", "main", "pass", self.cvv2)
+        Silver().use_plan("sara", 10_000, "1234567890", "main", "pass", self.cvv2)
+        self.assertEqual(self.stored()["credit"], 2)
+        self.assertEqual(self.stored()["wallet"], 2_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
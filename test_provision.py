@@ -0,0 +1,82 @@
+import io
+import json
+import os
+import unittest
+import bootstrap
+import hashers
+import main
+import provision
+import storage
+from bank_accounts import BankAccount, Client
+from human import User
+from tempdb import DatabaseTestCase
+
+MEMBERS = [
+    {"fname": "Sara", "lname": "Karimi", "username": "sara", "password": "secret",
+     "birth_date": "1990-04-01", "phone_number": "09121234567",
+     "accounts": [{"national_id": "0012345678", "account_name": "main", "balance": 50000}]},
+    {"fname": "Omid", "lname": "Alavi", "username": "omid", "password": "secret",
+     "birth_date": "1991-05-02", "phone_number": "09121234568"},
+    {"fname": "Sara", "lname": "Moradi", "username": "sara", "password": "secret",
+     "birth_date": "1992-01-01", "phone_number": "09121234569"},
+    {"fname": "Neda", "lname": "Rahimi", "username": "neda", "password": "abc",
+     "birth_date": "1992-01-01", "phone_number": "09121234569"},
+    {"fname": "Kian", "lname": "Jafari", "username": "kian", "password": "secret",
+     "birth_date": "1993-01-01", "phone_number": "09121234570",
+     "accounts": [{"national_id": "0012345678", "account_name": "main", "balance": 1}]},
+]
+
+
+class TestProvision(DatabaseTestCase):
+    """
+    This test class is for testing bulk provisioning of users and bank accounts
+    """
+
+    def setUp(self):
+        super().setUp()
+        hashers.use(hashers.Sha256Hasher())
+        bootstrap.users()
+
+    def test_jsonl(self):
+        text = "\n".join(json.dumps(member) for member in MEMBERS) + "\nnot json\n"
+        errors = []
+        counts = provision.provision(
+            io.StringIO(text), on_error=lambda line, message: errors.append(line), batch_size=1
+        )
+        self.assertEqual(counts, {"rows": 6, "users": 2, "accounts": 1, "errors": 4})
+        self.assertEqual(errors, [3, 4, 5, 6])
+        users = storage.backend().load("./database/users.json")
+        self.assertEqual(sorted(users), ["omid", "sara"])
+        self.assertEqual(users["sara"]["bank_accounts"]["main"]["_balance"], 50000)
+        clients = storage.backend().load(BankAccount.FILENAME)
+        account = clients["0012345678"]["accounts"]["main"]
+        self.assertTrue(1111 <= account["cvv2"] <= 9999)
+        self.assertEqual(clients["0012345678"]["first_name"], "Sara")
+        User.sign_in_validation("sara", "secret").delete_user()
+        BankAccount.withdraw("0012345678", "main", "secret", account["cvv2"], 20000)
+        self.assertEqual(BankAccount.current_balance(Client.clients_info, "0012345678", "main"), 30000)
+
+    def test_dry_run_and_csv_command(self):
+        rows = [
+            "fname,lname,username,password,birth_date,phone_number,national_id,account_name,balance,account_password",
+            "Sara,Karimi,sara,secret,1990-04-01,09121234567,0012345678,main,50000,cardpin",
+            "Omid,Alavi,omid,secret,1991-05-02,09121234568,,,,",
+        ]
+        counts = provision.provision(io.StringIO("\n".join(rows)), "csv", dry_run=True)
+        self.assertEqual(counts, {"rows": 2, "users": 2, "accounts": 1, "errors": 0})
+        self.assertFalse(os.path.exists(BankAccount.FILENAME))
+        with open("members.csv", mode="w", encoding="utf-8") as file:
+            file.write("\n".join(rows) + "\n")
+        main.main(["provision", "members.csv"])
+        clients = storage.backend().load(BankAccount.FILENAME)
+        record = clients["0012345678"]["accounts"]["main"]["_BankAccount__password"]
+        self.assertTrue(hashers.verify("cardpin", record))
+        self.assertEqual(len(storage.backend().load("./database/users.json")), 2)
+
+    def tearDown(self):
+        super().tearDown()
+        hashers.use(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import storage
+from records import AccountRecord, ClientRecord, FilmRecord, UserRecord
+
+FILMS = {
+    "film1": {
+        "name": "film1",
+        "genre": "Action",
+        "age_rating": "R",
+        "tickets": {
+            "2024-01-01 _ 19:00": {
+                "name": "film1",
+                "scene_date": "2024-01-01",
+                "showtime": "19:00",
+                "available_seats": 10,
+                "price": 1_000,
+            }
+        },
+    }
+}
+USERS = {
+    "bavaar": {
+        "fname": "Matin",
+        "lname": "Ghane",
+        "_username": "bavaar",
+        "_User__password": "hash",
+        "user_id": "id",
+        "_phone_number": None,
+        "birth_date": "1999-11-20",
+        "join_date": "2024-01-01 10:00:00",
+        "current_plan": "Silver",
+        "wallet": 0,
+        "bank_accounts": {},
+        "credit": 3,
+    }
+}
+ACCOUNTS = {
+    "1234567890": {
+        "national_id": "1234567890",
+        "first_name": "Matin",
+        "last_name": "Ghane",
+        "accounts": {
+            "main": {
+                "national_id": "1234567890",
+                "account_name": "main",
+                "_balance": 50_000,
+                "_BankAccount__password": "hash",
+                "creation_date": "2024-01-01T10:00:00",
+                "cvv2": 1234,
+            }
+        },
+    }
+}
+
+
+class TestRecords(unittest.TestCase):
+    """
+    This test class is for testing compact record types
+    """
+
+    def test_round_trip(self):
+        for record_type, document in ((FilmRecord, FILMS), (UserRecord, USERS), (ClientRecord, ACCOUNTS)):
+            for record in document.values():
+                self.assertEqual(record_type.from_dict(record).to_dict(), record)
+
+    def test_fields_and_slots(self):
+        film = FilmRecord.from_dict(FILMS["film1"])
+        self.assertIsInstance(film, FilmRecord)
+        self.assertEqual(film.tickets["2024-01-01 _ 19:00"].key, "2024-01-01 _ 19:00")
+        user = UserRecord.from_dict(USERS["bavaar"])
+        self.assertEqual((user.username, user.extra), ("bavaar", {"credit": 3}))
+        account = ClientRecord.from_dict(ACCOUNTS["1234567890"]).accounts["main"]
+        self.assertIsInstance(account, AccountRecord)
+        self.assertEqual(account.balance, 50_000)
+        self.assertFalse(hasattr(account, "__dict__"))
+
+    def test_interning(self):
+        genre = "".join(["Act", "ion"])
+        first = FilmRecord.from_dict(dict(FILMS["film1"], genre=genre))
+        second = FilmRecord.from_dict(FILMS["film1"])
+        self.assertIs(first.genre, second.genre)
+        users = {"a": {"current_plan": "".join(["Bro", "nze"])}, "b": {"current_plan": "Bronze"}}
+        storage.intern_values("users", users)
+        self.assertIs(users["a"]["current_plan"], users["b"]["current_plan"])
+
+
+if __name__ == "__main__":
+    unittest.main()
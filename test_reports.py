@@ -0,0 +1,81 @@
+import io
+import json
+import unittest
+import bootstrap
+import main
+import reports
+from movie import Film, Ticket
+from tempdb import DatabaseTestCase
+
+
+class TestReports(DatabaseTestCase):
+    """
+    This test class is for testing sales and occupancy reports
+    """
+
+    def setUp(self):
+        super().setUp()
+        bootstrap.films()
+        Film.add_film("Dune", "Sci-Fi", "PG-13")
+        Film.add_film("Heat", "Drama", "R")
+        Ticket.add_ticket("Dune", "2025-03-01", "19:30", 100, 1000)
+        Ticket.add_ticket("Dune", "2025-03-02", "19:30", 20, 2000, 4, 5)
+        Ticket.add_ticket("Heat", "2025-03-01", "21:00", 50, 500)
+        Ticket.sell_ticket("Dune", "2025-03-01 _ 19:30", 30)
+        Ticket.sell_seats("Dune", "2025-03-02 _ 19:30", [(0, 0), (0, 1)])
+        Ticket.hold("Heat", "2025-03-01 _ 21:00", 5)
+        Ticket.sell_ticket("Heat", "2025-03-01 _ 21:00", 10)
+
+    def test_showtimes(self):
+        rows = list(reports.showtimes())
+        self.assertEqual(
+            [(row["film"], row["scene_date"]) for row in rows],
+            [("Dune", "2025-03-01"), ("Heat", "2025-03-01"), ("Dune", "2025-03-02")],
+        )
+        self.assertEqual(rows[0]["sold"], 30)
+        self.assertEqual(rows[0]["revenue"], 30000)
+        self.assertEqual(rows[0]["occupancy"], 0.3)
+        self.assertEqual((rows[1]["sold"], rows[1]["held"]), (10, 5))
+        self.assertEqual((rows[2]["capacity"], rows[2]["sold"]), (20, 2))
+
+    def test_expired_holds_are_available(self):
+        ticket = Film.films["Heat"]["tickets"]["2025-03-01 _ 21:00"]
+        for hold in ticket["holds"].values():
+            hold["expires"] = 0
+        row = reports.showtime_row("Heat", ticket)
+        self.assertEqual((row["sold"], row["held"], row["available_seats"]), (10, 0, 40))
+
+    def test_old_showtime_without_capacity(self):
+        del Film.films["Dune"]["tickets"]["2025-03-02 _ 19:30"]["capacity"]
+        del Film.films["Dune"]["tickets"]["2025-03-01 _ 19:30"]["capacity"]
+        rows = list(reports.showtimes(end="2025-03-03"))
+        self.assertEqual((rows[0]["capacity"], rows[0]["sold"], rows[0]["revenue"]), (None, None, None))
+        self.assertEqual((rows[2]["capacity"], rows[2]["sold"]), (20, 2))
+
+    def test_totals(self):
+        [day] = reports.days("2025-03-01", "2025-03-02")
+        self.assertEqual(
+            day,
+            {
+                "scene_date": "2025-03-01", "showtimes": 2, "capacity": 150, "sold": 40,
+                "held": 5, "revenue": 35000, "occupancy": 0.2667,
+            },
+        )
+        films = {row["film"]: row for row in reports.films(start="2025-03-02")}
+        self.assertEqual(films["Dune"]["sold"], 2)
+        self.assertEqual(films["Heat"]["showtimes"], 0)
+
+    def test_export(self):
+        output = io.StringIO()
+        self.assertEqual(reports.export("film", output, "jsonl"), 2)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(list(lines[0]), list(reports.FIELDS["film"]))
+        main.main(["report", "showtime", "--output", "showtimes.csv"])
+        with open("showtimes.csv", mode="r", encoding="utf-8") as file:
+            text = file.read().splitlines()
+        self.assertEqual(text[0], ",".join(reports.FIELDS["showtime"]))
+        self.assertEqual(len(text), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest import mock
+import storage
+from bank_accounts import BankAccount
+from custom_exceptions import (
+    BalanceMinimum,
+    FilmError,
+    NoCapacityError,
+    UnsuccessfulCvv2Deposit,
+)
+from human import User
+from movie import Film, Ticket
+from tempdb import DatabaseTestCase
+
+
+class TestReserveMany(DatabaseTestCase):
+    """
+    This test class is for testing batch reservation/
+    with User.reserve_many
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 5, 1_000)
+        Ticket.add_ticket("film1", "2024-01-02", "19:00", 100, 6_000)
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 20_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def order(self, **changes):
+        order = {
+            "film_name": "film1",
+            "scene_date": "2024-01-01",
+            "showtime": "19:00",
+            "quantity": 2,
+            "national_id": "1234567890",
+            "account_name": "main",
+            "password": "pass",
+            "cvv2": self.cvv2,
+        }
+        order.update(changes)
+        return order
+
+    def test_reserve_many(self):
+        orders = [
+            self.order(),
+            self.order(film_name="film2"),
+            self.order(cvv2=0),
+            self.order(quantity=4),
+            self.order(quantity=3),
+            self.order(scene_date="2024-01-02", quantity=1),
+        ]
+        with mock.patch.object(
+            storage.JsonStorage, "apply", autospec=True, side_effect=storage.JsonStorage.apply
+        ) as apply:
+            results = User.reserve_many(orders)
+        self.assertEqual(
+            [type(result) for result in results],
+            [
+                type(None),
+                FilmError,
+                UnsuccessfulCvv2Deposit,
+                NoCapacityError,
+                type(None),
+                BalanceMinimum,
+            ],
+        )
+        self.assertEqual(apply.call_count, 2)
+        films = storage.JsonStorage().load("./database/films.json")
+        accounts = storage.JsonStorage().load(BankAccount.FILENAME)
+        self.assertEqual(films["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 0)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 15_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import datetime
+import unittest
+import storage
+from movie import Film, Ticket
+from schedule import ShowtimeIndex
+from tempdb import DatabaseTestCase
+
+
+def ticket(scene_date, showtime, available_seats=10):
+    return {
+        "scene_date": scene_date,
+        "showtime": showtime,
+        "available_seats": available_seats,
+        "price": 50,
+    }
+
+
+FILMS = {
+    "film1": {
+        "tickets": {
+            "2024-01-01 _ 19:00": ticket("2024-01-01", "19:00"),
+            "2024-01-02 _ 21:00": ticket("2024-01-02", "21:00", 0),
+        }
+    },
+    "film2": {
+        "tickets": {
+            "2024-01-01 _ 17:30": ticket("2024-01-01", "17:30"),
+            "2024-01-03 _ 12:00": ticket("2024-01-03", "12:00"),
+        }
+    },
+}
+
+
+class TestShowtimeIndex(unittest.TestCase):
+    """
+    This test class is for testing ShowtimeIndex queries
+    """
+
+    def setUp(self):
+        self.index = ShowtimeIndex().sync(FILMS)
+
+    def keys(self, shows):
+        return [(show.film, show.ticket_key) for show in shows]
+
+    def test_between(self):
+        shows = self.index.between("2024-01-01 18:00", datetime.datetime(2024, 1, 3))
+        self.assertEqual(self.keys(shows), [("film1", "2024-01-01 _ 19:00")])
+        shows = self.index.between("2024-01-01 00:00", "2024-01-04 00:00", available=False)
+        self.assertEqual(len(shows), 4)
+        self.assertEqual(shows[0].showtime, "17:30")
+
+    def test_upcoming(self):
+        after = datetime.datetime(2024, 1, 1, 18, 0)
+        self.assertEqual(
+            self.keys(self.index.upcoming(after=after)),
+            [("film1", "2024-01-01 _ 19:00"), ("film2", "2024-01-03 _ 12:00")],
+        )
+        self.assertEqual(
+            self.keys(self.index.upcoming(1, after="2024-01-01 00:00")),
+            [("film2", "2024-01-01 _ 17:30")],
+        )
+        self.assertEqual(
+            self.keys(self.index.upcoming(after=after, film_name="film2")),
+            [("film2", "2024-01-03 _ 12:00")],
+        )
+
+    def test_remove_film(self):
+        self.index.remove_film("film2")
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.upcoming(after="2024-01-01 00:00", film_name="film2"), [])
+
+
+class TestFilmSchedule(DatabaseTestCase):
+    """
+    This test class is for testing that Film.schedule follows our films
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Film.add_film("film2", "Drama", "PG")
+        Ticket.add_ticket("film1", "2024-01-02", "19:00", 2, 50)
+
+    def test_incremental_updates(self):
+        index = Film.schedule()
+        Ticket.add_ticket("film2", "2024-01-01", "19:00", 5, 50)
+        Ticket.sell_ticket("film1", "2024-01-02 _ 19:00", 2)
+        after = "2024-01-01 00:00"
+        self.assertIs(Film.schedule(), index)
+        self.assertEqual(
+            [show.film for show in index.upcoming(after=after, available=False)],
+            ["film2", "film1"],
+        )
+        self.assertEqual([show.film for show in index.upcoming(after=after)], ["film2"])
+        films = Film.films
+        other = storage.JsonStorage()
+        other.apply(
+            "./database/films.json",
+            [
+                Ticket.sale_record("film2", "2024-01-01 _ 19:00", 1, 4),
+                {"op": "remove_film", "film": "film1"},
+            ],
+        )
+        Film.refresh()
+        self.assertIs(Film.films, films)
+        self.assertEqual(
+            [(show.film, show.available_seats) for show in Film.schedule().upcoming(after=after)],
+            [("film2", 4)],
+        )
+        Film.remove_film("film2")
+        self.assertEqual(len(Film.schedule()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
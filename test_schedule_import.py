@@ -0,0 +1,65 @@
+import io
+import unittest
+import bootstrap
+import main
+import schedule_import
+import storage
+from movie import Film, JSON_FILE
+from tempdb import DatabaseTestCase
+
+CSV = """film,genre,age_rating,scene_date,showtime,capacity,price,rows,cols
+Dune,Sci-Fi,PG-13,2025-3-1,9:30,100,150000,10,10
+Dune,,,2025-03-02,19:30,80,150000,,
+Heat,,,2025-03-02,19:30,80,150000,,
+Dune,,,2025-03-01,09:30,80,150000,,
+Dune,,,2025-02-30,19:30,80,150000,,
+Dune,,,2025-03-03,25:00,80,150000,,
+Dune,,,2025-03-03,19:30,,150000,,
+Dune,,,2025-03-03,19:30,90,150000,10,10
+Dune,,,2025-03-04,19:30,,150000,5,10
+"""
+
+
+class TestScheduleImport(DatabaseTestCase):
+    """
+    This test class is for testing the CSV import of films and showtimes
+    """
+
+    def setUp(self):
+        super().setUp()
+        bootstrap.films()
+
+    def test_import(self):
+        errors = []
+        counts = schedule_import.import_schedule(
+            io.StringIO(CSV), lambda line, message: errors.append(line)
+        )
+        self.assertEqual(counts, {"rows": 9, "films": 1, "showtimes": 3, "errors": 6})
+        self.assertEqual(errors, [4, 5, 6, 7, 8, 9])
+        stored = storage.backend().load(JSON_FILE)
+        tickets = stored["Dune"]["tickets"]
+        self.assertEqual(
+            sorted(tickets), ["2025-03-01 _ 09:30", "2025-03-02 _ 19:30", "2025-03-04 _ 19:30"]
+        )
+        self.assertEqual(tickets["2025-03-01 _ 09:30"]["seat_map"]["rows"], 10)
+        self.assertEqual(tickets["2025-03-04 _ 19:30"]["available_seats"], 50)
+        self.assertEqual(stored["Dune"]["genre"], "Sci-Fi")
+        self.assertEqual(len(Film.schedule().upcoming(after="2025-01-01 00:00", film_name="Dune")), 3)
+
+    def test_dry_run_and_command(self):
+        counts = schedule_import.import_schedule(io.StringIO(CSV), dry_run=True)
+        self.assertEqual(counts["showtimes"], 3)
+        self.assertEqual(Film.films, {})
+        with open("schedule.csv", mode="w", encoding="utf-8") as file:
+            file.write(CSV)
+        with self.assertRaises(SystemExit):
+            main.main(["import-schedule", "schedule.csv"])
+        self.assertEqual(len(storage.backend().load(JSON_FILE)["Dune"]["tickets"]), 3)
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            schedule_import.import_schedule(io.StringIO("film,showtime\nDune,19:30\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import storage
+from bank_accounts import BankAccount
+from custom_exceptions import SeatError, NoCapacityError
+from human import User
+from movie import Film, Ticket
+from seatmap import SeatMap
+from tempdb import DatabaseTestCase
+
+
+class TestSeatMap(unittest.TestCase):
+    """
+    This test class is for testing SeatMap class
+    """
+
+    def test_best_available_prefers_centre(self):
+        seat_map = SeatMap(4, 10)
+        self.assertEqual(seat_map.best_available(4), [(2, 3), (2, 4), (2, 5), (2, 6)])
+        self.assertIsNone(seat_map.best_available(11))
+
+    def test_best_available_skips_taken_seats(self):
+        seat_map = SeatMap(1, 10)
+        seat_map.commit([(0, 4)])
+        seat_map.hold([(0, 7)])
+        self.assertEqual(seat_map.best_available(3), [(0, 1), (0, 2), (0, 3)])
+        self.assertIsNone(seat_map.best_available(5))
+        self.assertEqual(len(seat_map.best_seats(5)), 5)
+
+    def test_hold_commit_release(self):
+        seat_map = SeatMap(2, 3)
+        seat_map.hold([(0, 0), (0, 1)])
+        self.assertEqual(seat_map.state(0, 0), "held")
+        with self.assertRaises(SeatError):
+            seat_map.hold([(0, 1)])
+        with self.assertRaises(SeatError):
+            seat_map.commit([(0, 0)])
+        seat_map.commit([(0, 0)], held=True)
+        seat_map.release([(0, 1)])
+        self.assertEqual(seat_map.state(0, 0), "sold")
+        self.assertEqual(seat_map.state(0, 1), "free")
+        self.assertEqual(seat_map.free_count(), 5)
+
+    def test_record_round_trip(self):
+        seat_map = SeatMap(3, 9)
+        seat_map.commit([(1, 8), (2, 0)])
+        loaded = SeatMap.from_record(seat_map.to_record())
+        self.assertEqual(loaded.state(1, 8), "sold")
+        self.assertEqual(loaded.state(2, 0), "sold")
+        self.assertEqual(loaded.free_count(), 25)
+
+
+class TestSeatReservation(DatabaseTestCase):
+    """
+    This test class is for testing reservation of showtimes with a seat map
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 12, 1_000, 3, 4)
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 50_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def reserve(self, quantity, seats=None):
+        return User.reserve_ticket(
+            "film1", "2024-01-01", "19:00", quantity,
+            "1234567890", "main", "pass", self.cvv2, seats,
+        )
+
+    def test_reserve_seats(self):
+        self.assertEqual(self.reserve(2), [(1, 1), (1, 2)])
+        self.assertEqual(self.reserve(0, [(0, 0)]), [(0, 0)])
+        with self.assertRaises(SeatError):
+            self.reserve(0, [(0, 0)])
+        with self.assertRaises(NoCapacityError):
+            self.reserve(10)
+        ticket = storage.JsonStorage().load("./database/films.json")["film1"]["tickets"][
+            "2024-01-01 _ 19:00"
+        ]
+        self.assertEqual(ticket["available_seats"], 9)
+        stored = SeatMap.from_record(ticket["seat_map"])
+        self.assertEqual(stored.state(1, 1), "sold")
+        self.assertEqual(stored.state(0, 0), "sold")
+        accounts = BankAccount.json_import(BankAccount.FILENAME)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 47_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
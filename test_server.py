@@ -0,0 +1,132 @@
+import asyncio
+import json
+import unittest
+import storage
+from http import HTTPStatus
+from custom_exceptions import HoldError, SeatError
+from human import Human, User
+from movie import Film, Ticket
+from server import TicketServer, error_status
+from tempdb import DatabaseTestCase
+
+
+async def request(reader, writer, method, path, payload=None):
+    """
+    Send one request over an open connection and return (status, body)
+    """
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    return status, json.loads(await reader.readexactly(length))
+
+
+class TestErrorStatus(unittest.TestCase):
+    """
+    This test class is for testing error_status function
+    """
+
+    def test_subclasses_get_the_status_of_their_base(self):
+        class SeatTaken(SeatError):
+            pass
+
+        self.assertEqual(error_status(SeatTaken()), HTTPStatus.CONFLICT)
+        self.assertEqual(error_status(HoldError()), HTTPStatus.CONFLICT)
+        self.assertEqual(error_status(ValueError()), HTTPStatus.BAD_REQUEST)
+
+
+class TestTicketServer(DatabaseTestCase):
+    """
+    This test class is for testing TicketServer endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        Film.save_films_to_json("./database/films.json", {})
+        Film.add_film("film1", "Action", "R")
+        Ticket.add_ticket("film1", "2024-01-01", "19:00", 30, 50)
+        Human.json_save(User.jsonpath, {})
+        User.signup("Matin", "Ghane", "bavaar", "12345", "1999-11-20", "09197951537")
+
+    def test_keep_alive_requests(self):
+        async def scenario():
+            server = TicketServer(port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            tickets = await request(reader, writer, "GET", "/tickets")
+            wrong = await request(
+                reader, writer, "POST", "/sign-in",
+                {"username": "bavaar", "password": "wrong"},
+            )
+            signed_in = await request(
+                reader, writer, "POST", "/sign-in",
+                {"username": "bavaar", "password": "12345"},
+            )
+            reserve = await request(
+                reader, writer, "POST", "/reserve",
+                {"film_name": "film1", "scene_date": "2024-01-01", "showtime": "19:00"},
+            )
+            missing = await request(reader, writer, "GET", "/nothing")
+            signed_out = await request(
+                reader, writer, "POST", "/sign-out", {"token": signed_in[1]["token"]}
+            )
+            writer.close()
+            server.close()
+            return tickets, wrong, signed_in, reserve, missing, signed_out
+
+        tickets, wrong, signed_in, reserve, missing, signed_out = asyncio.run(scenario())
+        self.assertEqual(tickets, (200, {"film1": ["2024-01-01 _ 19:00"]}))
+        self.assertEqual(wrong[0], 401)
+        self.assertEqual(signed_in[0], 200)
+        self.assertEqual(signed_in[1]["user"]["username"], "bavaar")
+        self.assertEqual(reserve[0], 400)
+        self.assertEqual(missing[0], 404)
+        self.assertEqual(signed_out[0], 200)
+        self.assertNotIn("bavaar", User.all_usernames)
+
+    def test_tickets_follow_other_processes(self):
+        record = {
+            "name": "film1",
+            "scene_date": "2023-12-31",
+            "showtime": "21:00",
+            "available_seats": 30,
+            "price": 50,
+            "capacity": 30,
+        }
+        storage.JsonStorage().apply(
+            "./database/films.json",
+            [{"op": "add_ticket", "film": "film1", "ticket": "2023-12-31 _ 21:00", "record": record}],
+        )
+        self.assertEqual(
+            TicketServer().tickets({}),
+            {"film1": ["2023-12-31 _ 21:00", "2024-01-01 _ 19:00"]},
+        )
+
+    def test_negative_content_length(self):
+        async def scenario():
+            server = TicketServer(port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"POST /sign-in HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            server.close()
+            return response
+
+        response = asyncio.run(scenario())
+        self.assertTrue(response.startswith(b"HTTP/1.1 400 "))
+        self.assertIn(b"Invalid Content-Length.", response)
+
+    def tearDown(self):
+        super().tearDown()
+        User.all_usernames.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+import hashers
+from bank_accounts import BankAccount
+from custom_exceptions import SessionError, UnsuccessfulPasswordDeposit
+from sessions import PaymentSessions
+from tempdb import DatabaseTestCase
+
+
+class TestPaymentSessions(unittest.TestCase):
+    """
+    This test class is for testing PaymentSessions class
+    """
+
+    def test_expiry_and_close(self):
+        sessions = PaymentSessions(ttl=60)
+        token = sessions.open("1234567890", "main", now=0.0)
+        sessions.check(token, "1234567890", "main", now=30.0)
+        with self.assertRaises(SessionError):
+            sessions.check(token, "1234567890", "other", now=30.0)
+        with self.assertRaises(SessionError):
+            sessions.check(token, "1234567890", "main", now=60.0)
+        self.assertEqual(len(sessions), 0)
+        token = sessions.open("1234567890", "main", now=0.0)
+        sessions.close(token)
+        with self.assertRaises(SessionError):
+            sessions.check(token, "1234567890", "main", now=1.0)
+
+    def test_expired_sessions_are_purged(self):
+        sessions = PaymentSessions(ttl=1)
+        for _ in range(64):
+            sessions.open("1234567890", "main", now=0.0)
+        sessions.open("1234567890", "main", now=5.0)
+        self.assertEqual(len(sessions), 1)
+
+
+class TestSessionWithdraw(DatabaseTestCase):
+    """
+    This test class is for testing withdraws paid with a payment session
+    """
+
+    def setUp(self):
+        super().setUp()
+        BankAccount.create_account("1234567890", "main", "Matin", "Ghane", 50_000, "pass")
+        self.cvv2 = BankAccount.json_import(BankAccount.FILENAME)["1234567890"][
+            "accounts"
+        ]["main"]["cvv2"]
+
+    def test_withdraw_skips_verification(self):
+        with self.assertRaises(UnsuccessfulPasswordDeposit):
+            BankAccount.open_session("1234567890", "main", "wrong", self.cvv2)
+        session = BankAccount.open_session("1234567890", "main", "pass", self.cvv2)
+        with mock.patch.object(hashers, "verify") as verify:
+            BankAccount.withdraw("1234567890", "main", None, None, 1_000, session)
+            BankAccount.withdraw("1234567890", "main", None, None, 1_000, session)
+        verify.assert_not_called()
+        self.assertEqual(BankAccount.ledger.balance("1234567890", "main"), 48_000)
+        BankAccount.close_session(session)
+        with self.assertRaises(SessionError):
+            BankAccount.withdraw("1234567890", "main", None, None, 1_000, session)
+
+
+if __name__ == "__main__":
+    unittest.main()
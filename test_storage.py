@@ -0,0 +1,218 @@
+import copy
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import storage
+from custom_exceptions import BalanceMinimum, NoCapacityError, HoldError
+
+
+FILMS = {
+    "film1": {
+        "name": "film1",
+        "genre": "Action",
+        "age_rating": "R",
+        "tickets": {
+            "2024-01-01 _ 19:00": {
+                "name": "film1",
+                "scene_date": "2024-01-01",
+                "showtime": "19:00",
+                "available_seats": 10,
+                "price": 50,
+            }
+        },
+    }
+}
+
+ACCOUNTS = {
+    "1234567890": {
+        "national_id": "1234567890",
+        "first_name": "Matin",
+        "last_name": "Ghane",
+        "accounts": {
+            "main": {
+                "national_id": "1234567890",
+                "account_name": "main",
+                "_balance": 50_000,
+                "_BankAccount__password": "hash",
+                "creation_date": "2024-01-01T00:00:00",
+                "cvv2": 1234,
+            }
+        },
+    }
+}
+
+SELL = {
+    "op": "sell",
+    "film": "film1",
+    "ticket": "2024-01-01 _ 19:00",
+    "quantity": 4,
+    "available_seats": 6,
+}
+
+HOLD = {
+    "op": "hold",
+    "film": "film1",
+    "ticket": "2024-01-01 _ 19:00",
+    "hold": "h1",
+    "quantity": 3,
+    "expires": 1_700_000_000.0,
+    "available_seats": 7,
+}
+
+DEBIT = {
+    "op": "balance",
+    "national_id": "1234567890",
+    "account": "main",
+    "amount": -20_000,
+    "balance": 30_000,
+    "minimum": 10_000,
+}
+
+
+class StorageTests:
+    """
+    Tests shared by every storage engine
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.films_path = os.path.join(self.dirpath, "films.json")
+        self.accounts_path = os.path.join(self.dirpath, "bank_accounts.json")
+        self.storage = self.make_storage()
+
+    def test_save_and_load(self):
+        self.assertFalse(self.storage.exists(self.films_path))
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.assertTrue(self.storage.exists(self.films_path))
+        self.assertEqual(self.storage.load(self.films_path), FILMS)
+        self.storage.save(self.accounts_path, copy.deepcopy(ACCOUNTS))
+        self.assertEqual(self.storage.load(self.accounts_path), ACCOUNTS)
+
+    def test_apply_records(self):
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.storage.save(self.accounts_path, copy.deepcopy(ACCOUNTS))
+        self.storage.apply(self.films_path, [SELL])
+        self.storage.apply(self.accounts_path, [DEBIT])
+        films = self.storage.load(self.films_path)
+        accounts = self.storage.load(self.accounts_path)
+        self.assertEqual(
+            films["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 6
+        )
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 30_000)
+        self.storage.apply(self.films_path, [{"op": "remove_film", "film": "film1"}])
+        self.assertEqual(self.storage.load(self.films_path), {})
+
+    def test_hold_records(self):
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.storage.apply(
+            self.films_path,
+            [HOLD, dict(HOLD, hold="h2", quantity=2, available_seats=5)],
+        )
+        ticket = self.storage.load(self.films_path)["film1"]["tickets"]["2024-01-01 _ 19:00"]
+        self.assertEqual(ticket["available_seats"], 5)
+        self.assertEqual(set(ticket["holds"]), {"h1", "h2"})
+        self.storage.apply(
+            self.films_path,
+            [
+                dict(SELL, quantity=3, available_seats=5, hold="h1"),
+                {
+                    "op": "release",
+                    "film": "film1",
+                    "ticket": "2024-01-01 _ 19:00",
+                    "holds": ["h1", "h2"],
+                    "quantity": 2,
+                    "available_seats": 7,
+                },
+            ],
+        )
+        ticket = self.storage.load(self.films_path)["film1"]["tickets"]["2024-01-01 _ 19:00"]
+        self.assertEqual(ticket["available_seats"], 7)
+        self.assertEqual(ticket["holds"], {})
+
+    def tearDown(self):
+        if hasattr(self.storage, "close"):
+            self.storage.close()
+        shutil.rmtree(self.dirpath)
+
+
+class TestJsonStorage(StorageTests, unittest.TestCase):
+    def make_storage(self):
+        return storage.JsonStorage()
+
+    def test_checkpoint(self):
+        self.storage.CHECKPOINT_EVERY = 2
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.storage.apply(self.films_path, [SELL, SELL])
+        self.assertEqual(len(self.storage.journal(self.films_path)), 0)
+        self.assertEqual(
+            storage.JsonStorage().load(self.films_path)["film1"]["tickets"][
+                "2024-01-01 _ 19:00"
+            ]["available_seats"],
+            6,
+        )
+
+    def test_load_during_checkpoint(self):
+        reader = storage.JsonStorage()
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.storage.apply(self.films_path, [SELL])
+        reader.load(self.films_path)
+        journal = self.storage.journal(self.films_path)
+        truncate = journal.truncate
+        loading = threading.Thread(target=reader.load, args=(self.films_path,))
+
+        def checkpoint_window():
+            loading.start()
+            loading.join(0.2)
+            truncate()
+
+        journal.truncate = checkpoint_window
+        self.storage.save(self.films_path, self.storage.load(self.films_path))
+        journal.truncate = truncate
+        loading.join()
+        self.storage.apply(self.films_path, [dict(SELL, quantity=1, available_seats=5)])
+        ticket = reader.load(self.films_path)["film1"]["tickets"]["2024-01-01 _ 19:00"]
+        self.assertEqual(ticket["available_seats"], 5)
+
+
+class TestSQLiteStorage(StorageTests, unittest.TestCase):
+    def make_storage(self):
+        return storage.SQLiteStorage(os.path.join(self.dirpath, "cinema.sqlite3"))
+
+    def test_row_level_guards(self):
+        self.storage.save(self.films_path, copy.deepcopy(FILMS))
+        self.storage.save(self.accounts_path, copy.deepcopy(ACCOUNTS))
+        with self.assertRaises(NoCapacityError):
+            self.storage.apply(self.films_path, [dict(SELL, quantity=11)])
+        with self.assertRaises(BalanceMinimum):
+            self.storage.apply(self.accounts_path, [dict(DEBIT, amount=-45_000)])
+        with self.assertRaises(HoldError):
+            self.storage.apply(self.films_path, [dict(SELL, hold="h1")])
+        self.assertEqual(self.storage.load(self.films_path), FILMS)
+        self.assertEqual(self.storage.load(self.accounts_path), ACCOUNTS)
+
+    def test_loaded_documents_are_kept(self):
+        self.storage.save(self.accounts_path, copy.deepcopy(ACCOUNTS))
+        accounts = self.storage.load(self.accounts_path)
+        self.storage.apply(self.accounts_path, [DEBIT])
+        self.assertIs(self.storage.load(self.accounts_path), accounts)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 30_000)
+        other = storage.SQLiteStorage(self.storage.filename)
+        other.apply(self.accounts_path, [dict(DEBIT, amount=-5_000, balance=25_000)])
+        other.close()
+        accounts = self.storage.load(self.accounts_path)
+        self.assertEqual(accounts["1234567890"]["accounts"]["main"]["_balance"], 25_000)
+
+    def test_migrate(self):
+        source = storage.JsonStorage()
+        source.save(self.films_path, copy.deepcopy(FILMS))
+        source.save(self.accounts_path, copy.deepcopy(ACCOUNTS))
+        migrated = storage.migrate(self.dirpath, self.storage)
+        self.assertEqual(migrated, ["films", "bank_accounts"])
+        self.assertEqual(self.storage.load(self.films_path), FILMS)
+        self.assertEqual(self.storage.load(self.accounts_path), ACCOUNTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
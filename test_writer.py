@@ -0,0 +1,232 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import storage
+from writer import GroupCommit, WriteBehind, atomic_write
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SELL = {
+    "op": "sell",
+    "film": "film1",
+    "ticket": "2024-01-01 _ 19:00",
+    "quantity": 1,
+    "available_seats": 9,
+}
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """
+    This test class is for testing atomic_write function
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.path = os.path.join(self.dirpath, "users.json")
+
+    def test_replaces_file(self):
+        atomic_write(self.path, "old")
+        atomic_write(self.path, "new")
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "new")
+        self.assertEqual(os.listdir(self.dirpath), ["users.json"])
+
+    def tearDown(self):
+        shutil.rmtree(self.dirpath)
+
+
+class TestWriteBehind(unittest.TestCase):
+    """
+    This test class is for testing WriteBehind class
+    """
+
+    def setUp(self):
+        self.written = []
+        self.writer = WriteBehind(
+            lambda path, dictionary: self.written.append((path, dict(dictionary))),
+            interval=60,
+            max_changes=3,
+        )
+        self.writer.run = lambda: None
+
+    def test_coalesces_marks(self):
+        document = {"a": 1}
+        self.writer.mark("users", "users.json", document)
+        document["a"] = 2
+        self.writer.mark("users", "users.json", document)
+        now = time.monotonic()
+        self.assertAlmostEqual(self.writer.due(now), 60, delta=1)
+        self.writer.flush(now=now + 1)
+        self.assertEqual(self.written, [])
+        self.writer.flush()
+        self.assertEqual(self.written, [("users.json", {"a": 2})])
+        self.assertIsNone(self.writer.get("users"))
+
+    def test_flushes_after_max_changes(self):
+        for number in range(3):
+            self.writer.mark("users", "users.json", {"a": number})
+        self.assertEqual(self.writer.due(time.monotonic()), 0)
+        self.writer.flush(now=time.monotonic())
+        self.assertEqual(self.written, [("users.json", {"a": 2})])
+
+    def tearDown(self):
+        self.writer.close()
+
+
+class TestGroupCommit(unittest.TestCase):
+    """
+    This test class is for testing GroupCommit class
+    """
+
+    def test_waiting_callers_share_one_commit(self):
+        batches, started, release = [], threading.Event(), threading.Event()
+
+        def commit(items):
+            batches.append(list(items))
+            started.set()
+            release.wait()
+
+        group = GroupCommit(commit)
+        threads = [threading.Thread(target=group.submit, args=(0,))]
+        threads[0].start()
+        started.wait()
+        threads += [threading.Thread(target=group.submit, args=(n,)) for n in range(1, 6)]
+        for thread in threads[1:]:
+            thread.start()
+        while group.batch is None or len(group.batch.items) < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(batches[0], [0])
+        self.assertEqual(sorted(batches[1]), [1, 2, 3, 4, 5])
+        self.assertEqual(group.commits, 2)
+
+    def test_errors_reach_every_caller(self):
+        def commit(items):
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            GroupCommit(commit).submit(1)
+
+
+class TestFinancialStorage(unittest.TestCase):
+    """
+    This test class is for testing group commits of bank accounts
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.path = os.path.join(self.dirpath, "bank_accounts.json")
+        self.storage = storage.JsonStorage()
+
+    def test_concurrent_debits_are_all_stored(self):
+        accounts = {
+            str(number): {"accounts": {"main": {"_balance": 100}}} for number in range(20)
+        }
+        self.storage.save(self.path, accounts)
+        threads = [
+            threading.Thread(
+                target=self.storage.apply,
+                args=(
+                    self.path,
+                    [
+                        {
+                            "op": "balance",
+                            "national_id": str(number),
+                            "account": "main",
+                            "amount": -10,
+                            "balance": 90,
+                        }
+                    ],
+                ),
+            )
+            for number in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.storage.journal(self.path)), 20)
+        self.assertLessEqual(self.storage.group(self.path).commits, 21)
+        loaded = storage.JsonStorage().load(self.path)
+        self.assertTrue(
+            all(client["accounts"]["main"]["_balance"] == 90 for client in loaded.values())
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dirpath)
+
+
+class TestWriteBehindStorage(unittest.TestCase):
+    """
+    This test class is for testing JsonStorage with write-behind saves
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.films_path = os.path.join(self.dirpath, "films.json")
+        self.accounts_path = os.path.join(self.dirpath, "bank_accounts.json")
+        self.storage = storage.JsonStorage(write_behind=True, interval=60)
+        self.storage.write_behind.run = lambda: None
+
+    def test_save_is_deferred(self):
+        films = {"film1": {"tickets": {"2024-01-01 _ 19:00": {"available_seats": 10}}}}
+        self.storage.save(self.films_path, films)
+        self.assertFalse(os.path.exists(self.films_path))
+        self.assertTrue(self.storage.exists(self.films_path))
+        self.assertIs(self.storage.load(self.films_path), films)
+        self.storage.apply(self.films_path, [SELL])
+        self.storage.load(self.films_path)
+        self.storage.flush()
+        self.assertEqual(len(self.storage.journal(self.films_path)), 0)
+        with open(self.films_path, encoding="utf-8") as file:
+            saved = json.load(file)
+        self.assertEqual(saved["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 9)
+
+    def test_pending_save_survives_checkpoint_of_another_process(self):
+        films = {"film1": {"tickets": {"2024-01-01 _ 19:00": {"available_seats": 10}}}}
+        storage.JsonStorage().save(self.films_path, films)
+        loaded = self.storage.load(self.films_path)
+        self.storage.apply(self.films_path, [SELL])
+        self.storage.load(self.films_path)
+        loaded["film2"] = {"tickets": {}}
+        self.storage.save(self.films_path, loaded)
+        checkpoint = (
+            "import storage; engine = storage.JsonStorage();"
+            f"engine.save({self.films_path!r}, engine.load({self.films_path!r}))"
+        )
+        subprocess.run(
+            [sys.executable, "-c", checkpoint], env=dict(os.environ, PYTHONPATH=HERE), check=True
+        )
+        self.assertIs(self.storage.load(self.films_path), loaded)
+        later = (
+            "import storage; storage.JsonStorage().apply("
+            f"{self.films_path!r}, [dict({SELL!r}, available_seats=8)])"
+        )
+        subprocess.run(
+            [sys.executable, "-c", later], env=dict(os.environ, PYTHONPATH=HERE), check=True
+        )
+        self.storage.flush()
+        with open(self.films_path, encoding="utf-8") as file:
+            saved = json.load(file)
+        self.assertEqual(set(saved), {"film1", "film2"})
+        self.assertEqual(saved["film1"]["tickets"]["2024-01-01 _ 19:00"]["available_seats"], 8)
+
+    def test_financial_saves_are_written_at_once(self):
+        self.storage.save(self.accounts_path, {})
+        self.assertTrue(os.path.exists(self.accounts_path))
+
+    def tearDown(self):
+        self.storage.write_behind.close()
+        shutil.rmtree(self.dirpath)
+
+
+if __name__ == "__main__":
+    unittest.main()
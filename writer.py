@@ -0,0 +1,213 @@
+"""
+This module contains the file writers our storage engines use:/
+atomic_write(), the WriteBehind background flusher and GroupCommit
+"""
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path, text: str, durable: bool = True):
+    """
+    Replace the file at path with text so readers see either the old/
+    or the new content, never a half written file. The text goes to a
+    temporary file in the same directory which is then renamed over
+    path. With durable=True the data and the rename are fsynced.
+    """
+    path = os.path.abspath(str(path))
+    directory = os.path.dirname(path)
+    descriptor, temporary = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, mode="w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            if durable:
+                os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    if durable and hasattr(os, "O_DIRECTORY"):
+        directory_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+class WriteBehind:
+    """
+    Coalesces saves of whole documents and writes them from a
+    background thread.
+
+    mark(key, path, dictionary) only remembers the latest dictionary of
+    a document, so the caller never waits for the disk. A document is
+    written with write(path, dictionary) once INTERVAL seconds have
+    passed since it was first marked dirty, or sooner after MAX_CHANGES
+    marks. flush() writes the dirty documents right away and every
+    document is flushed when the interpreter exits.
+    """
+
+    INTERVAL = 0.2
+    MAX_CHANGES = 100
+
+    def __init__(self, write, interval: float = None, max_changes: int = None):
+        self.write = write
+        self.interval = WriteBehind.INTERVAL if interval is None else interval
+        self.max_changes = WriteBehind.MAX_CHANGES if max_changes is None else max_changes
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.flushing = threading.Lock()
+        self.thread = None
+        self.closed = False
+        atexit.register(self.close)
+
+    def mark(self, key, path, dictionary: dict):
+        """
+        Remember dictionary as the latest content of a document
+        """
+        with self.condition:
+            first, changes = self.pending.get(key, (None, None, time.monotonic(), 0))[2:]
+            self.pending[key] = (path, dictionary, first, changes + 1)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="write-behind", daemon=True
+                )
+                self.thread.start()
+            self.condition.notify()
+
+    def get(self, key):
+        """
+        Return the dictionary waiting to be written for key, or None
+        """
+        with self.condition:
+            entry = self.pending.get(key)
+        return None if entry is None else entry[1]
+
+    def due(self, now: float) -> float:
+        """
+        Return the seconds until the next document is due, 0 if one is due
+        """
+        waits = [
+            0 if changes >= self.max_changes else first + self.interval - now
+            for _, _, first, changes in self.pending.values()
+        ]
+        return max(0, min(waits)) if waits else None
+
+    def flush(self, key=None, now: float = None):
+        """
+        Write the dirty documents (only key if given, only the ones due
+        if now is given). A document that fails to write stays dirty.
+        """
+        with self.flushing:
+            with self.condition:
+                if key is not None:
+                    keys = [key] if key in self.pending else []
+                elif now is not None:
+                    keys = [
+                        key
+                        for key, (_, _, first, changes) in self.pending.items()
+                        if changes >= self.max_changes or first + self.interval <= now
+                    ]
+                else:
+                    keys = list(self.pending)
+                entries = {key: self.pending.pop(key) for key in keys}
+            for key, entry in entries.items():
+                try:
+                    self.write(entry[0], entry[1])
+                except BaseException:
+                    with self.condition:
+                        if key not in self.pending:
+                            self.pending[key] = entry
+                    raise
+
+    def run(self):
+        while True:
+            with self.condition:
+                wait = self.due(time.monotonic())
+                if self.closed and wait is None:
+                    return
+                if wait is None or wait > 0:
+                    self.condition.wait(wait)
+                    continue
+            try:
+                self.flush(now=time.monotonic())
+            except Exception:
+                logger.exception("Writing a dirty document failed")
+                time.sleep(self.interval)
+
+    def close(self):
+        """
+        Write every dirty document and let the thread finish
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.flush()
+
+
+class Batch:
+    """
+    Items committed together by GroupCommit
+    """
+
+    def __init__(self):
+        self.items = []
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommit:
+    """
+    Lets concurrent callers share one durable write.
+
+    submit(item) adds the item to the open batch. The first caller of a
+    batch is its leader: it waits for the previous batch to finish
+    committing (and for window seconds), closes the batch and calls
+    commit(items) once for everything that joined meanwhile, e.g. one
+    journal append and one fsync for many payments. Every caller
+    returns only when its batch is on disk, and gets the exception if
+    the commit failed.
+    """
+
+    def __init__(self, commit, window: float = 0.0):
+        self.commit = commit
+        self.window = window
+        self.batch = None
+        self.lock = threading.Lock()
+        self.committing = threading.Lock()
+        self.commits = 0
+
+    def submit(self, item):
+        with self.lock:
+            batch = self.batch
+            leader = batch is None
+            if leader:
+                batch = self.batch = Batch()
+            batch.items.append(item)
+        if leader:
+            if self.window:
+                time.sleep(self.window)
+            with self.committing:
+                with self.lock:
+                    self.batch = None
+                try:
+                    self.commit(batch.items)
+                except BaseException as error:
+                    batch.error = error
+                finally:
+                    self.commits += 1
+                    batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error